@@ -25,6 +25,9 @@ class AMF(Base):
         self.messageQ = simpy.Store(env)
         self.cpus = simpy.Resource(env, 100)  # Concurrent processing
 
+        # Message handler dispatch table
+        self.register_handler(PATH_SHIFT_REQUEST, self.handle_path_shift_request)
+
         # Running process
         self.env.process(self.init())  # Print Deployment information
         self.env.process(self.handle_messages())
@@ -33,6 +36,7 @@ class AMF(Base):
         """ Get the task from message Q and start a CPU processing process """
         while True:
             msg = yield self.messageQ.get()
+            self.inbound -= 1
             print(f"{self.type} {self.identity} start handling msg:{msg} at time {self.env.now}")
             data = json.loads(msg)
             self.env.process(self.cpu_processing(data))
@@ -47,38 +51,31 @@ class AMF(Base):
 
         """
         with self.cpus.request() as request:
-            # Get the task and processing time
-            task = msg['task']
-            processing_time = PROCESSING_TIME[task]
-
-            # handle the task by cases
-            if task == PATH_SHIFT_REQUEST:
-                satellite_id = msg['from']
-                previous_id = msg['previous_id']
-                satellite = self.satellites[satellite_id]
-                previous_satellite = self.satellites[previous_id]
+            # handle the task by dispatch table (미등록 task는 처리 없음)
+            handler = self.handlers[msg['task']]
+            if handler is not None:
                 yield request
-                yield self.env.timeout(processing_time)
-                data1 = {
-                    "task": AMF_RESPONSE,
-                }
-                self.env.process(
-                    self.send_message(
-                        delay=self.core_delay,
-                        msg=data1,
-                        Q=satellite.messageQ,
-                        to=satellite
-                    )
-                )
-                data2 = {
-                    "task": AMF_RESPONSE,
-                }
-                self.env.process(
-                    self.send_message(
-                        delay=self.core_delay,
-                        msg=data2,
-                        Q=previous_satellite.messageQ,
-                        to=previous_satellite
-                    )
-                )
+                yield from handler(msg)
 
+    def handle_path_shift_request(self, msg):
+        satellite_id = msg['from']
+        previous_id = msg['previous_id']
+        satellite = self.satellites[satellite_id]
+        previous_satellite = self.satellites[previous_id]
+        yield self.env.timeout(PROCESSING_TIME[PATH_SHIFT_REQUEST])
+        data1 = {
+            "task": AMF_RESPONSE,
+        }
+        self.send_message(
+            delay=self.core_delay,
+            msg=data1,
+            to=satellite
+        )
+        data2 = {
+            "task": AMF_RESPONSE,
+        }
+        self.send_message(
+            delay=self.core_delay,
+            msg=data2,
+            to=previous_satellite
+        )
@@ -1,6 +1,9 @@
 import json
 import random
 
+from config import Task
+from link import link_name
+
 """
 [Base 클래스]: ID 관리, 위치 추적, 구성 가능한 지연을 통한 메시지 전송 기능 등 Simulation Entities에서 상속된 기본 기능 제공
     - identity: 각 entities의 고유 식별자
@@ -29,33 +32,64 @@ class Base:
         self.env = env  # 시뮬레이션의 시간과 이벤트를 관리하는 환경(SimPy Env.)
         self.satellite_ground_delay = satellite_ground_delay # 지상-위성 간 신호 지연 시간
         #self.type = object_type # 객체 종류를 다시 한번 저장
+        self.inbound = 0 # 이 객체로 전송 중이며 아직 messageQ에서 꺼내지 않은 메시지 수 (fast-forward 정지 판정용)
+        self.fast_forward = None # FastForward 컨트롤러 (main.py에서 연결, None이면 매 1ms polling)
+        self.rng = random # 난수 생성기 (기본: 전역 random, PDES에서는 객체별 random.Random으로 교체)
+        self.remote = False # PDES: 다른 partition(worker)이 소유한 객체의 복제본이면 True
+        self.router = None # PDES: remote 객체로 가는 메시지를 받아 barrier에서 전달하는 Partition
+        self.links = None # 메시지 전달 link {이름: Link} (scenario.build_entities에서 연결)
+        self.tracer = None # MessageTracer (위성만 연결, None이면 lifecycle 추적 안 함)
+        self.arrivals = None # tracer 사용 시 messageQ 메시지별 (송신 시각, 도착 시각), messageQ와 같은 FIFO 순서
+        self.events = None # EventTrace (EVENT_TRACE, 모든 객체 공유, None이면 메시지 이벤트 기록 안 함)
+        self.handlers = [None] * len(Task) # 메시지 handler dispatch table (Task index → generator 함수, None이면 처리 없음)
 
     # 객체가 시뮬레이션에 처음 배치될 때 실행되는 함수
     def init(self):
-        # 객체가 언제, 어디에 배치되었는지 화면에 출력
-        print(f"{self.type} {self.identity} deployed at time {self.env.now}, positioned at ({self.position_x},{self.position_y})")
+        self.deploy()
         # 시뮬레이션에서 1ms 동안 잠시 대기 (다른 프로세스가 실행되도록 양보)
         yield self.env.timeout(1)
 
-    # 다른 객체에게 메시지를 보내는 함수
-    def send_message(self, delay, msg, Q, to):
+    # 객체가 언제, 어디에 배치되었는지 화면에 출력
+    def deploy(self):
+        print(f"{self.type} {self.identity} deployed at time {self.env.now}, positioned at ({self.position_x},{self.position_y})")
+
+    # 메시지 handler 등록: 각 객체의 cpu_processing이 CPU 획득 후 handler(msg)를 실행
+    # (위성/AMF: 처리시간을 소모하는 generator, UE: 즉시 처리 함수)
+    def register_handler(self, task, handler):
+        self.handlers[task] = handler
+
+    # 1ms polling 프로세스의 다음 대기 시간(ms): 정지 구간이면 다음 관심 시점 직전까지 건너뜀
+    def idle_steps(self):
+        if self.fast_forward is None:
+            return 1
+        return self.fast_forward.steps(self.env.now)
+
+    # 다른 객체에게 메시지를 보내는 함수: link가 delay 후 수신 객체의 messageQ에 직접 전달 (메시지별 프로세스 없음)
+    def send_message(self, delay, msg, to):
         """
         Args:
             delay: 메시지가 전달되는 데 걸리는 시간 (전파 지연)
             msg: 보낼 메시지 내용 (JSON 객체)
-            Q: 메시지를 받을 상대방의 메시지 큐 (우체통 역할)
-            to: 메시지를 받을 상대방 객체
+            to: 메시지를 받을 상대방 객체 (to.messageQ에 전달)
         """
         # 메시지 헤더(송/수신 ID) 자동 추가, JSON 형식으로 메시지 변환
         msg['from'] = self.identity
         msg['to'] = to.identity
+        if self.events is not None:
+            self.events.send(self.env.now, self, to, msg['task'])
         msg = json.dumps(msg)
         
         # Logging
         print(f"{self.type} {self.identity} sends {to.type} {to.identity} the message {msg} at {self.env.now}")
-        
-        # 전파지연 시간만큼 메시지 수신을 대기 (+ 작은 무작위 시간 0~1ms 추가, Jitter 효과)
-        yield self.env.timeout(delay + random.random() / 1000)
-        
-        # delay 후 받는 대상의 메시지 Queue에 메시지 추가: (handle_message에서 yield self.self/messageQ.get()으로 메시지 수신)
-        Q.put(msg)
\ No newline at end of file
+
+        # 전파지연 시간 (+ 작은 무작위 시간 0~1ms 추가, Jitter 효과)
+        delay = delay + self.rng.random() / 1000
+        link = self.links[link_name(self.type, to.type)]
+
+        # PDES: 수신 객체가 다른 partition 소유이면 도착 시각과 함께 router에 넘김 (barrier에서 해당 worker로 전달)
+        if to.remote:
+            link.count(msg)
+            self.router.post(self.env.now + delay, link.name, to, msg)
+            return
+
+        link.transmit(delay, msg, to)
@@ -1,43 +1,12 @@
 import simpy
-import random
 
 # Base, config 상속
 from Base import *
 from config import *
-
-# Message 통계 수집 객체
-class cumulativeMessageCount:
-    def __init__(self):
-        self.total_messages = 0
-        self.message_from_UE_measurement = 0
-        self.message_from_UE_retransmit = 0
-        self.message_from_UE_RA = 0
-        self.message_from_satellite = 0
-        self.message_dropped = 0
-        self.message_from_AMF = 0
-
-    def increment_UE_measurement(self):
-        self.total_messages += 1
-        self.message_from_UE_measurement += 1
-
-    def increment_UE_retransmit(self):
-        self.total_messages += 1
-        self.message_from_UE_retransmit += 1
-
-    def increment_satellite(self):
-        self.total_messages += 1
-        self.message_from_satellite += 1
-
-    def increment_UE_RA(self):
-        self.total_messages += 1
-        self.message_from_UE_RA += 1
-
-    def increment_AMF(self):
-        self.total_messages += 1
-        self.message_from_AMF += 1
-
-    def increment_dropped(self):
-        self.message_dropped += 1
+from queuestats import MonitoredPriorityResource
+from counters import MessageCounters
+from eventtrace import CPU_START, CPU_END
+from background import SERVICE as BACKGROUND_SERVICE
 
 # 위성 객체의 속성/동작 정의
 class Satellite(Base):
@@ -50,7 +19,9 @@ class Satellite(Base):
                  ISL_delay, # ISL(X2 link) 통신 지연
                  core_delay, # CPU 리소스 풀
                  AMF,
-                 env):
+                 env,
+                 counters=None, # MessageCounters (모든 위성 공유, None이면 이 위성만의 카운터 배열 생성)
+                 satellite_cpu=SATELLITE_CPU): # CPU 리소스 수 (main.py 인자로 변경 가능)
 
         # Base 객체 초기화
         Base.__init__(self,
@@ -71,11 +42,30 @@ class Satellite(Base):
         self.AMF = AMF
         self.UEs = None
         self.satellites = None
+        self.topology = None # ISL topology (라우팅 테이블), None이면 모든 위성과 직접 연결
+        self.background = None # BackgroundLoad (hybrid 모드, background 메시지의 다음 단계 전달)
         
         # simpy.PriorityResource: where queueing processes are sorted by priority(우선순위)
-        # capacity = CPU Resource (in config.py)
-        self.cpus = simpy.PriorityResource(env, capacity=SATELLITE_CPU) 
-        self.counter = cumulativeMessageCount() # 메시지 카운트 객체 초기화
+        # capacity = CPU Resource (satellite_cpu, 기본값 config.py)
+        self.cpus = MonitoredPriorityResource(env, capacity=satellite_cpu) # 대기열 변경 시점마다 시간 가중 통계 갱신 (cpus.stats)
+        if counters is None:
+            counters = MessageCounters([identity])
+        self.counter = counters.view(identity) # 메시지 카운터 (MessageCounters의 이 위성 행)
+        self.total_column = self.counter.register("total_messages")
+
+        # Message dispatch tables (Task index): CPU 우선순위, 수신/수락/drop 시 증가시킬 카운터 열 (handler는 Base.handlers)
+        # 우선순위 2(MR, 재전송)는 핸드오버 시작 메시지이므로 QUEUED_SIZE 적용, 1은 제한 없이 우선 처리
+        self.priorities = [1] * len(Task)
+        self.counters = [()] * len(Task)
+        self.admit_counters = [()] * len(Task)
+        self.drop_counters = [()] * len(Task)
+        self.register_handler(MEASUREMENT_REPORT, self.handle_measurement_report, 2, "message_from_UE_measurement")
+        self.register_handler(RETRANSMISSION, self.handle_retransmission, 2, "message_from_UE_retransmit")
+        self.register_handler(HANDOVER_REQUEST, self.handle_handover_request, 1, "message_from_satellite")
+        self.register_handler(HANDOVER_REQUEST_ACKNOWLEDGE, self.handle_handover_request_acknowledge, 1, "message_from_satellite")
+        self.register_handler(RRC_RANDOM_ACCESS, self.handle_random_access, 1, "message_from_UE_RA")
+        self.register_handler(RRC_RECONFIGURATION_COMPLETE, self.handle_reconfiguration_complete, 1, "message_from_UE_RA")
+        self.register_handler(AMF_RESPONSE, self.handle_amf_response, 1, "message_from_AMF")
 
         # Running process(SimPy>Env>process): Satellite에 Process를 정의 (To Do List 입력)
         # env.process에 동시수행 process 리스트를 입력
@@ -84,6 +74,26 @@ class Satellite(Base):
         self.env.process(self.handle_messages()) # Message Queue Process
 
 
+    # 위성 메시지 handler 등록: handler(msg) generator, CPU 우선순위, 수신 시 증가시킬 카운터 이름 (total_messages와 함께 증가)
+    # 우선순위별 수락(admitted_priority_N), QUEUED_SIZE 적용 task의 task별 drop(dropped_TASK) 카운터도 함께 등록
+    # (새 핸드오버 variant는 handler 등록만으로 추가)
+    def register_handler(self, task, handler, priority=1, counter=None):
+        Base.register_handler(self, task, handler)
+        self.priorities[task] = priority
+        self.counters[task] = () if counter is None else (self.counter.register(counter), self.total_column)
+        self.admit_counters[task] = (self.counter.register(f"admitted_priority_{priority}"),)
+        if priority == 2:
+            self.drop_counters[task] = (self.counter.register("message_dropped"), self.counter.register(f"dropped_{Task(task).name}"))
+
+    # 위성 간 메시지 전송: ISL topology 경로 지연으로 전달 (경로가 없으면 drop)
+    def send_isl(self, msg, to):
+        delay = self.ISL_delay if self.topology is None else self.topology.route(self.identity, to.identity)
+        if delay is None:
+            print(f"Satellite {self.identity} has no ISL route to satellite {to.identity}, message dropped at {self.env.now:.3f}")
+            return
+        self.send_message(delay=delay, msg=msg, to=to)
+
+
     # =================== Message Process ======================
         """
         MessageQ(simpy:Store) > handle_messages() > Message Type Check (Accept/Drop) > if accept: CPU processing() / if drop: handle_messages()
@@ -95,238 +105,229 @@ class Satellite(Base):
             # message Queue (infinite size): msg 대기 > self.messageQ에서 get()
             # msg (json) > python dictionary 변환 >> data에 저장
             msg = yield self.messageQ.get()
+            self.inbound -= 1
+            stamps = self.arrivals.popleft() if self.arrivals is not None else None # (송신 시각, 도착 시각)
             data = json.loads(msg) 
                         
-            # 메시지 타입 추출 후, Measure the message count: task 종류에 따라 메시지 카운터 증가
+            # 메시지 타입 추출 후, Measure the message count: task 종류에 따라 메시지 카운터 증가 (dispatch table)
             task = data['task']
-            if task == MEASUREMENT_REPORT: self.counter.increment_UE_measurement()
-            if task == RETRANSMISSION: self.counter.increment_UE_retransmit()
-            if task == HANDOVER_REQUEST_ACKNOWLEDGE: self.counter.increment_satellite()
-            if task == HANDOVER_REQUEST: self.counter.increment_satellite()
-            if task == RRC_RANDOM_ACCESS: self.counter.increment_UE_RA()
-            if task == RRC_RECONFIGURATION_COMPLETE: self.counter.increment_UE_RA()
-            if task == AMF_RESPONSE: self.counter.increment_AMF()
+            self.counter.add(self.counters[task])
 
-            # Measurement Report, Re-transmission
-            if task == MEASUREMENT_REPORT or task == RETRANSMISSION:
+            # Measurement Report, Re-transmission (우선순위 2)
+            priority = self.priorities[task]
+            if priority == 2:
                 # Queue 대기 작업이 QUEUED_SIZE 미만인 경우에만 처리
                 if len(self.cpus.queue) < QUEUED_SIZE:
+                    self.counter.add(self.admit_counters[task])
+                    row = self.events.receive(self.env.now, self.identity, data['from'], task, priority, True) if self.events is not None else None
                     print(f"{self.type} {self.identity} accepted msg:{msg} at time {self.env.now:.3f}") # Logging
-                    self.env.process(self.cpu_processing(msg=data, msg_priority=2)) # Message Processing (priority second)
+                    self.env.process(self.cpu_processing(msg=data, msg_priority=priority, stamps=stamps, row=row)) # Message Processing (priority second)
                 else: # Message Drop
-                    self.counter.increment_dropped() # message drop 카운트 증가
+                    self.counter.add(self.drop_counters[task]) # message drop 카운트 증가 (전체, task별)
+                    if self.tracer is not None:
+                        self.tracer.drop(self.identity, task)
+                    if self.events is not None:
+                        self.events.receive(self.env.now, self.identity, data['from'], task, priority, False)
                     print(f"{self.type} {self.identity} dropped msg:{msg} at time {self.env.now:.3f}") # Logging
+                    if 'background' in data: # hybrid 모드 background 메시지: 핸드오버 종료 판단은 BackgroundLoad
+                        self.background.dropped(data)
             else: # HO ACK, HO Request. RRC RC, AMF Response
+                self.counter.add(self.admit_counters[task])
+                row = self.events.receive(self.env.now, self.identity, data['from'], task, priority, True) if self.events is not None else None
                 print(f"{self.type} {self.identity} accepted msg:{msg} at time {self.env.now:.3f}") # Logging
-                self.env.process(self.cpu_processing(msg=data, msg_priority=1)) # Message Processing (priority first)
+                self.env.process(self.cpu_processing(msg=data, msg_priority=priority, stamps=stamps, row=row)) # Message Processing (priority first)
 
 
     # =================== Satellite functions ======================
-    # Message 선별 후, 해당하는 Message Type에 따라 cpu_processing Start
-    def cpu_processing(self, msg, msg_priority):
+    # Message 선별 후, 해당하는 Message Type의 handler로 cpu_processing Start
+    # stamps: message lifecycle 추적 시 (송신 시각, 도착 시각), 처리 완료 후 tracer에 CPU 할당/완료 시각과 함께 기록
+    # row: event trace 사용 시 이 메시지의 ADMIT 행 (CPU_START/CPU_END 기록에 포함, 메시지별 대기/처리 시간 복원)
+    def cpu_processing(self, msg, msg_priority, stamps=None, row=None):
         # Priority 기반 CPU 요청
         with self.cpus.request(priority=msg_priority) as request:
             # simpy > request: 객체, request 객체 내 priority 할당
             # with ~ as: Context Manager 문법, 사용 완료 시 객체를 자동으로 release(close)
             
             yield request # Processing Pause
+            granted = self.env.now
+            if self.events is not None:
+                self.events.cpu(granted, CPU_START, self.identity, msg['task'], row)
             
             # Processing Start
             print(f"{self.type} {self.identity} handling msg:{msg} at time {self.env.now:.3f}") # CPU 처리 Logging
             
-            task = msg['task'] # msg 내 task 종류 확인
-            processing_time = PROCESSING_TIME[task] # task time (in config.py > PROCESSING_TIME)
+            handler = self.handlers[msg['task']] # msg 내 task 종류로 handler 선택
+            if 'background' in msg: # hybrid 모드 background 메시지: UE 객체 없이 처리 시간만 소모
+                handler = self.handle_background
+            if handler is not None:
+                yield from handler(msg)
+            print(f"{self.type} {self.identity} finished processing msg:{msg} at time {self.env.now:.3f}")
+            if stamps is not None:
+                self.tracer.record(self.identity, msg['task'], stamps[0], stamps[1], granted, self.env.now)
+            if self.events is not None:
+                self.events.cpu(self.env.now, CPU_END, self.identity, msg['task'], row)
 
-            # (Serving Satellite) Message Type: MEASUREMENT REPORT / RETRANSMISSION
-            if task == MEASUREMENT_REPORT:
-                yield request
-                processing_time = 1  # 메시지 처리 시간 1ms 가정
-                
-                ueid = msg['from']
-                # UE가 보낸 상세 측정 정보 리스트를 가져옵니다.
-                # UE.py에서 "candidate_measurements" 키를 사용했으므로 여기서도 맞춰줍니다.
-                candidate_measurements = msg['candidate_measurements']
-                UE = self.UEs[ueid]
+    # Hybrid 모드 background 메시지 (background.py): handler와 같은 CPU 처리 시간 후 다음 단계는 BackgroundLoad가 전달
+    def handle_background(self, msg):
+        if self.background.pending(msg):
+            yield self.env.timeout(BACKGROUND_SERVICE[msg['task']])
+            self.background.forward(self, msg)
 
-                if self.connected(UE):
-                    yield self.env.timeout(processing_time)
+    # (Serving Satellite) Message Type: MEASUREMENT REPORT
+    def handle_measurement_report(self, msg):
+        processing_time = 1  # 메시지 처리 시간 1ms 가정
+        
+        ueid = msg['from']
+        # UE가 보낸 측정 정보 (compact MR: id/rsrp/sinr 병렬 배열)
+        candidate_measurements = msg['candidate_measurements']
+        UE = self.UEs[ueid]
 
-                    if self.connected(UE):
-                        # --- 최적 타겟 선정 로직 시작 ---
-                        best_target_id = -1
-                        best_target_sinr = -float('inf')
+        if self.connected(UE):
+            yield self.env.timeout(processing_time)
 
-                        # UE가 보낸 측정 정보 리스트를 순회하며 SINR이 가장 높은 위성을 찾습니다.
-                        for report in candidate_measurements:
-                            if report['sinr'] > best_target_sinr:
-                                best_target_sinr = report['sinr']
-                                best_target_id = report['id'] # 딕셔너리에서 'id' 값 추출
-                        # --- 최적 타겟 선정 로직 끝 ---
+            if self.connected(UE):
+                # --- 최적 타겟 선정: SINR argmax (동률이면 앞선 후보) ---
+                best_target_id = -1
+                best_target_sinr = -float('inf')
+                sinrs = candidate_measurements['sinr']
+                if sinrs:
+                    best = max(range(len(sinrs)), key=sinrs.__getitem__)
+                    best_target_id = candidate_measurements['id'][best]
+                    best_target_sinr = sinrs[best]
 
-                        if best_target_id != -1:
-                            print(f"--- Satellite {self.identity} chose target {best_target_id} for UE {ueid} (Best SINR: {best_target_sinr:.2f} dB) ---")
-                            target_satellite = self.satellites[best_target_id]
-                            
-                            data = {
-                                "task": HANDOVER_REQUEST,
-                                "ueid": ueid
-                            }
-                            
-                            self.env.process(self.send_message(delay=self.ISL_delay, msg=data, Q=target_satellite.messageQ, to=target_satellite))
-                        else:
-                            print(f"Satellite {self.identity} could not find a suitable HO target for UE {ueid}.")
-            
-            if task == RETRANSMISSION:
-                ueid = msg['from'] # Message를 전송한 UE ID
-                candidates = msg['candidate'] # 핸드오버 후보 위성 목록
-                UE = self.UEs[ueid] # UE ID를 활용해 UE 객체 호출
-                
-                # 위성과 UE의 연결 상태 확인
-                if self.connected(UE):
-                    yield self.env.timeout(processing_time) # 해당 시, 메시지 처리 시간 반영 (sim time 소모)
-                
-                # 메시지 처리 후에도 연결 상태 다시 확인 (도중 연결 손실 시 다음절차 진행 X)
-                if self.connected(UE):
-                    # Candidate Satellite에게 HO Request 준비
-                    data = {
-                        "task": HANDOVER_REQUEST, # Message 생성
-                        "ueid": ueid # 대상 UE ID 설정
-                    }
-                    
-                    # TODO for now, just random
-                    """ 
-                    현 단계: target 위성 랜덤 선택
-                    향후 추진: 핸드오버 조건식에 대한 판별 구현 필요 
-                    """
-                    target_satellite_id = random.choice(candidates) 
-                    target_satellite = self.satellites[target_satellite_id]
+                if best_target_id != -1:
+                    print(f"--- Satellite {self.identity} chose target {best_target_id} for UE {ueid} (Best SINR: {best_target_sinr:.2f} dB) ---")
+                    target_satellite = self.satellites[best_target_id]
                     
-                    # 선택된 Target 위성에게 Handover Request message 전송 프로세스 시작
-                    self.env.process(
-                        self.send_message(
-                            delay=self.ISL_delay,
-                            msg=data,
-                            Q=target_satellite.messageQ,
-                            to=target_satellite
-                        )
-                    )
-            
-            
-            # (Candidate Satellite) Message Type: HANDOVER REQUEST
-            elif task == HANDOVER_REQUEST:
-                satellite_id = msg['from']
-                ueid = msg['ueid']
-                
-                yield self.env.timeout(processing_time) # Handover Request Message 처리
-                
-                # HANDOVER REQUEST ACKNOWLEDGE 메시지 생성
-                data = {
-                    "task": HANDOVER_REQUEST_ACKNOWLEDGE,
-                    "ueid": ueid
-                }
-                source_satellite = self.satellites[satellite_id]
-                self.env.process(
-                    self.send_message(
-                        delay=self.ISL_delay,
-                        msg=data,
-                        Q=source_satellite.messageQ,
-                        to=source_satellite
-                    )
-                )
-            
-            
-            # (Serving Satellite) Message Type: HANDOVER_REQUEST_ACKNOWLEDGE
-            elif task == HANDOVER_REQUEST_ACKNOWLEDGE:
-                satellite_id = msg['from']
-                ueid = msg['ueid']
-                UE = self.UEs[ueid]
-                
-                # UE 연결 상태 확인, CPU 처리시간 처리
-                if self.connected(UE):
-                    yield self.env.timeout(processing_time) # Handover Acknowledge Message 처리
-                    
-                # HO COMMAND(RRC RECONFIGURATION) 생성
-                if self.connected(UE):
                     data = {
-                        # HO COMMAND(RRC RECONFIGURATION) 메시지를 전송
-                        "task": HO_COMMAND,
-                        "targets": [satellite_id], # Target 위성 ID 전달
+                        "task": HANDOVER_REQUEST,
+                        "ueid": ueid
                     }
-                    self.env.process(
-                        self.send_message(
-                            delay=self.satellite_ground_delay,
-                            msg=data,
-                            Q=UE.messageQ,
-                            to=UE
-                        )
-                    )
-            
-            
-            # (Target Satellite) Message Type: RANDOM_ACCESS
-            elif task == RRC_RANDOM_ACCESS:
-                ue_id = msg['from']
-                UE = self.UEs[ue_id]
-                yield self.env.timeout(processing_time)
-                data = {
-                    "task": RRC_ULGRANT,
-                }
-                self.env.process(
-                    self.send_message(
-                        delay=self.satellite_ground_delay,
-                        msg=data,
-                        Q=UE.messageQ,
-                        to=UE
-                    )
-                )
-            
+                    
+                    self.send_isl(msg=data, to=target_satellite)
+                else:
+                    print(f"Satellite {self.identity} could not find a suitable HO target for UE {ueid}.")
+
+    # (Serving Satellite) Message Type: RETRANSMISSION
+    def handle_retransmission(self, msg):
+        ueid = msg['from'] # Message를 전송한 UE ID
+        candidates = msg['candidate'] # 핸드오버 후보 위성 목록
+        UE = self.UEs[ueid] # UE ID를 활용해 UE 객체 호출
+        
+        # 위성과 UE의 연결 상태 확인
+        if self.connected(UE):
+            yield self.env.timeout(PROCESSING_TIME[RETRANSMISSION]) # 해당 시, 메시지 처리 시간 반영 (sim time 소모)
+        
+        # 메시지 처리 후에도 연결 상태 다시 확인 (도중 연결 손실 시 다음절차 진행 X)
+        if self.connected(UE):
+            # Candidate Satellite에게 HO Request 준비
+            data = {
+                "task": HANDOVER_REQUEST, # Message 생성
+                "ueid": ueid # 대상 UE ID 설정
+            }
             
-            # (Target Satellite) Message Type: RRC RECONFIGURATION COMPLETE
-            elif task == RRC_RECONFIGURATION_COMPLETE:
-                ue_id = msg['from']
-                UE = self.UEs[ue_id]
-                yield self.env.timeout(processing_time)
-                
-                # BHO:: UE: ULGRANT 수신 후 RRC RECONFIGURATION COMPLETE 이후, 추가 message X
-                # # DATA 1: (to UE) HANDOVER RECONFIGURATION COMPLETE RESPONSE Message
-                # data = {
-                #     "task": RRC_RECONFIGURATION_COMPLETE_RESPONSE,
-                # }
-                # self.env.process(
-                #     self.send_message(
-                #         delay=self.satellite_ground_delay,
-                #         msg=data,
-                #         Q=UE.messageQ,
-                #         to=UE
-                #     )
-                # )
-                # DATA 2: (to AMF) PATH SHIFT REQUEST Message
-                data2 = {
-                    "task": PATH_SHIFT_REQUEST,
-                    "previous_id": msg['previous_id'] # 이전 Satellite ID 전달
-                }
-                self.env.process(
-                    self.send_message(
-                        delay=self.core_delay,
-                        msg=data2,
-                        Q=self.AMF.messageQ,
-                        to=self.AMF
-                    )
-                )
+            # TODO for now, just random
+            """ 
+            현 단계: target 위성 랜덤 선택
+            향후 추진: 핸드오버 조건식에 대한 판별 구현 필요 
+            """
+            target_satellite_id = self.rng.choice(candidates) 
+            target_satellite = self.satellites[target_satellite_id]
             
+            # 선택된 Target 위성에게 Handover Request message 전송
+            self.send_isl(msg=data, to=target_satellite)
+    
+    # (Candidate Satellite) Message Type: HANDOVER REQUEST
+    def handle_handover_request(self, msg):
+        satellite_id = msg['from']
+        ueid = msg['ueid']
+        
+        yield self.env.timeout(PROCESSING_TIME[HANDOVER_REQUEST]) # Handover Request Message 처리
+        
+        # HANDOVER REQUEST ACKNOWLEDGE 메시지 생성
+        data = {
+            "task": HANDOVER_REQUEST_ACKNOWLEDGE,
+            "ueid": ueid
+        }
+        source_satellite = self.satellites[satellite_id]
+        self.send_isl(msg=data, to=source_satellite)
+    
+    # (Serving Satellite) Message Type: HANDOVER_REQUEST_ACKNOWLEDGE
+    def handle_handover_request_acknowledge(self, msg):
+        satellite_id = msg['from']
+        ueid = msg['ueid']
+        UE = self.UEs[ueid]
+        
+        # UE 연결 상태 확인, CPU 처리시간 처리
+        if self.connected(UE):
+            yield self.env.timeout(PROCESSING_TIME[HANDOVER_REQUEST_ACKNOWLEDGE]) # Handover Acknowledge Message 처리
             
-            # Message Type: AMF RESPONSE을 수신 (AMF의 Path Shift 완료)
-            elif task == AMF_RESPONSE:
-                yield self.env.timeout(processing_time)
-            print(f"{self.type} {self.identity} finished processing msg:{msg} at time {self.env.now:.3f}")
+        # HO COMMAND(RRC RECONFIGURATION) 생성
+        if self.connected(UE):
+            data = {
+                # HO COMMAND(RRC RECONFIGURATION) 메시지를 전송
+                "task": HO_COMMAND,
+                "targets": [satellite_id], # Target 위성 ID 전달
+            }
+            self.send_message(
+                delay=self.satellite_ground_delay,
+                msg=data,
+                to=UE
+            )
+    
+    # (Target Satellite) Message Type: RANDOM_ACCESS
+    def handle_random_access(self, msg):
+        ue_id = msg['from']
+        UE = self.UEs[ue_id]
+        yield self.env.timeout(PROCESSING_TIME[RRC_RANDOM_ACCESS])
+        data = {
+            "task": RRC_ULGRANT,
+        }
+        self.send_message(
+            delay=self.satellite_ground_delay,
+            msg=data,
+            to=UE
+        )
+    
+    # (Target Satellite) Message Type: RRC RECONFIGURATION COMPLETE
+    def handle_reconfiguration_complete(self, msg):
+        yield self.env.timeout(PROCESSING_TIME[RRC_RECONFIGURATION_COMPLETE])
+        
+        # BHO:: UE: ULGRANT 수신 후 RRC RECONFIGURATION COMPLETE 이후, 추가 message X
+        # # DATA 1: (to UE) HANDOVER RECONFIGURATION COMPLETE RESPONSE Message
+        # data = {
+        #     "task": RRC_RECONFIGURATION_COMPLETE_RESPONSE,
+        # }
+        # self.send_message(
+        #     delay=self.satellite_ground_delay,
+        #     msg=data,
+        #     to=UE
+        # )
+        # DATA 2: (to AMF) PATH SHIFT REQUEST Message
+        data2 = {
+            "task": PATH_SHIFT_REQUEST,
+            "previous_id": msg['previous_id'] # 이전 Satellite ID 전달
+        }
+        self.send_message(
+            delay=self.core_delay,
+            msg=data2,
+            to=self.AMF
+        )
+    
+    # Message Type: AMF RESPONSE을 수신 (AMF의 Path Shift 완료)
+    def handle_amf_response(self, msg):
+        yield self.env.timeout(PROCESSING_TIME[AMF_RESPONSE])
 
 
     # Continuous updating the object location.
     # env.process(self.update_position() 등록, Simulation 시작시 동시 실행)
     def update_position(self):
         while True:
-            yield self.env.timeout(1) # 위치 업데이트 주기 (ms)
+            steps = self.idle_steps() # 위치 업데이트 주기 (ms), fast-forward 시 여러 ms를 한번에 처리
+            yield self.env.timeout(steps)
             ratio = 1 / 1000 # Calculate time ratio (7.56*1000 m/s > 1ms)
-            self.position_x += self.velocity * ratio # moving to x axis
+            for _ in range(steps): # 1ms 단위 누적을 유지하여 위치값이 polling 방식과 동일하도록 함
+                self.position_x += self.velocity * ratio # moving to x axis
 
     # ==================== Utils (Not related to Simpy) ==============
     # Check if the UE is connected to this satellite
@@ -1,10 +1,10 @@
 import math
 import simpy
-import random
 from scipy.special import jv
 import json # [추가] JSON 모듈
 from Base import *
 from config import *
+from population import Inbox
 
 """
 [UE State]
@@ -38,13 +38,21 @@ class UE(Base):
 
         # Logic Initialization
         self.timestamps = []
+        self.handovers = None # HandoverRecorder (scenario.build_entities에서 연결, 모든 UE 공유)
+        self.handover_row = None # 진행 중인 핸드오버 시도의 recorder 행
         
         # Geometry_data_cache
         self.geometry_data_cache = {}
+        self.next_geometry_update = 0 # 다음 GEOMETRY_MONITOR 갱신 시점 (cache는 이 시점까지 고정)
+        self.geometry_phase = 0 # GEOMETRY_PHASE: 첫 geometry 갱신 시점 (ms, 이후 GEOMETRY_UPDATE_INTERVAL 주기), scenario.build_entities에서 설정
 
-        self.messageQ = simpy.Store(env)
+        self.messageQ = Inbox(self) if POPULATION_SCHEDULER else simpy.Store(env)
         self.cpus = simpy.Resource(env, UE_CPU)
         self.state = ACTIVE # 초기 상태: ACTIVE
+        self.channel = None # ChannelTrace (CHANNEL_TRACE, scenario.attach_channel_trace에서 연결, None이면 매번 계산)
+        self.census = None # UECensus (scenario.build_entities에서 연결, 상태 전이는 set_state로)
+        self.population = None # Population (POPULATION_SCHEDULER, scenario.build_entities에서 연결)
+        self.adaptive = None # AdaptiveMeasurement (ADAPTIVE_MEASUREMENT, scenario.attach_adaptive_measurement에서 연결, None이면 매 주기 측정)
         self.satellites = None 
 
         self.previous_serving_sat_id = None
@@ -52,299 +60,341 @@ class UE(Base):
         self.retransmit_counter = 0
         self.handover_cooldown_end_time = -1
 
-        # Running Process
-        env.process(self.init())
-        env.process(self.MESSAGE_CONTROL())
-        env.process(self.ACTION_MONITOR())
-        env.process(self.GEOMETRY_MONITOR())
+        # Message handler dispatch table
+        self.register_handler(HO_COMMAND, self.handle_ho_command)
+        self.register_handler(RRC_ULGRANT, self.handle_ulgrant)
+
+        # Running Process (POPULATION_SCHEDULER: UE 프로세스 없이 population.Population이 action_step/geometry_step 실행)
+        if not POPULATION_SCHEDULER:
+            env.process(self.init())
+            env.process(self.MESSAGE_CONTROL())
+            env.process(self.ACTION_MONITOR())
+            env.process(self.GEOMETRY_MONITOR())
 
 
     # =================== UE functions ======================
+    # UE 상태 전이: census(상태별 UE 수/구성원) 함께 갱신
+    def set_state(self, state):
+        if self.census is not None and state != self.state:
+            self.census.move(self, self.state, state)
+        self.state = state
+        if self.events is not None:
+            self.events.state(self.env.now, self.identity, state,
+                              self.serving_satellite.identity if self.serving_satellite is not None else None, self.targetID)
+
     # handle messages: satellite와 동일
     # 수신 메시지의 종류를 구분하거나, 처리 카운팅을 하는 것에 대해 구분되지 않음: UE에게는 그정도로 필요가 없음
     def MESSAGE_CONTROL(self):
         while True:
             msg = yield self.messageQ.get()
+            self.inbound -= 1
             print(f"{self.type} {self.identity} start handling msg:{msg} at time {self.env.now}")
             data = json.loads(msg)
             self.env.process(self.cpu_processing(data))
 
+    # POPULATION_SCHEDULER: link 도착 시 바로 handler 실행 (population.Inbox.put, MESSAGE_CONTROL/cpu_processing 프로세스 없음)
+    def receive(self, msg):
+        self.inbound -= 1
+        print(f"{self.type} {self.identity} start handling msg:{msg} at time {self.env.now}")
+        data = json.loads(msg)
+        handler = self.handlers[data['task']]
+        if handler is not None:
+            handler(data)
+
+    # HO COMMAND, UL GRANT 처리: CPU 획득 후 task handler 실행 (UE handler는 시간 소모 없이 즉시 처리)
     def cpu_processing(self, msg):
         with self.cpus.request() as request:
-            task = msg['task']
-            
-            # Message Type: HO COMMAND
-            # CURRENT UE STATE: WAITING_RRC_CONFIGURATION
-            if task == HO_COMMAND:
+            handler = self.handlers[msg['task']] # dispatch table (미등록 task는 처리 없음)
+            if handler is not None:
                 yield request # 대기
-                satid = msg['from'] # Satellite ID CHECK
-                
-                # FIXME one error raised for serveing satellite is none, the suspect reason is synchronization issue with "switch to inactive"
-                # Note that the UE didn't wait for the latest response for retransmission.
-                # 명령 처리 중 연결이 끊켜 self.serving_satellite가 제거되는 경우, 문제가 발생할 수 있는 단계
-                
-                # WAITING_RRC_CONFIGURATION (HO CMD 대기상태) + 메시지 발신 위성이 기존 서빙 위성과 동일
-                if self.state == WAITING_RRC_CONFIGURATION and satid == self.serving_satellite.identity:
-                    targets = msg['targets'] # candidate satellite list
-                    
-                    # choose target
-                    # TODO 최종 위성을 리스트의 첫번째 위성으로 선택 중 (현단계)
-                    self.targetID = targets[0]
-                    
-                    self.state = RRC_CONFIGURED # State Change
-                    self.previous_serving_sat_id = self.serving_satellite.identity # 이전 서빙 위성 ID 보관
-                    self.retransmit_counter = 0 # 재전송 횟수 초기화
-                    print(f"{self.type} {self.identity} receives the configuration at {self.env.now}") # Logging
-                    
-                    # 현재 시간, HO 성공 여부 기록
-                    self.timestamps[-1]['timestamp'].append(self.env.now)
-                    self.timestamps[-1]['isSuccess'] = True
+                handler(msg)
+
+    # Message Type: HO COMMAND
+    # CURRENT UE STATE: WAITING_RRC_CONFIGURATION
+    def handle_ho_command(self, msg):
+        satid = msg['from'] # Satellite ID CHECK
+        
+        # FIXME one error raised for serveing satellite is none, the suspect reason is synchronization issue with "switch to inactive"
+        # Note that the UE didn't wait for the latest response for retransmission.
+        # 명령 처리 중 연결이 끊켜 self.serving_satellite가 제거되는 경우, 문제가 발생할 수 있는 단계
+        
+        # WAITING_RRC_CONFIGURATION (HO CMD 대기상태) + 메시지 발신 위성이 기존 서빙 위성과 동일
+        if self.state == WAITING_RRC_CONFIGURATION and satid == self.serving_satellite.identity:
+            targets = msg['targets'] # candidate satellite list
             
-            elif task == RRC_ULGRANT:
-                yield request
-                satid = msg['from']
-                target_satellite = self.satellites[satid] # all Satellite list check
-                
-                # TODO satid가 target cell인지 검증하는 절차가 확인으로 추가가 필요함
-                if self.covered_by(satid): # using coverd_by function
-                    self.serving_satellite = target_satellite # msg trans. satellite
-                    self.state = ACTIVE # State Change
-                    self.timestamps[-1]['timestamp'].append(self.env.now) # Adding: for MIT
-                    print(f"{self.type} {self.identity} finished handover at {self.env.now}")
-                    data = {
-                        "task": RRC_RECONFIGURATION_COMPLETE, # RRC RECONFIGURATION COMPLETE 메시지 생성
-                        "previous_id": self.previous_serving_sat_id,
-                    }
-                    self.env.process(
-                        self.send_message(
-                            delay=self.satellite_ground_delay,
-                            msg=data,
-                            Q=self.serving_satellite.messageQ,
-                            to=self.serving_satellite
-                        )
-                    )
-                    print('Send RRC_RECONFIGURATION_COMPLETE message')
+            # choose target
+            # TODO 최종 위성을 리스트의 첫번째 위성으로 선택 중 (현단계)
+            self.targetID = targets[0]
+            
+            self.set_state(RRC_CONFIGURED) # State Change
+            self.previous_serving_sat_id = self.serving_satellite.identity # 이전 서빙 위성 ID 보관
+            self.retransmit_counter = 0 # 재전송 횟수 초기화
+            print(f"{self.type} {self.identity} receives the configuration at {self.env.now}") # Logging
+            
+            # 현재 시간, HO 성공 여부 기록
+            self.timestamps[-1]['timestamp'].append(self.env.now)
+            self.timestamps[-1]['isSuccess'] = True
+            if self.handovers is not None:
+                self.handovers.command(self.handover_row, self.targetID, self.env.now)
+
+    # Message Type: RRC UL GRANT
+    def handle_ulgrant(self, msg):
+        satid = msg['from']
+        target_satellite = self.satellites[satid] # all Satellite list check
+        
+        # TODO satid가 target cell인지 검증하는 절차가 확인으로 추가가 필요함
+        if self.covered_by(satid): # using coverd_by function
+            self.serving_satellite = target_satellite # msg trans. satellite
+            self.set_state(ACTIVE) # State Change
+            self.timestamps[-1]['timestamp'].append(self.env.now) # Adding: for MIT
+            if self.handovers is not None:
+                self.handovers.complete(self.handover_row, self.env.now)
+            print(f"{self.type} {self.identity} finished handover at {self.env.now}")
+            data = {
+                "task": RRC_RECONFIGURATION_COMPLETE, # RRC RECONFIGURATION COMPLETE 메시지 생성
+                "previous_id": self.previous_serving_sat_id,
+            }
+            self.send_message(
+                delay=self.satellite_ground_delay,
+                msg=data,
+                to=self.serving_satellite
+            )
+            print('Send RRC_RECONFIGURATION_COMPLETE message')
 
     # =================== Monitoring Process ======================   
     def GEOMETRY_MONITOR(self):
         # GEOMETRY_UPDATE_INTERVAL 마다 'for satid in self.satellites (전위성 순회)'
         # covered_by 필터링 후, get_geometry_info > geometry_data_cache 생성
+        if self.geometry_phase: # GEOMETRY_PHASE: 갱신 시점 분산, 첫 갱신 전까지 cache 없음 (A3/연결 종료 판단 없음)
+            yield self.env.timeout(self.geometry_phase)
         while True:
-            if not self.satellites:
-                yield self.env.timeout(10)
-                continue
+            yield self.env.timeout(self.geometry_step())
 
-            # 1. 정밀 탐색 대상 위성 목록 필터링 (50km 반경)
-            covered_sat_ids = [sat_id for sat_id in self.satellites if self.covered_by(sat_id)]
+    # GEOMETRY_MONITOR 1회 갱신, 다음 갱신까지의 대기 시간(ms) 반환 (POPULATION_SCHEDULER: population.Population이 직접 호출)
+    def geometry_step(self):
+        if not self.satellites:
+            return 10
+
+        # Channel trace playback: 기록된 채널 값으로 cache 갱신 (geometry/channel 계산 없음)
+        if self.channel is not None and self.channel.playback:
+            self.channel.load(self, self.env.now)
+            return self.schedule_geometry_update()
+
+        # 1. 정밀 탐색 대상 위성 목록 필터링 (50km 반경)
+        covered_sat_ids = [sat_id for sat_id in self.satellites if self.covered_by(sat_id)]
+        
+        # 임시 저장소: 이번 타임스텝에 계산된 모든 RSRP 값을 보관
+        all_rsrps_in_scope = {}
+
+        # 2. 모든 탐색 대상 위성에 대해 RSRP 우선 계산
+        for sat_id in covered_sat_ids:
+            satellite = self.satellites[sat_id]
+            
+            geo_info = self.get_geometry_info(satellite)
+            geo_info['ue_coords'] = (self.position_x, self.position_y)
+            geo_info['sat_coords'] = (satellite.position_x, satellite.position_y)
+            
+            channel_details = self.calculate_rsrp(geo_info)
+            
+            final_entry = {**geo_info, **channel_details}
+            self.geometry_data_cache[sat_id] = final_entry
+            all_rsrps_in_scope[sat_id] = final_entry['rsrp']
+
+        # 3. 계산된 RSRP들을 바탕으로 각 위성의 SINR 계산 및 캐시 업데이트
+        for sat_id in covered_sat_ids:
+            # '신호'는 현재 위성의 RSRP
+            signal_rsrp = all_rsrps_in_scope[sat_id]
+            
+            # '간섭'은 현재 위성을 제외한 나머지 모든 위성들의 RSRP 리스트
+            interference_list = [rsrp for other_id, rsrp in all_rsrps_in_scope.items() if other_id != sat_id]
             
-            # 임시 저장소: 이번 타임스텝에 계산된 모든 RSRP 값을 보관
-            all_rsrps_in_scope = {}
+            # SINR 계산
+            sinr, noise = self._calculate_sinr(signal_rsrp, interference_list)
+            
+            # 계산된 SINR을 캐시에 추가
+            self.geometry_data_cache[sat_id]['sinr'] = sinr
+            self.geometry_data_cache[sat_id]['noise'] = noise
 
-            # 2. 모든 탐색 대상 위성에 대해 RSRP 우선 계산
-            for sat_id in covered_sat_ids:
-                satellite = self.satellites[sat_id]
-                
-                geo_info = self.get_geometry_info(satellite)
-                geo_info['ue_coords'] = (self.position_x, self.position_y)
-                geo_info['sat_coords'] = (satellite.position_x, satellite.position_y)
-                
-                channel_details = self.calculate_rsrp(geo_info)
-                
-                final_entry = {**geo_info, **channel_details}
-                self.geometry_data_cache[sat_id] = final_entry
-                all_rsrps_in_scope[sat_id] = final_entry['rsrp']
-
-            # 3. 계산된 RSRP들을 바탕으로 각 위성의 SINR 계산 및 캐시 업데이트
-            for sat_id in covered_sat_ids:
-                # '신호'는 현재 위성의 RSRP
-                signal_rsrp = all_rsrps_in_scope[sat_id]
-                
-                # '간섭'은 현재 위성을 제외한 나머지 모든 위성들의 RSRP 리스트
-                interference_list = [rsrp for other_id, rsrp in all_rsrps_in_scope.items() if other_id != sat_id]
-                
-                # SINR 계산
-                sinr, noise = self._calculate_sinr(signal_rsrp, interference_list)
-                
-                # 계산된 SINR을 캐시에 추가
-                self.geometry_data_cache[sat_id]['sinr'] = sinr
-                self.geometry_data_cache[sat_id]['noise'] = noise
-                
-            yield self.env.timeout(GEOMETRY_UPDATE_INTERVAL)
+        if self.channel is not None:
+            self.channel.record(self.env.now, self.identity, covered_sat_ids, self.geometry_data_cache)
+            
+        return self.schedule_geometry_update()
+
+    # 다음 geometry 갱신 시점 설정 후 대기 시간(ms) 반환 (ADAPTIVE_MEASUREMENT: A3 경계까지 여유에 따라 주기의 배수)
+    def schedule_geometry_update(self):
+        interval = GEOMETRY_UPDATE_INTERVAL if self.adaptive is None else self.adaptive.next_interval(self)
+        self.next_geometry_update = self.env.now + interval
+        return interval
     
     
     # cache 기반, 1ms 마다 행동하지만, geometry_data_cache를 기반으로 수행 (messageQ 처리로 1ms 주기 동작은 필요)
     # 보고서 기반 send_request_condition을 통해 measurement trigger를 판단
     def ACTION_MONITOR(self):
         while True:
-            # --- ACTION: Send Measurement Report ---
-            # --- 서빙 위성 제외, 후보셀들에 대해서만 판별
-            
-            # --Rollback Point--
-            # if self.state == ACTIVE and self.send_request_condition_A3(): 
-            if self.state == ACTIVE and self.env.now >= self.handover_cooldown_end_time and self.send_request_condition_A3():              
-                candidate_measurements = []
-                for sat_id, cached_info in self.geometry_data_cache.items():
-                    if sat_id == self.serving_satellite.identity:
-                        continue  # 서빙 위성은 후보가 아니므로 제외
+            self.action_step()
+            # 1ms 대기: 1회의 ACTION_MONITOR 이후, 제어권 인계 (1ms 주기의 모니터링 주기)
+            # fast-forward 활성 시 정지 구간은 다음 관심 시점 직전까지 건너뜀 (cache 고정 구간이므로 동작 동일)
+            yield self.env.timeout(self.idle_steps())
+
+    # ACTION_MONITOR 1회 판단 (POPULATION_SCHEDULER: population.Population이 UE 프로세스 없이 직접 호출)
+    def action_step(self):
+        # --- ACTION: Send Measurement Report ---
+        # --- 서빙 위성 제외, 후보셀들에 대해서만 판별
+        
+        # --Rollback Point--
+        # if self.state == ACTIVE and self.send_request_condition_A3(): 
+        if self.state == ACTIVE and self.env.now >= self.handover_cooldown_end_time and self.send_request_condition_A3():              
+            # Measurement Report (compact): 후보 위성(서빙 제외)의 ID/RSRP/SINR 병렬 배열, cache entry를 복사하지 않음
+            serving_id = self.serving_satellite.identity
+            candidate_ids = [sat_id for sat_id in self.geometry_data_cache if sat_id != serving_id]
+            candidate_measurements = {
+                "id": candidate_ids,
+                "rsrp": [self.geometry_data_cache[sat_id]['rsrp'] for sat_id in candidate_ids],
+                "sinr": [self.geometry_data_cache[sat_id]['sinr'] for sat_id in candidate_ids],
+            }
+            # NOTE: [DEBUG] MR_EXTENDED_FIELDS: 기하 정보(좌표, 거리, 각도)도 같은 순서의 배열로 포함
+            if MR_EXTENDED_FIELDS:
+                for field in ('ue_coords', 'sat_coords', 'distance', 'elevation_angle', 'antenna_angle'):
+                    candidate_measurements[field] = [self.geometry_data_cache[sat_id][field] for sat_id in candidate_ids]
+           
+            # Case: Candidate Satellite List Not Empty (at lease 1 over)
+            if len(candidate_ids) > 0:
+                # Prepare Measurement Report message
+                data = {
+                    "task": MEASUREMENT_REPORT,
+                    "candidate_measurements": candidate_measurements,
+                }
                 
-                # 보고서에 포함할 측정 정보 딕셔너리 생성
-                    measurement_entry = {
-                        "id": sat_id,
-                        "ue_coords": cached_info['ue_coords'],
-                        "sat_coords": cached_info['sat_coords'],
-                        "distance": cached_info['distance'],
-                        "elevation_angle": cached_info['elevation_angle'],
-                        "antenna_angle": cached_info['antenna_angle'],
-                        "rsrp": cached_info['rsrp'],
-                        "sinr": cached_info.get('sinr', -999) # 안전을 위해 .get() 사용
-                    }
-                    candidate_measurements.append(measurement_entry)
-               
-                # Case: Candidate Satellite List Not Empty (at lease 1 over)
-                if len(candidate_measurements) > 0:
-                    # Prepare Measurement Report message
-                    data = {
-                        "task": MEASUREMENT_REPORT,
-                        "candidate_measurements": candidate_measurements,
-                    }
-                    
-                    # 전송 메시지 정보 출력
-                    print(f"--- [UE {self.identity} sends Measurement Report to Satellite {self.serving_satellite.identity} at {self.env.now:.2f}s] ---")
-                    print(json.dumps(data, indent=4))
-                    print("----------------------------------------------------------")
-                    
-                    # NOTE: [TEST] 기하(거리, 각도 등) 정보 출력용 (GEOMETRY_MONITOR process를 통한 cache 기반 로그)
-                    print(f"--- [UE {self.identity} Cached Geometry at {self.env.now:.2f}s] ---")
-                    
-                    candidate_ids = [entry['id'] for entry in candidate_measurements]
-                    ids_to_print = [self.serving_satellite.identity] + candidate_ids
-                    
-                    # NOTE: TRACING: 캐싱 데이터 출력
-                    for sat_id in ids_to_print:
-                        if sat_id in self.geometry_data_cache:
-                            cached_info = self.geometry_data_cache[sat_id]
-                            print(f"  Satellite {sat_id}:")
-                            print(f"   - Coords    : UE({cached_info['ue_coords'][0]:.2f}, {cached_info['ue_coords'][1]:.2f}) | Sat({cached_info['sat_coords'][0]:.2f}, {cached_info['sat_coords'][1]:.2f})")
-                            print(f"   - Geometry  : Dist={cached_info['distance']:.2f}m | Elev={cached_info['elevation_angle']:.2f} degree | Ant_Angle={cached_info['antenna_angle']:.2f} degree")
-                            print(f"   - Path Loss : Total={cached_info['basic_path_loss']:.2f}dB (FSPL={cached_info['fspl']:.2f}, LoS Prob={cached_info['los_prob']:.1f}%)")
-                            print(f"   - RSRP Comp : TxPwr_RB={cached_info['tx_power_per_rb_dbm']:.2f}dBm | SatGain={cached_info['sat_tx_gain_dbi']:.2f}dBi | UEGain={cached_info['ue_rx_gain_dbi']:.2f}dBi")
-                            if 'sinr' in cached_info:
-                                print(f"   - Quality   : RSRP={cached_info['rsrp']:.2f} dBm | SINR={cached_info['sinr']:.2f} dB")
-                                # [수정] 캐시에 저장된 Noise 값 출력
-                                print(f"   - Noise     : Thermal Noise={cached_info['noise']:.2f} dBm")
-                            else:
-                                print(f"   - RSRP Final: {cached_info['rsrp']:.2f} dBm")
-                    print("----------------------------------------------------------")
-                    # --------- TRACING END ---------#
-                    
-                    # Message Send Protocol Start
-                    self.env.process(
-                        self.send_message(
-                            delay=self.satellite_ground_delay,
-                            msg=data,
-                            Q=self.serving_satellite.messageQ,
-                            to=self.serving_satellite
-                        )
-                    )
-                    self.timestamps.append({'timestamp' : [self.env.now]}) # Logging
-                    self.timestamps[-1]['from'] = self.serving_satellite.identity # Logging
-                    self.timer = self.env.now # RE-TRANSMIT TIMER START
-                    self.state = WAITING_RRC_CONFIGURATION # UE STATE CHANGE
-                                    
-            # --- ACTION: Trigger retransmission if conditions are met ---
-            # -- Rollback Point --
-            # if RETRANSMIT and self.state == WAITING_RRC_CONFIGURATION \
-            # and (self.env.now - self.timer) > RETRANSMIT_THRESHOLD \
-            # and self.retransmit_counter < MAX_RETRANSMIT:
-            if RETRANSMIT and self.state == WAITING_RRC_CONFIGURATION and (self.env.now - self.timer) > RETRANSMIT_THRESHOLD and self.retransmit_counter < MAX_RETRANSMIT:
-                # NOTE: Retransmission conditions
-                # 1. RETRANSMIT enabled (see config.py)
-                # 2. UE state is WAITING_RRC_CONFIGURATION
-                # 3. Timer exceeded threshold: now - timer > RETRANSMIT_THRESHOLD
-                # 4. Retransmission attempts < MAX_RETRANSMIT
-
-                self.timer = self.env.now # retransmit timer reset
-                self.timestamps[-1]['timestamp'].append(self.env.now) # Logging
-                # NOTE: 현시점 Re-transmit +1회 실시
+                # 전송 메시지 정보 출력
+                print(f"--- [UE {self.identity} sends Measurement Report to Satellite {self.serving_satellite.identity} at {self.env.now:.2f}s] ---")
+                print(json.dumps(data, indent=4))
+                print("----------------------------------------------------------")
+                
+                # NOTE: [TEST] 기하(거리, 각도 등) 정보 출력용 (GEOMETRY_MONITOR process를 통한 cache 기반 로그)
+                print(f"--- [UE {self.identity} Cached Geometry at {self.env.now:.2f}s] ---")
+                
+                ids_to_print = [self.serving_satellite.identity] + candidate_ids
+                
+                # NOTE: TRACING: 캐싱 데이터 출력
+                for sat_id in ids_to_print:
+                    if sat_id in self.geometry_data_cache:
+                        cached_info = self.geometry_data_cache[sat_id]
+                        print(f"  Satellite {sat_id}:")
+                        print(f"   - Coords    : UE({cached_info['ue_coords'][0]:.2f}, {cached_info['ue_coords'][1]:.2f}) | Sat({cached_info['sat_coords'][0]:.2f}, {cached_info['sat_coords'][1]:.2f})")
+                        print(f"   - Geometry  : Dist={cached_info['distance']:.2f}m | Elev={cached_info['elevation_angle']:.2f} degree | Ant_Angle={cached_info['antenna_angle']:.2f} degree")
+                        print(f"   - Path Loss : Total={cached_info['basic_path_loss']:.2f}dB (FSPL={cached_info['fspl']:.2f}, LoS Prob={cached_info['los_prob']:.1f}%)")
+                        print(f"   - RSRP Comp : TxPwr_RB={cached_info['tx_power_per_rb_dbm']:.2f}dBm | SatGain={cached_info['sat_tx_gain_dbi']:.2f}dBi | UEGain={cached_info['ue_rx_gain_dbi']:.2f}dBi")
+                        if 'sinr' in cached_info:
+                            print(f"   - Quality   : RSRP={cached_info['rsrp']:.2f} dBm | SINR={cached_info['sinr']:.2f} dB")
+                            # [수정] 캐시에 저장된 Noise 값 출력
+                            print(f"   - Noise     : Thermal Noise={cached_info['noise']:.2f} dBm")
+                        else:
+                            print(f"   - RSRP Final: {cached_info['rsrp']:.2f} dBm")
+                print("----------------------------------------------------------")
+                # --------- TRACING END ---------#
                 
-                # Message Send Restart
-                candidates = []
-                for satid in self.satellites:
-                    if self.covered_by(satid) and satid != self.serving_satellite.identity:
-                        candidates.append(satid)
+                # Message Send Protocol Start
+                self.send_message(
+                    delay=self.satellite_ground_delay,
+                    msg=data,
+                    to=self.serving_satellite
+                )
+                self.timestamps.append({'timestamp' : [self.env.now]}) # Logging
+                self.timestamps[-1]['from'] = self.serving_satellite.identity # Logging
+                if self.handovers is not None:
+                    self.handover_row = self.handovers.start(self.identity, self.serving_satellite.identity, self.env.now)
+                self.timer = self.env.now # RE-TRANSMIT TIMER START
+                self.set_state(WAITING_RRC_CONFIGURATION) # UE STATE CHANGE
+                                
+        # --- ACTION: Trigger retransmission if conditions are met ---
+        # -- Rollback Point --
+        # if RETRANSMIT and self.state == WAITING_RRC_CONFIGURATION \
+        # and (self.env.now - self.timer) > RETRANSMIT_THRESHOLD \
+        # and self.retransmit_counter < MAX_RETRANSMIT:
+        if RETRANSMIT and self.state == WAITING_RRC_CONFIGURATION and (self.env.now - self.timer) > RETRANSMIT_THRESHOLD and self.retransmit_counter < MAX_RETRANSMIT:
+            # NOTE: Retransmission conditions
+            # 1. RETRANSMIT enabled (see config.py)
+            # 2. UE state is WAITING_RRC_CONFIGURATION
+            # 3. Timer exceeded threshold: now - timer > RETRANSMIT_THRESHOLD
+            # 4. Retransmission attempts < MAX_RETRANSMIT
+
+            self.timer = self.env.now # retransmit timer reset
+            self.timestamps[-1]['timestamp'].append(self.env.now) # Logging
+            if self.handovers is not None:
+                self.handovers.retransmit(self.handover_row)
+            if self.events is not None:
+                self.events.retransmit(self.env.now, self.identity)
+            # NOTE: 현시점 Re-transmit +1회 실시
+            
+            # Message Send Restart
+            candidates = []
+            for satid in self.satellites:
+                if self.covered_by(satid) and satid != self.serving_satellite.identity:
+                    candidates.append(satid)
+            data = {
+                "task": RETRANSMISSION, # message type은 MR이 아닌 재전송으로 변경
+                "candidate": candidates
+            }
+            if len(candidates) != 0:
+                self.send_message(
+                    delay=self.satellite_ground_delay,
+                    msg=data,
+                    to=self.serving_satellite
+                )
+                self.retransmit_counter += 1 # counter add
+        
+
+        # --- ACTION: RANDOM ACCESS Procedure ---
+        # -- Rollback Point: RACH는 건들지 않음 --
+        if self.state == RRC_CONFIGURED:  # Condition: RRC_CONFIGURED (HO CMD 수신 상태)
+            if self.targetID and self.covered_by(self.targetID): # CHECK
+                target = self.satellites[self.targetID]
                 data = {
-                    "task": RETRANSMISSION, # message type은 MR이 아닌 재전송으로 변경
-                    "candidate": candidates
+                    "task": RRC_RANDOM_ACCESS, # RRC RECONFIGURATION COMPLETE 메시지 생성
                 }
-                if len(candidates) != 0:
-                    self.env.process(
-                        self.send_message(
-                            delay=self.satellite_ground_delay,
-                            msg=data,
-                            Q=self.serving_satellite.messageQ,
-                            to=self.serving_satellite
-                        )
-                    )
-                    self.retransmit_counter += 1 # counter add
+                self.send_message(
+                    delay=self.satellite_ground_delay,
+                    msg=data,
+                    to=target
+                )
+                self.set_state(WAITING_RRC_ULGRANT) # STATE CHANGE
+                
+        # -- Rollback Point --
+        # --- [핵심 수정] SINR 기반의 새로운 연결 종료 로직 ---
+        if self.state == ACTIVE and self.serving_satellite and \
+           self.serving_satellite.identity in self.geometry_data_cache:
             
-
-            # --- ACTION: RANDOM ACCESS Procedure ---
-            # -- Rollback Point: RACH는 건들지 않음 --
-            if self.state == RRC_CONFIGURED:  # Condition: RRC_CONFIGURED (HO CMD 수신 상태)
-                if self.targetID and self.covered_by(self.targetID): # CHECK
-                    target = self.satellites[self.targetID]
-                    data = {
-                        "task": RRC_RANDOM_ACCESS, # RRC RECONFIGURATION COMPLETE 메시지 생성
-                    }
-                    self.env.process(
-                        self.send_message(
-                            delay=self.satellite_ground_delay,
-                            msg=data,
-                            Q=target.messageQ,
-                            to=target
-                        )
-                    )
-                    self.state = WAITING_RRC_ULGRANT # STATE CHANGE
-                    
-            # -- Rollback Point --
-            # --- [핵심 수정] SINR 기반의 새로운 연결 종료 로직 ---
-            if self.state == ACTIVE and self.serving_satellite and \
-               self.serving_satellite.identity in self.geometry_data_cache:
+            # 조건 1: 서빙셀의 SINR이 매우 나쁜가?
+            serving_sinr = self.geometry_data_cache[self.serving_satellite.identity]['sinr']
+            if serving_sinr <= THRESHOLD_Q_OUT:
                 
-                # 조건 1: 서빙셀의 SINR이 매우 나쁜가?
-                serving_sinr = self.geometry_data_cache[self.serving_satellite.identity]['sinr']
-                if serving_sinr <= THRESHOLD_Q_OUT:
-                    
-                    # 조건 2: 갈아탈 만한 다른 좋은 위성이 없는가?
-                    # 이웃 위성들의 SINR 리스트를 생성
-                    neighbor_sinrs = [info['sinr'] for sat_id, info in self.geometry_data_cache.items() \
-                                      if sat_id != self.serving_satellite.identity]
-                    
-                    # all() 함수는 모든 항목이 조건에 맞아야 True. 즉, 모든 이웃의 SINR이 -6dB보다 낮은지 확인
-                    if all(sinr < THRESHOLD_Q_IN for sinr in neighbor_sinrs):
-                        print(f"--- UE {self.identity} Connection Lost at {self.env.now:.2f}s ---")
-                        print(f"    Serving SINR ({serving_sinr:.2f} dB) <= Threshold ({THRESHOLD_Q_OUT} dB)")
-                        print(f"    AND No suitable neighbor found.")
-                        
-                        self.serving_satellite = None
-                        self.state = INACTIVE
-
-            # # Switch to INACTIVE State
-            # if self.serving_satellite is not None and self.outside_coverage():
-            #     # TODO: RLF, HOF 등이 발생하는 경우가 outside_coverage()가 되야함
-            #     print(f"UE {self.identity} lost connection at time {self.env.now} from satellite {self.serving_satellite.identity}") # Logging
-            #     self.serving_satellite = None # serv_idx none
+                # 조건 2: 갈아탈 만한 다른 좋은 위성이 없는가?
+                # 이웃 위성들의 SINR 리스트를 생성
+                neighbor_sinrs = [info['sinr'] for sat_id, info in self.geometry_data_cache.items() \
+                                  if sat_id != self.serving_satellite.identity]
                 
-            #     # ACTIVE/HO CMD 대기 상태에서
-            #     if self.state == ACTIVE or self.state == WAITING_RRC_CONFIGURATION:
-            #         if self.state == WAITING_RRC_CONFIGURATION:
-            #             print(f"UE {self.identity} handover failure at time {self.env.now}") # Logging
-            #             self.timestamps[-1]['timestamp'].append(self.env.now) # Logging
-            #             self.timestamps[-1]['isSuccess'] = False # Logging
-            #         self.state = INACTIVE # STATE CHANGE
-                                
-            # 1ms 대기: 1회의 ACTION_MONITOR 이후, 제어권 인계 (1ms 주기의 모니터링 주기)
-            yield self.env.timeout(1)
+                # all() 함수는 모든 항목이 조건에 맞아야 True. 즉, 모든 이웃의 SINR이 -6dB보다 낮은지 확인
+                if all(sinr < THRESHOLD_Q_IN for sinr in neighbor_sinrs):
+                    print(f"--- UE {self.identity} Connection Lost at {self.env.now:.2f}s ---")
+                    print(f"    Serving SINR ({serving_sinr:.2f} dB) <= Threshold ({THRESHOLD_Q_OUT} dB)")
+                    print(f"    AND No suitable neighbor found.")
+                    
+                    self.serving_satellite = None
+                    self.set_state(INACTIVE)
+
+        # # Switch to INACTIVE State
+        # if self.serving_satellite is not None and self.outside_coverage():
+        #     # TODO: RLF, HOF 등이 발생하는 경우가 outside_coverage()가 되야함
+        #     print(f"UE {self.identity} lost connection at time {self.env.now} from satellite {self.serving_satellite.identity}") # Logging
+        #     self.serving_satellite = None # serv_idx none
+            
+        #     # ACTIVE/HO CMD 대기 상태에서
+        #     if self.state == ACTIVE or self.state == WAITING_RRC_CONFIGURATION:
+        #         if self.state == WAITING_RRC_CONFIGURATION:
+        #             print(f"UE {self.identity} handover failure at time {self.env.now}") # Logging
+        #             self.timestamps[-1]['timestamp'].append(self.env.now) # Logging
+        #             self.timestamps[-1]['isSuccess'] = False # Logging
+        #         self.state = INACTIVE # STATE CHANGE
             
 
     # ==================== Utils (Not related to Simpy) =============
@@ -386,6 +436,27 @@ class UE(Base):
                 
         return False
 
+    # A3 경계까지의 여유(dB): 최고 이웃 SINR - (서빙 SINR + A3_OFFSET), 양수이면 A3 만족
+    # send_request_condition_A3와 같은 cache를 보지만 로그를 남기지 않음 (FastForward 정지 판정용)
+    def a3_gap(self):
+        serving_id = self.serving_satellite.identity
+        if serving_id not in self.geometry_data_cache:
+            return None
+        neighbor_sinrs = [info['sinr'] for sat_id, info in self.geometry_data_cache.items() if sat_id != serving_id]
+        if not neighbor_sinrs:
+            return None
+        return max(neighbor_sinrs) - (self.geometry_data_cache[serving_id]['sinr'] + A3_OFFSET)
+
+    # 연결 종료 조건(서빙 SINR <= Q_OUT, 모든 이웃 SINR < Q_IN) 충족 여부 (ACTION_MONITOR와 동일 조건)
+    def link_lost(self):
+        serving_id = self.serving_satellite.identity
+        if serving_id not in self.geometry_data_cache:
+            return False
+        if self.geometry_data_cache[serving_id]['sinr'] > THRESHOLD_Q_OUT:
+            return False
+        return all(info['sinr'] < THRESHOLD_Q_IN for sat_id, info in self.geometry_data_cache.items() \
+                   if sat_id != serving_id)
+
     # -- Rollback Point --
     # # TODO: RLF를 기반으로 outside_coverage를 구성해야함 (단순 영역을 벗어나는 것이 아님)
     # def outside_coverage(self):
@@ -426,8 +497,10 @@ class UE(Base):
             nlos_cl = RURAL_NLOS_CLUTTER_LOSS[idx]
 
         # MATLAB의 randn(정규분포 난수)을 Python의 random.gauss로 대체
-        los_shadowing = los_std * random.gauss(0, 1)
-        nlos_shadowing_and_clutter = nlos_std * random.gauss(0, 1) + nlos_cl
+        # channel trace 사용 시 채널 전용 난수열 (메시지 jitter 난수열과 분리)
+        rng = self.channel.rng if self.channel is not None else self.rng
+        los_shadowing = los_std * rng.gauss(0, 1)
+        nlos_shadowing_and_clutter = nlos_std * rng.gauss(0, 1) + nlos_cl
         
         # # NOTE: TRACE
         # print(f"DEBUG_SD_CL    @{self.env.now:.2f}s: Elev={elevation_angle:.2f} -> LoS_Shadow={los_shadowing:.2f} dB, NLoS_Total={nlos_shadowing_and_clutter:.2f} dB")
@@ -0,0 +1,80 @@
+import math
+
+import numpy as np
+from scipy.special import jv
+
+from config import *
+
+"""
+[AdaptiveMeasurement]: UE별 거리 적응형 측정 주기 (ADAPTIVE_MEASUREMENT), 서빙 footprint 안쪽 UE는 GEOMETRY_MONITOR 채널 계산을 건너뜀
+    - 여유(margin, dB) = min(A3 경계까지: -(UE.a3_gap), 연결 종료 경계까지: 서빙 SINR - THRESHOLD_Q_OUT)
+    - 변화율 상한 rate (dB/ms): 커버리지 안(수평 거리 0 ~ 1.5 * SATELLITE_R) 평균 RSRP (shadowing 평균: LoS 0, NLoS clutter)의
+      거리 미분 최대값 × SATELLITE_V × 2 (서빙/이웃 위성 두 개의 변화가 반대 방향으로 더해지는 경우)
+    - 다음 측정까지 nominal 주기 수 n = floor((margin - ADAPTIVE_NOISE_MARGIN) / (ADAPTIVE_SAFETY * rate * GEOMETRY_UPDATE_INTERVAL)),
+      1 ~ ADAPTIVE_MAX_INTERVALS (측정 시점은 nominal grid 위: GEOMETRY_PHASE slot, channel trace tick 유지)
+      ADAPTIVE_NOISE_MARGIN: 측정마다 새로 뽑는 shadowing에 의한 SINR 변동 (deterministic 변화율로 설명되지 않는 부분)
+    - nominal 주기 유지: ACTIVE가 아닌 UE (핸드오버 진행 중), 서빙 위성 측정값 없음, channel trace record (모든 tick 기록)
+    - 검증: python3 src/verify_adaptive.py (같은 채널 realization에서 A3 trigger 지연이 GEOMETRY_UPDATE_INTERVAL 이하인지 확인)
+    - DES/PDES 엔진 전용 (vectorized/hybrid background 미지원)
+"""
+
+
+# 수평 거리(m)별 평균 RSRP (dBm): UE.calculate_rsrp에서 shadowing을 평균값으로 대체
+def mean_rsrp(horizontal):
+    dz = SC9_HANDHELD_ALTITUDE - SC9_SATELLITE_ALTITUDE
+    slant = np.sqrt(horizontal ** 2 + dz ** 2)
+    arg = (SC9_SATELLITE_ALTITUDE ** 2 + 2 * SC9_SATELLITE_ALTITUDE * EARTH_RADIUS - slant ** 2) / (2 * slant * EARTH_RADIUS)
+    elevation = np.degrees(np.arcsin(np.clip(arg, -1.0, 1.0)))
+    antenna = np.degrees(np.arctan2(horizontal, abs(dz)))
+
+    fspl = 20 * np.log10(SC9_CARRIER_FREQUENCY_HZ) + 20 * np.log10(slant) + 20 * math.log10(4 * math.pi / LIGHT_SPEED)
+    idx = np.clip(np.round(elevation / 10).astype(np.int64) - 1, 0, 8)
+    path_loss = fspl + (100 - np.asarray(RURAL_LOS_PROB)[idx]) / 100 * np.asarray(RURAL_NLOS_CLUTTER_LOSS)[idx]
+
+    ka = 2 * math.pi * SC9_CARRIER_FREQUENCY_HZ / LIGHT_SPEED * SC9_SATELLITE_ANTENNA_APERTURE / 2
+    z = ka * np.sin(np.radians(antenna))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gain = np.where(antenna == 0, SC9_SATELLITE_TXGAIN, 10 * np.log10(4 * np.abs(jv(1, z) / z) ** 2) + SC9_SATELLITE_TXGAIN)
+
+    tx_power_per_rb = SC9_SATELLITE_TXPW_dBm - 10 * math.log10(NUM_RESOURCE_BLOCKS)
+    return tx_power_per_rb + gain + SC9_HANDHELD_RXGAIN - path_loss - 10 * math.log10(REFERENCE_SIGNAL_FACTOR)
+
+
+# 위성 이동에 의한 A3 gap 변화율 상한 (dB/ms), resolution: 수치 미분 간격 (m)
+def drift_rate(velocity=SATELLITE_V, reach=1.5 * SATELLITE_R, resolution=10.0):
+    horizontal = np.arange(0, reach + resolution, resolution)
+    slope = np.abs(np.diff(mean_rsrp(horizontal))) / resolution # dB/m
+    return 2 * float(slope.max()) * velocity / 1000
+
+
+class AdaptiveMeasurement:
+    def __init__(self, interval=GEOMETRY_UPDATE_INTERVAL, safety=ADAPTIVE_SAFETY, noise_margin=ADAPTIVE_NOISE_MARGIN,
+                 max_intervals=ADAPTIVE_MAX_INTERVALS):
+        self.interval = interval
+        self.noise_margin = noise_margin
+        self.max_intervals = max_intervals
+        self.rate = drift_rate()
+        self.step = safety * self.rate * interval # nominal 주기 1회 동안 허용하는 gap 변화 (dB)
+        self.measurements = 0 # 실행한 측정 수
+        self.skipped = 0 # 건너뛴 nominal 측정 수
+
+    # UE의 다음 geometry 갱신까지 대기 시간 (ms, interval의 배수)
+    def next_interval(self, ue):
+        self.measurements += 1
+        if ue.state != ACTIVE or ue.serving_satellite is None or (ue.channel is not None and not ue.channel.playback):
+            return self.interval
+        serving = ue.geometry_data_cache.get(ue.serving_satellite.identity)
+        if serving is None:
+            return self.interval
+        margin = serving['sinr'] - THRESHOLD_Q_OUT
+        gap = ue.a3_gap()
+        if gap is not None:
+            margin = min(margin, -gap)
+        intervals = int(max(1, min(self.max_intervals, (margin - self.noise_margin) // self.step)))
+        self.skipped += intervals - 1
+        return intervals * self.interval
+
+    def summary(self):
+        total = self.measurements + self.skipped
+        return (f"Adaptive measurement: {self.measurements} of {total} nominal measurements "
+                f"({self.skipped / total * 100 if total else 0:.1f}% skipped), drift bound {self.rate * self.interval:.3f} dB per interval")
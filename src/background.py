@@ -0,0 +1,159 @@
+import json
+import random
+
+import numpy as np
+
+from config import *
+from link import SERVICE_LINK, ISL_LINK, CORE_LINK
+
+"""
+[BackgroundLoad]: hybrid fluid/DES 모드 (HYBRID_FOREGROUND), foreground UE만 UE 상태기계로 실행하고 나머지 UE는 위성 대기열의 aggregate arrival로 모델링
+    - background UE: 위치만 보관 (UE 객체/SimPy 프로세스 없음), GEOMETRY_UPDATE_INTERVAL마다 가장 가까운 위성(서빙 근사)을 배열 연산으로 갱신
+        가장 가까운 위성이 바뀐 UE = 핸드오버 (utils.handout처럼 커버리지 geometry에서 발생량 결정, 위성 이동에 따라 시간별로 변함)
+        커버리지(1.5 * SATELLITE_R) 밖으로 벗어난 UE는 연결 종료 (UE INACTIVE와 같이 재접속 없음)
+    - 핸드오버마다 geometry 갱신 시점에 MR 전송 (foreground UE와 같은 시점: 갱신 직후 A3 판정), 이후 단계는 위성 처리 완료 시점에 이어서 전달 (NEXT_STAGE)
+        GEOMETRY_PHASE: slot(GEOMETRY_UPDATE_INTERVAL // GEOMETRY_PHASE_SLOTS)마다 위상이 해당 slot인 UE만 갱신 (foreground UE와 같은 위상 배정)
+        MR(source) → HO REQUEST(target, ISL) → HO ACK(source, ISL) → RACH(target, HO COMMAND + RA: 지상 지연 2회)
+        → RRC RECONF COMPLETE(target, UL GRANT + 응답: 지상 지연 2회) → AMF RESPONSE(target, PATH SHIFT + 응답: core 지연 2회 + AMF 처리)
+    - background 메시지도 위성 messageQ/CPU 대기열/수락·drop/카운터를 그대로 거침 (실제 대기열 부하), CPU 처리 시간은 handler와 같음 (SERVICE)
+    - 재전송 (RETRANSMIT): foreground UE의 재전송 timer와 같은 조건, UE별 프로세스 없이 핸드오버마다 timeout 이벤트 callback으로 예약
+        MR 송신 후 RETRANSMIT_THRESHOLD를 넘도록 HO COMMAND(source 위성의 HO ACK 처리 완료)가 없으면 source 위성으로 RETRANSMISSION, MAX_RETRANSMIT회까지
+        (MR/재전송 drop, 대기열 지연 모두 포함), 재전송도 MR과 같은 단계로 진행하고 HO COMMAND는 핸드오버당 처음 한 번만 이어서 전달 (UE는 중복 HO COMMAND 무시)
+        HO COMMAND 이후 도착한 중복 MR/재전송/HO REQUEST/HO ACK는 처리 시간 없이 종료 (foreground handler의 connected 검사)
+        핸드오버 종료 (waiting에서 제거, 이후 중복 메시지도 처리하지 않음): 재전송 소진, 커버리지 이탈, ISL 경로 없음, RETRANSMIT = False에서 MR drop
+    - 근사: A3 offset/TTT 대신 최근접 위성 변경 시점, AMF CPU 부하 제외
+"""
+
+BACKGROUND = -1 # background 메시지의 'from' (UE 객체 없음)
+SERVICE = {**PROCESSING_TIME, MEASUREMENT_REPORT: 1} # Satellite handler의 CPU 처리 시간 (MR handler는 1ms)
+
+# HO COMMAND 전까지만 처리하는 단계 (이후 도착한 중복 메시지는 처리 시간 없이 종료)
+SETUP = (MEASUREMENT_REPORT, RETRANSMISSION, HANDOVER_REQUEST, HANDOVER_REQUEST_ACKNOWLEDGE)
+
+# 처리 완료된 background 메시지 task → (다음 task, link, 수신 위성: "source"/"target")
+NEXT_STAGE = {
+    MEASUREMENT_REPORT: (HANDOVER_REQUEST, ISL_LINK, "target"),
+    RETRANSMISSION: (HANDOVER_REQUEST, ISL_LINK, "target"),
+    HANDOVER_REQUEST: (HANDOVER_REQUEST_ACKNOWLEDGE, ISL_LINK, "source"),
+    HANDOVER_REQUEST_ACKNOWLEDGE: (RRC_RANDOM_ACCESS, SERVICE_LINK, "target"),
+    RRC_RANDOM_ACCESS: (RRC_RECONFIGURATION_COMPLETE, SERVICE_LINK, "target"),
+    RRC_RECONFIGURATION_COMPLETE: (AMF_RESPONSE, CORE_LINK, "target"),
+}
+
+
+class BackgroundLoad:
+    def __init__(self, env, positions, satellites, links, satellite_ground_delay=SATELLITE_GROUND_DELAY, seed=SEED, phases=None):
+        self.env = env
+        self.satellites = satellites
+        self.links = links
+        self.ground_delay = satellite_ground_delay
+        self.rng = random.Random(seed) # background 전용 난수열 (foreground jitter 난수열과 분리)
+        self.sat_ids = list(satellites)
+        self.sat_x0 = np.array([satellites[sat_id].position_x for sat_id in self.sat_ids], dtype=float)
+        self.sat_y = np.array([satellites[sat_id].position_y for sat_id in self.sat_ids], dtype=float)
+        self.positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        self.phases = None if phases is None else np.asarray(phases, dtype=np.int64) # UE별 갱신 위상 (ms), None이면 모두 0
+        self.serving, covered = self.nearest(env.now)
+        self.serving[~covered] = -1
+        self.handovers = 0
+        self.messages = 0
+        self.lost = 0
+        self.retransmissions = 0
+        self.waiting = {} # HO COMMAND 대기 중인 핸드오버 ID → 재전송 횟수
+        self.sequence = 0 # 핸드오버 ID
+
+    # 시각 now의 최근접 위성 index와 커버리지 여부 (위성 위치는 x = x0 + 속도 * 시간, fast-forward와 무관), ues: 대상 UE index
+    def nearest(self, now, ues=slice(None)):
+        sat_x = self.sat_x0 + SATELLITE_V * now / 1000
+        positions = self.positions[ues]
+        d2 = (positions[:, :1] - sat_x) ** 2 + (positions[:, 1:] - self.sat_y) ** 2
+        nearest = np.argmin(d2, axis=1) if len(self.sat_ids) else np.full(len(positions), -1)
+        covered = d2[np.arange(len(nearest)), nearest] <= (1.5 * SATELLITE_R) ** 2 if len(self.sat_ids) else np.zeros(len(nearest), dtype=bool)
+        return nearest, covered
+
+    # SimPy process: interval마다 (GEOMETRY_PHASE: slot 폭마다 다음 period 안에 위상이 있는 UE만) 핸드오버 발생 UE를 찾아 MR 전송
+    # (slot 폭이 interval을 나누지 않아도 period 구간이 interval을 빈틈없이 덮음, vectorized.py와 같은 window 판정)
+    def run(self, interval=GEOMETRY_UPDATE_INTERVAL):
+        period = interval if self.phases is None else interval // GEOMETRY_PHASE_SLOTS
+        while True:
+            yield self.env.timeout(period)
+            ues = slice(None) if self.phases is None else np.flatnonzero((self.phases - self.env.now) % interval < period)
+            nearest, covered = self.nearest(self.env.now, ues)
+            serving = self.serving[ues]
+            connected = serving >= 0
+            lost = connected & ~covered
+            serving[lost] = -1
+            self.lost += int(lost.sum())
+            changed = np.flatnonzero(connected & covered & (nearest != serving))
+            indices = np.arange(len(self.positions))[ues]
+            for ue in changed.tolist():
+                self.start_handover(int(indices[ue]), self.sat_ids[serving[ue]], self.sat_ids[nearest[ue]])
+            serving[changed] = nearest[changed]
+            self.serving[ues] = serving
+            self.handovers += len(changed)
+
+    def send(self, delay, task, link, to, source, target, handover):
+        msg = json.dumps({'task': task, 'from': BACKGROUND, 'background': [source, target, handover]})
+        self.messages += 1
+        self.links[link].transmit(delay + self.rng.random() / 1000, msg, self.satellites[to])
+
+    # MR 전송 + 재전송 timer 시작 (ue: background UE index)
+    def start_handover(self, ue, source, target):
+        handover = self.sequence
+        self.sequence += 1
+        self.waiting[handover] = 0
+        self.send(self.ground_delay, MEASUREMENT_REPORT, SERVICE_LINK, source, source, target, handover)
+        self.start_timer(ue, source, target, handover)
+
+    # foreground UE는 1ms polling으로 now - timer > RETRANSMIT_THRESHOLD인 첫 ms에 재전송
+    def start_timer(self, ue, source, target, handover):
+        if not RETRANSMIT:
+            return
+        timer = self.env.timeout(RETRANSMIT_THRESHOLD + 1)
+        timer.callbacks.append(lambda _: self.retransmit(ue, source, target, handover))
+
+    # 재전송 timer 만료: HO COMMAND 전이고 커버리지 안이면 source 위성으로 RETRANSMISSION, 재전송할 수 없으면 핸드오버 종료
+    def retransmit(self, ue, source, target, handover):
+        attempts = self.waiting.get(handover)
+        if attempts is None:
+            return
+        if attempts >= MAX_RETRANSMIT or self.serving[ue] < 0: # 재전송 소진 또는 커버리지 이탈 (연결 종료)
+            del self.waiting[handover]
+            return
+        self.waiting[handover] = attempts + 1
+        self.retransmissions += 1
+        self.send(self.ground_delay, RETRANSMISSION, SERVICE_LINK, source, source, target, handover)
+        self.start_timer(ue, source, target, handover)
+
+    # 위성이 MR을 drop (Satellite.handle_messages): 재전송이 없으면 핸드오버 종료, 있으면 재전송 timer가 처리
+    def dropped(self, msg):
+        if not RETRANSMIT:
+            self.waiting.pop(msg['background'][2], None)
+
+    # 위성이 background 메시지를 처리할지 여부 (Satellite.handle_background): HO COMMAND 이후의 중복 메시지는 처리하지 않음
+    def pending(self, msg):
+        return msg['task'] not in SETUP or msg['background'][2] in self.waiting
+
+    # 위성이 background 메시지 처리를 마치면 다음 단계 메시지 전달 (Satellite.handle_background)
+    def forward(self, satellite, msg):
+        if msg['task'] not in NEXT_STAGE:
+            return
+        task, link, receiver = NEXT_STAGE[msg['task']]
+        source, target, handover = msg['background']
+        if msg['task'] == HANDOVER_REQUEST_ACKNOWLEDGE and self.waiting.pop(handover, None) is None:
+            return # 이미 HO COMMAND를 받은 핸드오버 (MR/재전송 중복 처리)
+        to = source if receiver == "source" else target
+        if link == ISL_LINK:
+            delay = satellite.ISL_delay if satellite.topology is None else satellite.topology.route(satellite.identity, to)
+            if delay is None: # ISL 경로 없음: 핸드오버 종료
+                self.waiting.pop(handover, None)
+                return
+        elif link == SERVICE_LINK:
+            delay = 2 * self.ground_delay
+        else:
+            delay = 2 * CORE_DELAY + PROCESSING_TIME[PATH_SHIFT_REQUEST]
+        self.send(delay, task, link, to, source, target, handover)
+
+    def summary(self):
+        return (f"Background load: {len(self.positions)} UEs, {self.handovers} handovers, {self.messages} messages, "
+                f"{self.retransmissions} retransmissions, {len(self.waiting)} in progress, {self.lost} lost coverage")
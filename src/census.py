@@ -0,0 +1,36 @@
+from config import *
+
+"""
+[UECensus]: UE 상태별 UE 수와 구성원(membership)을 상태 전이 시점에 갱신 (collector가 매 ms 전체 UE를 순회하지 않음)
+    - UE.set_state(state)에서 move 호출: 상태별 카운트 / {UE ID: UE} 갱신 O(1)
+    - count(state): 상태별 UE 수 O(1), counts(): UE_STATES 순서의 상태별 UE 수
+    - positions(states): 해당 상태 UE들의 위치 (screenshot, 해당 상태 UE 수에 비례)
+"""
+
+# UE가 실제로 거치는 상태 (vectorized 엔진 상태 코드 순서와 동일)
+UE_STATES = [ACTIVE, WAITING_RRC_CONFIGURATION, RRC_CONFIGURED, WAITING_RRC_ULGRANT, INACTIVE]
+
+
+class UECensus:
+    def __init__(self, UEs=()):
+        self.members = {state: {} for state in UE_STATES} # 상태 → {UE ID: UE}
+        for ue in UEs:
+            self.add(ue)
+
+    # UE 등록 (현재 상태로)
+    def add(self, ue):
+        self.members[ue.state][ue.identity] = ue
+        ue.census = self
+
+    def move(self, ue, old, new):
+        del self.members[old][ue.identity]
+        self.members[new][ue.identity] = ue
+
+    def count(self, state):
+        return len(self.members[state])
+
+    def counts(self):
+        return [len(self.members[state]) for state in UE_STATES]
+
+    def positions(self, *states):
+        return [(ue.position_x, ue.position_y) for state in states for ue in self.members[state].values()]
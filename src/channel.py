@@ -0,0 +1,137 @@
+import hashlib
+import json
+import math
+import os
+import random
+
+import numpy as np
+
+from config import *
+
+"""
+[ChannelTrace]: 채널 trace 기록/재생 (CHANNEL_TRACE), 프로토콜 파라미터(CPU, 지상 지연 등)만 바뀌는 sweep에서 geometry/path loss/shadowing/SINR 계산을 한 번만 수행
+    - 행렬: <CHANNEL_TRACE_DIR>/channel.npy (geometry tick × UE × 위성 × CHANNEL_FIELDS, 커버리지 밖 = NaN), np.load(mmap_mode='r')로 memory-map
+        geometry tick = GEOMETRY_UPDATE_INTERVAL마다 GEOMETRY_MONITOR 실행 시점 (0, interval, 2 * interval, ..., GEOMETRY_PHASE: UE 위상 + n * interval → tick n)
+    - "record": GEOMETRY_MONITOR가 계산한 geometry_data_cache 값을 기록 / "playback": 계산 대신 행렬에서 cache를 채움 (get_geometry_info/calculate_rsrp 호출 없음)
+      "auto": 같은 시나리오의 trace가 있으면 playback, 없으면 record (sweep 첫 run만 채널 비용 지불)
+    - 시나리오 확인: meta.json의 scenario (SEED, 위성 배치/속도/반경, geometry 주기, UE 위치 digest, CHANNEL_CONFIG 링크 버짓 값 digest)가 다르면 playback 불가 (ValueError)
+      UE/위성과 무관한 cache 값(constants)도 meta.json에 기록, playback은 기록된 값을 사용 (trace 행렬과 같은 설정의 값)
+    - shadowing 난수: trace 사용 시 채널 전용 난수열 (random.Random(SEED)) → 메시지 jitter 난수열과 분리, record run과 playback run 결과 동일
+    - DES 엔진 전용 (vectorized/PDES 미지원)
+"""
+
+CHANNEL_FIELDS = ("distance", "elevation_angle", "antenna_angle", "basic_path_loss", "fspl", "los_prob",
+                  "los_shadowing", "nlos_total_loss", "sat_tx_gain_dbi", "rsrp", "sinr")
+RSRP = CHANNEL_FIELDS.index("rsrp")
+
+# 채널 값(geometry/path loss/shadowing/RSRP/SINR) 계산에 쓰이는 config 값: 하나라도 바뀌면 기존 trace 재사용 불가
+CHANNEL_CONFIG = ("LIGHT_SPEED", "EARTH_RADIUS", "SC9_CARRIER_FREQUENCY_HZ", "SC9_RB_BANDWIDTH_HZ", "SC9_SATELLITE_TXPW_dBm",
+                  "SC9_SATELLITE_TXGAIN", "SC9_SATELLITE_ALTITUDE", "SC9_SATELLITE_ANTENNA_APERTURE",
+                  "SC9_HANDHELD_ALTITUDE", "SC9_HANDHELD_RXGAIN", "SC9_HANDHELD_NOISE_FIGURE",
+                  "ENVIRONMENT_TYPE", "RURAL_LOS_PROB", "RURAL_LOS_SHADOW_STD", "RURAL_NLOS_SHADOW_STD", "RURAL_NLOS_CLUTTER_LOSS",
+                  "NUM_RESOURCE_BLOCKS", "REFERENCE_SIGNAL_FACTOR", "THERMAL_NOISE_DENSITY")
+
+
+# 채널 값을 결정하는 시나리오 정보 (같으면 trace 재사용 가능)
+def scenario_key(ue_ids, positions, sat_ids):
+    digest = hashlib.sha1(np.asarray(positions, dtype=float).tobytes()).hexdigest()
+    channel = hashlib.sha1(json.dumps({name: globals()[name] for name in CHANNEL_CONFIG}, sort_keys=True).encode()).hexdigest()
+    return {
+        'seed': SEED, 'interval': GEOMETRY_UPDATE_INTERVAL, 'satellite_r': SATELLITE_R, 'satellite_v': SATELLITE_V,
+        'sat_positions': {str(sat_id): list(POS_SATELLITES[sat_id]) for sat_id in sat_ids},
+        'ue_ids': list(ue_ids), 'ue_positions': digest, 'channel': channel,
+        **({'phase': [GEOMETRY_PHASE, GEOMETRY_PHASE_SLOTS]} if GEOMETRY_PHASE is not None else {}), # 위상 없음: 기존 trace와 같은 key
+    }
+
+
+class ChannelTrace:
+    def __init__(self, path, mode, UEs, satellites, duration=DURATION):
+        self.path = path
+        self.ue_index = {ue_id: i for i, ue_id in enumerate(UEs)}
+        self.sat_ids = list(satellites)
+        self.sat_index = {sat_id: i for i, sat_id in enumerate(self.sat_ids)}
+        self.scenario = scenario_key(UEs, [(ue.position_x, ue.position_y) for ue in UEs.values()], satellites)
+        self.ticks = math.ceil(duration / GEOMETRY_UPDATE_INTERVAL)
+        self.meta = self.reusable()
+        if mode == "auto":
+            mode = "playback" if self.meta else "record"
+        self.mode = mode
+        self.rng = random.Random(SEED) # 채널 전용 shadowing 난수열
+        self.entries = 0
+
+        matrix_path = os.path.join(path, "channel.npy")
+        if mode == "record":
+            os.makedirs(path, exist_ok=True)
+            if os.path.exists(os.path.join(path, "meta.json")):
+                os.remove(os.path.join(path, "meta.json")) # 기록 중/중단된 trace는 재사용하지 않음
+            shape = (self.ticks, len(self.ue_index), len(self.sat_ids), len(CHANNEL_FIELDS))
+            self.matrix = np.lib.format.open_memmap(matrix_path, mode='w+', dtype=np.float64, shape=shape)
+            self.matrix[:] = np.nan
+        elif mode == "playback":
+            if not self.meta:
+                raise ValueError(f"Channel trace {path} was recorded for a different scenario or a shorter duration")
+            self.matrix = np.load(matrix_path, mmap_mode='r')
+        else:
+            raise ValueError(f"Unknown CHANNEL_TRACE mode: {mode}")
+
+        # UE/위성과 무관한 cache 값 (calculate_rsrp, _calculate_sinr와 같은 식), playback은 trace 기록 시의 값
+        self.constants = self.meta['constants'] if mode == "playback" else {
+            'tx_power_total_dbm': SC9_SATELLITE_TXPW_dBm,
+            'tx_power_per_rb_dbm': SC9_SATELLITE_TXPW_dBm - 10 * math.log10(NUM_RESOURCE_BLOCKS),
+            'ue_rx_gain_dbi': SC9_HANDHELD_RXGAIN,
+            'rs_factor': REFERENCE_SIGNAL_FACTOR,
+            'noise': THERMAL_NOISE_DENSITY + 10 * math.log10(SC9_RB_BANDWIDTH_HZ) + SC9_HANDHELD_NOISE_FIGURE,
+        }
+
+    @property
+    def playback(self):
+        return self.mode == "playback"
+
+    # 기존 trace가 같은 시나리오이고 현재 duration을 포함하면 meta, 아니면 None
+    def reusable(self):
+        try:
+            with open(os.path.join(self.path, "meta.json")) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get('complete', False) and meta['scenario'] == self.scenario and meta['ticks'] >= self.ticks and 'constants' in meta:
+            return meta
+        return None
+
+    # GEOMETRY_MONITOR 계산 결과 기록: covered 위성의 cache entry
+    def record(self, now, ue_id, covered_sat_ids, cache):
+        tick = int(now // GEOMETRY_UPDATE_INTERVAL)
+        if tick >= self.ticks:
+            return
+        row = self.matrix[tick, self.ue_index[ue_id]]
+        for sat_id in covered_sat_ids:
+            entry = cache[sat_id]
+            row[self.sat_index[sat_id]] = [entry[field] for field in CHANNEL_FIELDS]
+            self.entries += 1
+
+    # trace에서 cache 갱신 (covered 위성 entry만 교체, 나머지 기존 entry 유지: 계산 경로와 동일)
+    def load(self, ue, now):
+        values = self.matrix[int(now // GEOMETRY_UPDATE_INTERVAL), self.ue_index[ue.identity]].tolist()
+        cache = ue.geometry_data_cache
+        for sat_id, row in zip(self.sat_ids, values):
+            if row[RSRP] != row[RSRP]: # NaN: 커버리지 밖
+                continue
+            satellite = ue.satellites[sat_id]
+            entry = dict(zip(CHANNEL_FIELDS, row))
+            entry['ue_coords'] = (ue.position_x, ue.position_y)
+            entry['sat_coords'] = (satellite.position_x, satellite.position_y)
+            entry.update(self.constants)
+            cache[sat_id] = entry
+            self.entries += 1
+
+    # 기록 완료: 행렬 flush 후 meta 작성 (meta가 있어야 재사용 가능)
+    def close(self):
+        if self.mode != "record":
+            return
+        self.matrix.flush()
+        with open(os.path.join(self.path, "meta.json"), 'w') as f:
+            json.dump({'complete': True, 'ticks': self.ticks, 'sat_ids': self.sat_ids, 'fields': list(CHANNEL_FIELDS),
+                       'scenario': self.scenario, 'constants': self.constants}, f)
+
+    def summary(self):
+        return f"Channel trace ({self.mode}): {self.entries} cache entries, {self.path}"
@@ -1,9 +1,22 @@
 import math
+from enum import IntEnum
 
 # NOTE: SIMULATION CONFIG
 SEED = 10 # Random Seed
 DURATION = 10000 # [ms]
 
+# NOTE: ENGINE CONFIG
+ENGINE = "des" # "des": SimPy 기반 entity 시뮬레이션 / "vectorized": 배열 연산 기반 time-stepped 엔진 (vectorized.py, 대규모 UE)
+               # "pdes": 위성 cluster 단위 partition을 여러 process에서 실행하는 병렬 DES (pdes.py)
+VECTOR_STEP = 1 # [ms] vectorized 엔진의 step 크기
+PDES_WORKERS = 4 # "pdes" 엔진의 worker process(partition) 수
+
+# NOTE: SCHEDULER CONFIG
+SCHEDULER = "simpy" # "simpy": simpy.Environment / "tick": 정수 tick calendar queue 기반 TickEnvironment (scheduler.py)
+TICKS_PER_MS = 1000000 # TickEnvironment 시간 해상도 (1 tick = 1 ns), send_message jitter(0~1 us)가 구분되도록 ns 단위 사용
+POPULATION_SCHEDULER = False # True: UE별 SimPy 프로세스(init/MESSAGE_CONTROL/ACTION_MONITOR/GEOMETRY_MONITOR, 메시지별 cpu_processing) 대신
+                             # UE 전체의 wake-up을 heap 하나로 관리하는 프로세스 1개로 실행 (population.py, 대규모 UE)
+
 # NOTE: ENTITIES CONFIG
 NUMBER_UE = 1 # UE 단말 수
 SATELLITE_R = 25 * 1000 # 위성 커버리지 반경 (m)
@@ -14,15 +27,59 @@ SATELLITE_GROUND_DELAY = 3 # Propagation Delay (ms)
 SATELLITE_SATELLITE_DELAY = 1 # ISL Delay (ms)
 CORE_DELAY = 10 # Core Network Delay (ms)
 
+# NOTE: ISL TOPOLOGY CONFIG
+ISL_TOPOLOGY = "full" # "full": 모든 위성 쌍 직접 연결 (1 hop) / "hex": 육각 배치 인접 위성 / "grid": +Grid (행 내 좌우 + 인접 행 최근접), 다중 hop 경로 지연 = hop 수 * SATELLITE_SATELLITE_DELAY
+
 # NOTE: RE-TRANSMITION CONFIG
 RETRANSMIT = True # Enable/Disable
 RETRANSMIT_THRESHOLD = SATELLITE_GROUND_DELAY * 2 + SATELLITE_SATELLITE_DELAY * 2 + 22 # 재전송 임계값: 왕복지연 고려
 MAX_RETRANSMIT = 15 # 최대 재전송 수
 
+# NOTE: FAST-FORWARD CONFIG (정지 구간 건너뛰기)
+FAST_FORWARD = True # Enable/Disable: 핸드오버 wave 사이 정지 구간에서 1ms polling을 다음 관심 시점까지 건너뜀
+FAST_FORWARD_A3_MARGIN = 0 # [dB] A3 경계(이웃 SINR > 서빙 SINR + A3_OFFSET)까지 여유가 이 값 이하인 UE가 있으면 건너뛰지 않음
+                           # (cache는 geometry 갱신 사이에 고정이므로 0이면 정확, 양수는 TTT/L3 필터 등 ms 단위 판정 추가 시를 위한 보수적 여유)
+
+# NOTE: MESSAGE TRACE CONFIG (위성 수신 메시지 lifecycle: 전파/대기/처리 지연 히스토그램)
+MESSAGE_TRACE = True # Enable/Disable
+TRACE_BIN_WIDTH = 0.5 # 히스토그램 bin 폭 (ms)
+TRACE_BINS = 400 # bin 수 (마지막 bin = overflow, 기본 0~200ms)
+
+# NOTE: EVENT TRACE CONFIG (eventtrace.py: 메시지 이벤트 trace, python3 src/replay.py <run 디렉토리>로 결과 재계산)
+EVENT_TRACE = False # Enable/Disable (DES 엔진 전용)
+EVENT_TRACE_FILE = "events.npz" # run 디렉토리의 trace 파일
+
+# NOTE: CHANNEL TRACE CONFIG (channel.py: geometry/path loss/shadowing/SINR 기록 후 protocol sweep에서 재생)
+CHANNEL_TRACE = None # None: 매번 계산 / "record" / "playback" / "auto": 같은 시나리오 trace가 있으면 playback, 없으면 record (DES 엔진 전용)
+CHANNEL_TRACE_DIR = "channel_trace" # res 디렉토리 아래 trace 디렉토리 (channel.npy + meta.json)
+
+# NOTE: HYBRID CONFIG (background.py: foreground UE만 UE 상태기계, 나머지 UE는 위성 대기열의 aggregate arrival)
+HYBRID_FOREGROUND = None # foreground UE 수 (None: 모든 UE를 UE 객체로 실행, DES 엔진 전용)
+
+# NOTE: HANDOVER KPI CONFIG (kpi.py)
+KPI_PERCENTILES = (50, 90, 95, 99) # latency/interruption 분포 백분위
+KPI_BIN = 100 # 시간 구간별 시도/성공 수 집계 단위 (ms)
+
+# NOTE: PROGRESS CONFIG (progress.py)
+PROGRESS_INTERVAL = 5 # 진행 상황 출력/status 파일 갱신 주기 (wall time, 초)
+PROGRESS_STATUS = "status.json" # run 디렉토리의 status 파일 (sweep dashboard: python3 src/progress.py res/)
+
+# NOTE: MEMORY PROFILE CONFIG (memory.py, DES 엔진)
+MEMORY_PROFILE = False # Enable/Disable: 구성 요소별 메모리 샘플링 (tracemalloc 사용으로 실행이 느려짐), 결과는 run 디렉토리 memory.json
+MEMORY_INTERVAL = 1000 # 샘플링 주기 (시뮬레이션 ms)
+MEMORY_TOP = 5 # summary에 표시할 tracemalloc 상위 할당 파일 수
+
+# NOTE: RESULT EXPORT CONFIG (export.py, graph_data/run_data)
+EXPORT_FORMAT = "npz" # "npz": 압축 파일 하나, 배열 단위 lazy 로드 / "npy": 배열별 파일, memory-map으로 위성/시간 slice 로드 (긴 run)
+
+# NOTE: RESULT STORE CONFIG (results.py)
+RESULT_STORE = "results.db" # sweep 결과 SQLite 파일 (res/ 아래, run별 디렉토리와 함께 기록), None이면 기록 안 함
+
 # NOTE: CPU CONFIG
 QUEUED_SIZE = 500 # Satellite messageQ 최대 크기
 SATELLITE_CPU = 4 # Satellite CPU 리소스 수
 UE_CPU = 4 # UE CPU 리소스 수
+QUEUE_THRESHOLDS = (1, 10, 50) # 위성 CPU 대기 길이 통계: 대기 길이가 각 값 이상이었던 누적 시간 (ms)
 
 # TODO: CHECK
 GROUP_AREA_L = 1 * 1000 # This is to compare with group handover
@@ -83,17 +140,31 @@ TIERS = 2  # 예시: 중심 위성 + 2 tiers (총 1+6+12=19개 위성)
 POS_SATELLITES = generate_satellite_positions(SATELLITE_R, TIERS)
 
 # NOTE: MESSAGE TYPE DEFINITION
-MEASUREMENT_REPORT = "MEASUREMENT_REPORT"
-HANDOVER_REQUEST = "HANDOVER_REQUEST"
-HANDOVER_REQUEST_ACKNOWLEDGE = "HANDOVER_REQUEST_ACKNOWLEDGE"
-HO_COMMAND = "RRC_RECONFIGURATION"
-RRC_RANDOM_ACCESS = "RRC_RANDOM_ACCESS"
-RRC_ULGRANT = "RRC_ULGRANT"
-RRC_RECONFIGURATION_COMPLETE = "RRC_RECONFIGURATION_COMPLETE"
-RRC_RECONFIGURATION_COMPLETE_RESPONSE = "RRC_RECONFIGURATION_COMPLETE_RESPONSE"
-PATH_SHIFT_REQUEST = "PATH_SHIFT_REQUEST"
-RETRANSMISSION = "RETRANSMISSION"
-AMF_RESPONSE = "AMF_RESPONSE"
+# IntEnum: 메시지 JSON에는 정수로 직렬화되고, 각 객체의 handler dispatch table / 카운터 table의 index로 사용
+class Task(IntEnum):
+    MEASUREMENT_REPORT = 0
+    HANDOVER_REQUEST = 1
+    HANDOVER_REQUEST_ACKNOWLEDGE = 2
+    RRC_RECONFIGURATION = 3
+    RRC_RANDOM_ACCESS = 4
+    RRC_ULGRANT = 5
+    RRC_RECONFIGURATION_COMPLETE = 6
+    RRC_RECONFIGURATION_COMPLETE_RESPONSE = 7
+    PATH_SHIFT_REQUEST = 8
+    RETRANSMISSION = 9
+    AMF_RESPONSE = 10
+
+MEASUREMENT_REPORT = Task.MEASUREMENT_REPORT
+HANDOVER_REQUEST = Task.HANDOVER_REQUEST
+HANDOVER_REQUEST_ACKNOWLEDGE = Task.HANDOVER_REQUEST_ACKNOWLEDGE
+HO_COMMAND = Task.RRC_RECONFIGURATION
+RRC_RANDOM_ACCESS = Task.RRC_RANDOM_ACCESS
+RRC_ULGRANT = Task.RRC_ULGRANT
+RRC_RECONFIGURATION_COMPLETE = Task.RRC_RECONFIGURATION_COMPLETE
+RRC_RECONFIGURATION_COMPLETE_RESPONSE = Task.RRC_RECONFIGURATION_COMPLETE_RESPONSE
+PATH_SHIFT_REQUEST = Task.PATH_SHIFT_REQUEST
+RETRANSMISSION = Task.RETRANSMISSION
+AMF_RESPONSE = Task.AMF_RESPONSE
 
 CPU_SCALE = 1
 PROCESSING_TIME = {
@@ -116,6 +187,14 @@ PROCESSING_TIME = {
 
 # NOTE: Process Interval
 GEOMETRY_UPDATE_INTERVAL = 100 # UE의 기하정보 수집 주기[ms]
+GEOMETRY_PHASE = None # UE별 geometry 갱신 위상: None (모든 UE가 0 ms부터 같은 시점에 갱신) / "round_robin" (UE ID 순서대로 slot 배정) / "random" (SEED 기반 무작위 slot)
+GEOMETRY_PHASE_SLOTS = 10 # 위상 slot 수 k: 주기를 k개 slot (GEOMETRY_UPDATE_INTERVAL // k ms 간격)으로 나눠 slot마다 1/k의 UE만 갱신
+
+# NOTE: ADAPTIVE MEASUREMENT CONFIG (adaptive.py: A3 경계까지 여유가 큰 UE는 geometry 갱신을 GEOMETRY_UPDATE_INTERVAL 배수로 늦춤, 검증: verify_adaptive.py)
+ADAPTIVE_MEASUREMENT = False # Enable/Disable (DES/PDES 엔진)
+ADAPTIVE_SAFETY = 2.0 # 위성 이동에 의한 SINR 변화율 상한(평균 RSRP 기준)에 곱하는 안전 계수 (간섭에 의한 SINR 증폭 포함)
+ADAPTIVE_NOISE_MARGIN = 6 # [dB] 측정마다 새로 뽑는 shadowing에 의한 SINR 변동 여유 (여유가 이 값 이하인 UE는 항상 nominal 주기)
+ADAPTIVE_MAX_INTERVALS = 10 # 건너뛸 수 있는 최대 주기 수 (다음 측정까지 최대 ADAPTIVE_MAX_INTERVALS * GEOMETRY_UPDATE_INTERVAL ms)
 
 # NOTE: UE STATE DEFINITION
 ACTIVE = "ACTIVE"
@@ -160,6 +239,7 @@ SC9_HANDHELD_TXPW_dBm = 23                 # Handheld(UE) Tx Power (dBm)
 # --- Handover Trigger Parameters ---
 A3_OFFSET = 3  # Event A3 트리거 오프셋 (dB)
 TIME_TO_TRIGGER = 400 # 트리거 유지 시간 (40ms)
+MR_EXTENDED_FIELDS = False # [DEBUG] Measurement Report에 후보 위성별 좌표/거리/각도 배열 추가 (기본: ID/RSRP/SINR만)
 
 # --- Radio Link Checks ---
 THRESHOLD_Q_OUT = -8    # SINR -8 dB
@@ -0,0 +1,66 @@
+import numpy as np
+
+"""
+[MessageCounters]: 모든 위성의 메시지 카운터를 (위성 × 카운터) 정수 배열 하나로 관리
+    - 카운터는 이름으로 등록(register)하고 열 index로 증가: 새 카운터(task별 drop, 우선순위별 수락 등)는 등록만으로 추가
+    - current: 등록된 카운터 열의 view (stats collector가 1ms마다 ChangePointSeries에 전달, 값이 바뀐 경우만 복사)
+    - MESSAGE_COUNTERS: 기본 카운터 (기존 cumulativeMessageCount 필드와 같은 이름/의미, DataCollection.cumulative_* 시계열과 대응)
+    - SatelliteCounters: 위성 하나의 행(row) view (satellite.counter)
+"""
+
+MESSAGE_COUNTERS = ["message_from_UE_measurement", "message_from_UE_retransmit", "message_from_UE_RA",
+                    "message_from_satellite", "message_from_AMF", "message_dropped", "total_messages"]
+
+
+class MessageCounters:
+    def __init__(self, sat_ids, names=MESSAGE_COUNTERS, capacity=32):
+        self.sat_ids = list(sat_ids)
+        self.row = {sat_id: i for i, sat_id in enumerate(self.sat_ids)} # 위성 ID → 행 index
+        self.names = [] # 등록 순서 = 열 index
+        self.column = {} # 카운터 이름 → 열 index
+        self.values = np.zeros((len(self.sat_ids), capacity), dtype=np.int64) # 열은 미리 할당, 부족하면 2배로 확장
+        for name in names:
+            self.register(name)
+
+    # 카운터 등록 (이미 있으면 기존 열 index 반환)
+    def register(self, name):
+        if name in self.column:
+            return self.column[name]
+        if len(self.names) == self.values.shape[1]:
+            self.values = np.concatenate([self.values, np.zeros_like(self.values)], axis=1)
+        self.column[name] = len(self.names)
+        self.names.append(name)
+        return self.column[name]
+
+    def view(self, sat_id):
+        return SatelliteCounters(self, self.row[sat_id])
+
+    # 현재 값 view (위성 × 등록된 카운터), 복사하지 않음: 보관하려면 복사 (ChangePointSeries.record는 변경 시 복사)
+    def current(self):
+        return self.values[:, :len(self.names)]
+
+
+class SatelliteCounters:
+    def __init__(self, counters, row):
+        self.counters = counters
+        self.row = row
+
+    # columns(열 index tuple)의 카운터를 각각 1 증가
+    def add(self, columns):
+        values = self.counters.values
+        for column in columns:
+            values[self.row, column] += 1
+
+    def register(self, name):
+        return self.counters.register(name)
+
+    def as_dict(self):
+        values = self.counters.values[self.row]
+        return {name: int(values[column]) for column, name in enumerate(self.counters.names)}
+
+    # 기존 cumulativeMessageCount 필드 이름으로 조회 (counter.message_dropped 등)
+    def __getattr__(self, name):
+        counters = self.__dict__.get('counters')
+        if counters is None or name not in counters.column:
+            raise AttributeError(name)
+        return int(counters.values[self.row, counters.column[name]])
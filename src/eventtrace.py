@@ -0,0 +1,97 @@
+import json
+from array import array
+
+import numpy as np
+
+from config import *
+from census import UE_STATES
+
+"""
+[EventTrace]: 메시지 이벤트 trace (EVENT_TRACE), 모든 메시지 이벤트를 발생 순서대로 typed array(열 단위)에 기록 → npz (replay.py로 재시뮬레이션 없이 결과 재계산)
+    - 한 행 = 한 이벤트: time, kind, node_type/node (이벤트 발생 객체), peer_type/peer (상대 객체), task, aux
+        SEND:      node → peer 메시지 송신 (Base.send_message), task
+        ADMIT:     위성 node가 peer의 메시지 수락 (CPU 요청), task, aux = CPU 우선순위
+        DROP:      위성 node가 peer의 메시지 drop (QUEUED_SIZE 초과), task, aux = CPU 우선순위
+        CPU_START: 위성 node CPU 할당 (처리 시작), task, aux = 해당 메시지의 ADMIT 행 index
+        CPU_END:   위성 node 처리 완료, task, aux = 해당 메시지의 ADMIT 행 index
+        STATE:     UE node 상태 전이 (UE.set_state 호출마다), task = UE_STATES index, peer = 서빙 위성 (없으면 -1), aux = target 위성 (없으면 -1)
+        RETRANSMIT: UE node MR 재전송 시점 (재전송 timer 만료, 후보 위성이 없어 송신하지 않은 경우 포함)
+        SAMPLE:    stats collector 샘플 시점 (aux = 1: 수집, 0: fast-forward backfill), 이전 이벤트까지가 해당 샘플 값
+    - 객체 종류: ENTITY_TYPES index (UE, satellite, AMF), 해당 없음 = -1
+    - 저장: EVENT_TRACE_FILE (npz) 열 배열 + meta (위성/UE ID, UE 위치, 카운터 이름, task별 카운터 열 index table, 위성 CPU/대기열 설정)
+    - DES 엔진 전용 (vectorized/PDES 미지원)
+"""
+
+SEND, ADMIT, DROP, CPU_START, CPU_END, STATE, RETRANSMIT, SAMPLE = range(8)
+KINDS = ["SEND", "ADMIT", "DROP", "CPU_START", "CPU_END", "STATE", "RETRANSMIT", "SAMPLE"]
+ENTITY_TYPES = ["UE", "satellite", "AMF"]
+FIELDS = (("time", 'd'), ("kind", 'b'), ("node_type", 'b'), ("node", 'i'), ("peer_type", 'b'), ("peer", 'i'), ("task", 'b'), ("aux", 'i'))
+
+TYPE_INDEX = {name: index for index, name in enumerate(ENTITY_TYPES)}
+STATE_INDEX = {state: index for index, state in enumerate(UE_STATES)}
+SATELLITE = TYPE_INDEX["satellite"]
+UE_TYPE = TYPE_INDEX["UE"]
+
+
+class EventTrace:
+    def __init__(self):
+        self.columns = {name: array(code) for name, code in FIELDS}
+        self.appends = [column.append for column in self.columns.values()]
+
+    def __len__(self):
+        return len(self.columns["time"])
+
+    def record(self, time, kind, node_type=-1, node=-1, peer_type=-1, peer=-1, task=-1, aux=-1):
+        for append, value in zip(self.appends, (time, kind, node_type, node, peer_type, peer, task, aux)):
+            append(value)
+
+    def send(self, time, sender, receiver, task):
+        self.record(time, SEND, TYPE_INDEX[sender.type], sender.identity, TYPE_INDEX[receiver.type], receiver.identity, task)
+
+    # 위성 수신 메시지 수락/drop (admitted: False면 DROP), 기록한 행 index 반환
+    def receive(self, time, sat_id, sender, task, priority, admitted):
+        self.record(time, ADMIT if admitted else DROP, SATELLITE, sat_id, -1, sender, task, priority)
+        return len(self) - 1
+
+    def cpu(self, time, kind, sat_id, task, row):
+        self.record(time, kind, SATELLITE, sat_id, task=task, aux=row)
+
+    def state(self, time, ue_id, state, serving, target):
+        self.record(time, STATE, UE_TYPE, ue_id, SATELLITE, -1 if serving is None else serving, STATE_INDEX[state], -1 if target is None else target)
+
+    def retransmit(self, time, ue_id):
+        self.record(time, RETRANSMIT, UE_TYPE, ue_id)
+
+    def sample(self, time, collected=True):
+        self.record(time, SAMPLE, aux=int(collected))
+
+    # 열 배열 {이름: numpy 배열}
+    def arrays(self):
+        return {name: np.frombuffer(column, dtype=np.dtype(code)).copy() if len(column) else np.zeros(0, dtype=np.dtype(code))
+                for (name, code), column in zip(FIELDS, self.columns.values())}
+
+    # replay에 필요한 시나리오 정보: 위성/UE, 카운터 이름과 task별 수신/수락/drop 카운터 열 (모든 위성 공통 dispatch table)
+    def save(self, path, satellites, UEs, duration=DURATION):
+        satellite = next(iter(satellites.values()), None)
+        meta = {
+            'duration': duration,
+            'kinds': KINDS,
+            'entity_types': ENTITY_TYPES,
+            'ue_states': list(UE_STATES),
+            'sat_ids': list(satellites),
+            'ue_ids': list(UEs),
+            'ue_positions': [(ue.position_x, ue.position_y) for ue in UEs.values()],
+            'counter_names': list(satellite.counter.counters.names) if satellite else [],
+            'receive_counters': [list(columns) for columns in satellite.counters] if satellite else [],
+            'admit_counters': [list(columns) for columns in satellite.admit_counters] if satellite else [],
+            'drop_counters': [list(columns) for columns in satellite.drop_counters] if satellite else [],
+            'satellite_cpu': satellite.cpus.capacity if satellite else SATELLITE_CPU,
+            'queued_size': QUEUED_SIZE,
+        }
+        np.savez_compressed(path, meta=np.array(json.dumps(meta)), **self.arrays())
+
+
+# (열 배열 {이름: numpy 배열}, meta)
+def load(path):
+    with np.load(path) as f:
+        return {name: f[name] for name, _ in FIELDS}, json.loads(str(f['meta']))
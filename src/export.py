@@ -0,0 +1,149 @@
+import json
+import os
+
+import numpy as np
+
+from config import *
+from handover import FIELDS as HANDOVER_FIELDS, HandoverEvents
+from timeseries import ChangePointSeries
+from census import UE_STATES
+
+"""
+[Run export]: DataCollection 결과를 배열 파일 + JSON 메타데이터로 저장 (pickle 대체, DataCollection 클래스 없이 로드)
+    - <path>/meta.json: 형식, 배열 이름/shape/dtype, 위성 ID/카운터 이름 (열 index), 시간 범위
+    - EXPORT_FORMAT "npz": <path>/data.npz 압축 파일, 배열 단위 lazy 로드 (필요한 배열만 압축 해제)
+                    "npy": <path>/<배열>.npy, np.load(mmap_mode='r')로 memory-map → 위성/시간 slice만 읽음 (긴 run)
+    - 배열:
+        x (샘플 시각), 변경 시점 series (timeseries.ChangePointSeries) <name>_t (변경 시각) / <name> (값):
+            counters (변경 × 위성 × 카운터), queue (변경 × 위성), waiting (변경), ue_states (변경 × UE 상태, meta ue_states 순서)
+        ue_id / ue_position, UE_time_stamp는 ragged → record별 ts_ue / ts_from / ts_success + ts_offsets / ts_values
+        handover_<field>: HandoverEvents 열
+    - RunData: lazy reader, series(name, satellites, start, stop)로 위성/시간(ms) 구간만 조회, load_collection()으로 DataCollection 복원
+"""
+
+FORMAT_VERSION = 2
+
+
+def _timestamp_arrays(UE_time_stamp):
+    records = [(ue_id, record) for ue_id, records in UE_time_stamp.items() for record in records]
+    lengths = [len(record['timestamp']) for _, record in records]
+    return {
+        'ts_ue': np.array([ue_id for ue_id, _ in records], dtype=np.int64),
+        'ts_from': np.array([record.get('from', -1) for _, record in records], dtype=np.int64),
+        'ts_success': np.array([record.get('isSuccess', False) for _, record in records], dtype=bool),
+        'ts_offsets': np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]).astype(np.int64),
+        'ts_values': np.array([t for _, record in records for t in record['timestamp']], dtype=float),
+    }
+
+
+def export_run(data, path, storage=EXPORT_FORMAT):
+    os.makedirs(path, exist_ok=True)
+    arrays = {'x': np.asarray(data.x, dtype=float)}
+    for name, series in (('counters', data.counters), ('queue', data.queue), ('waiting', data.waiting), ('ue_states', data.ue_states)):
+        if series is not None and len(series):
+            arrays[name + '_t'], arrays[name] = series.arrays()
+    ue_ids = sorted(data.UE_positions)
+    arrays['ue_id'] = np.array(ue_ids, dtype=np.int64)
+    arrays['ue_position'] = np.array([data.UE_positions[ue_id] for ue_id in ue_ids], dtype=float).reshape(-1, 2)
+    arrays.update(_timestamp_arrays(data.UE_time_stamp))
+    if data.handovers is not None:
+        arrays.update({f"handover_{name}": getattr(data.handovers, name) for name, _ in HANDOVER_FIELDS})
+
+    meta = {
+        'format': FORMAT_VERSION,
+        'storage': storage,
+        'time': [float(arrays['x'][0]), float(arrays['x'][-1])] if len(arrays['x']) else [],
+        'queue_sat_ids': list(data.queue_sat_ids),
+        'counter_sat_ids': list(data.counter_sat_ids),
+        'counter_names': list(data.counter_names),
+        'ue_states': list(UE_STATES),
+        'arrays': {name: {'shape': list(array.shape), 'dtype': str(array.dtype)} for name, array in arrays.items()},
+    }
+    if storage == "npz":
+        np.savez_compressed(os.path.join(path, "data.npz"), **arrays)
+    elif storage == "npy":
+        for name, array in arrays.items():
+            np.save(os.path.join(path, name + ".npy"), array)
+    else:
+        raise ValueError(f"Unknown export format: {storage}")
+    with open(os.path.join(path, "meta.json"), 'w') as f:
+        json.dump(meta, f, indent=1)
+
+
+class RunData:
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.npz = np.load(os.path.join(path, "data.npz")) if self.meta['storage'] == "npz" else None
+        self.cache = {}
+
+    def __contains__(self, name):
+        return name in self.meta['arrays']
+
+    # 배열 하나 (npz: 해당 배열만 압축 해제 / npy: memory-map)
+    def array(self, name):
+        if name not in self.cache:
+            if self.npz is not None:
+                self.cache[name] = self.npz[name]
+            else:
+                self.cache[name] = np.load(os.path.join(self.path, name + ".npy"), mmap_mode='r')
+        return self.cache[name]
+
+    # 시간 [start, stop] (ms) 구간의 sample index slice
+    def time_slice(self, start=None, stop=None):
+        x = self.array('x')
+        lo = 0 if start is None else int(np.searchsorted(x, start, side='left'))
+        hi = len(x) if stop is None else int(np.searchsorted(x, stop, side='right'))
+        return slice(lo, hi)
+
+    # 변경 시점 series 전체
+    def changes(self, name):
+        return ChangePointSeries(self.array(name + '_t').tolist(), list(self.array(name)))
+
+    # data.x 시점 시계열 (시간 [start, stop] 구간): 해당 구간 시점의 변경 값 행만 읽음
+    def samples(self, name, start=None, stop=None):
+        return ChangePointSeries.lookup(self.array(name + '_t'), self.array(name), self.array('x')[self.time_slice(start, stop)])
+
+    # 위성별 시계열 (시간 × 선택 위성): name = "queue" 또는 카운터 이름 (message_dropped 등)
+    def series(self, name, satellites=None, start=None, stop=None):
+        if name == "queue":
+            sat_ids, values = self.meta['queue_sat_ids'], self.samples('queue', start, stop)
+        else:
+            column = self.meta['counter_names'].index(name)
+            sat_ids, values = self.meta['counter_sat_ids'], self.samples('counters', start, stop)[:, :, column]
+        if satellites is not None:
+            values = values[:, [sat_ids.index(sat_id) for sat_id in satellites]]
+        return np.asarray(values)
+
+    def handovers(self):
+        if "handover_ue" not in self:
+            return None
+        return HandoverEvents(**{name: self.array(f"handover_{name}") for name, _ in HANDOVER_FIELDS})
+
+    def UE_time_stamp(self):
+        ue, source, success = self.array('ts_ue'), self.array('ts_from'), self.array('ts_success')
+        offsets, values = self.array('ts_offsets'), self.array('ts_values').tolist()
+        stamps = {int(ue_id): [] for ue_id in self.array('ue_id')}
+        for i in range(len(ue)):
+            stamps.setdefault(int(ue[i]), []).append({'timestamp': values[offsets[i]:offsets[i + 1]],
+                                                      'from': int(source[i]), 'isSuccess': bool(success[i])})
+        return stamps
+
+    # 전체를 DataCollection으로 복원 (기존 pickle 분석 코드 호환, graph_path = 로드 경로)
+    def load_collection(self, collection):
+        data = collection(self.path)
+        data.x = self.array('x').tolist()
+        if "waiting" in self:
+            data.waiting = self.changes('waiting')
+        if "ue_states" in self:
+            data.ue_states = self.changes('ue_states')
+        if "queue" in self:
+            data.set_queue(self.meta['queue_sat_ids'], self.changes('queue'))
+        if "counters" in self:
+            data.set_counters(self.meta['counter_sat_ids'], self.meta['counter_names'], self.changes('counters'))
+        data.UE_positions = {int(ue_id): tuple(position) for ue_id, position in zip(self.array('ue_id'), self.array('ue_position').tolist())}
+        data.UE_time_stamp = self.UE_time_stamp()
+        data.handovers = self.handovers()
+        data.expand()
+        return data
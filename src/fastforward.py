@@ -0,0 +1,83 @@
+from config import *
+
+"""
+[FastForward]: 핸드오버 wave 사이의 정지 구간(quiescent period)에서 1ms polling 프로세스들을 건너뛰게 하는 컨트롤러
+    - 정지 조건: 모든 위성/AMF/UE의 messageQ, CPU가 비어 있고 전송 중인 메시지가 없음
+                 모든 UE가 ACTIVE 또는 INACTIVE 상태이며, A3 경계까지 FAST_FORWARD_A3_MARGIN 이상 여유가 있음
+    - 정지 구간 동안 ACTION_MONITOR의 판단은 geometry_data_cache에만 의존하므로, 다음 GEOMETRY_MONITOR 갱신 시점까지 결과가 바뀌지 않음
+    - 다음 관심 시점(H) = min(각 UE의 다음 geometry 갱신, 등록된 주기 샘플러 시점), polling 프로세스는 H-1에 깨어남
+      (H-1에서 1ms timeout을 다시 등록하므로 H 시점의 이벤트 처리 순서가 기존 1ms polling과 동일하게 유지됨)
+"""
+
+class FastForward:
+    def __init__(self, env, UEs, satellites, amf, margin=FAST_FORWARD_A3_MARGIN, until=DURATION):
+        self.env = env
+        self.UEs = UEs
+        self.satellites = satellites
+        self.amf = amf
+        self.margin = margin # A3 경계 근접 판정 마진 (dB)
+        self.until = until # 시뮬레이션 종료 시점: 마지막 샘플(until-1)을 건너뛰지 않도록 함
+        self.periods = [] # 정지 구간에도 반드시 깨어나야 하는 주기 (예: screenshot 200ms)
+
+        self._computed_at = None # 같은 ms 안에서는 한 번만 계산
+        self._horizon = None
+        self._blocker = None # 직전 판정에서 정지를 막은 객체
+        self.skipped = 0 # 건너뛴 polling ms 누적 (통계용)
+
+    # 정지 구간에도 깨어나야 하는 주기 샘플러 등록 (해당 시점 직전 ms에 polling 재개)
+    def add_period(self, period):
+        self.periods.append(period)
+
+    # polling 프로세스가 다음에 깨어날 때까지의 대기 시간 (ms, 최소 1)
+    def steps(self, now):
+        if self._computed_at != now:
+            self._computed_at = now
+            self._horizon = self._next_wakeup(now)
+            if self._horizon - now > 1:
+                self.skipped += self._horizon - now - 1
+        return self._horizon - now
+
+    # PDES: 이 시점 이후 메시지를 보낼 수 있는 가장 이른 시각 (정지 구간이 아니면 now, 정지 구간이면 polling 재개 시점)
+    def idle_until(self, now):
+        wakeup = self._next_wakeup(now)
+        return now if wakeup == now + 1 else wakeup
+
+    # ==================== Quiescence Check ======================
+    # 해당 객체가 이번 ms 이후에도 동작할 가능성이 있으면 True
+    def _busy(self, entity, now):
+        if entity.inbound or len(entity.messageQ.items) or entity.cpus.count or len(entity.cpus.queue):
+            return True
+        if entity.type != "UE" or entity.state == INACTIVE: # INACTIVE: 재접속 절차 없음, 더 이상 동작하지 않음
+            return False
+        if entity.state != ACTIVE: # 핸드오버 진행 중
+            return True
+        if entity.next_geometry_update <= now: # 이번 ms에 cache 갱신 예정
+            return True
+        if entity.link_lost():
+            return True
+        gap = entity.a3_gap()
+        return gap is not None and gap > -self.margin # A3 경계 근접 (또는 이미 만족, cooldown 대기 포함)
+
+    def _next_wakeup(self, now):
+        busy = now + 1
+        # 직전에 정지를 막은 객체를 먼저 확인 (핸드오버 wave 중에는 대부분 여기서 바로 종료)
+        if self._blocker is not None and self._busy(self._blocker, now):
+            return busy
+        self._blocker = None
+        for entity in self._entities():
+            if self._busy(entity, now):
+                self._blocker = entity
+                return busy
+
+        horizon = self.until
+        for ue in self.UEs.values():
+            if ue.state == ACTIVE:
+                horizon = min(horizon, ue.next_geometry_update)
+        for period in self.periods:
+            horizon = min(horizon, (now // period + 1) * period)
+        return max(busy, int(horizon) - 1)
+
+    def _entities(self):
+        yield self.amf
+        yield from self.satellites.values()
+        yield from self.UEs.values()
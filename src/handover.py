@@ -0,0 +1,104 @@
+from array import array
+
+import numpy as np
+
+"""
+[HandoverRecorder]: UE 핸드오버 시도를 typed array(열 단위)로 기록 (UE.timestamps와 같은 시점, target 위성 포함)
+    - 한 행 = 한 번의 핸드오버 시도 (MR 전송 ~ HO 완료)
+        ue:              UE ID
+        source / target: 서빙 위성 ID / HO COMMAND로 받은 target 위성 ID (미수신 = -1)
+        start:           MR 전송 시각
+        retransmissions: 재전송 횟수
+        command:         HO COMMAND(RRC Reconfiguration) 수신 시각 (미수신 = NaN, isSuccess와 대응)
+        complete:        UL GRANT 수신(핸드오버 완료) 시각 (미완료 = NaN)
+    - HandoverEvents: numpy 배열 묶음 (kpi.py 분석 입력), partition/run 단위로 concat, npz 저장/로드
+"""
+
+FIELDS = (("ue", 'q'), ("source", 'q'), ("target", 'q'), ("start", 'd'), ("retransmissions", 'q'), ("command", 'd'), ("complete", 'd'))
+
+
+class HandoverRecorder:
+    def __init__(self):
+        self.columns = {name: array(code) for name, code in FIELDS}
+
+    # MR 전송: 새 핸드오버 시도 행 추가, 행 index 반환
+    def start(self, ue, source, time):
+        columns = self.columns
+        columns["ue"].append(ue)
+        columns["source"].append(source)
+        columns["target"].append(-1)
+        columns["start"].append(time)
+        columns["retransmissions"].append(0)
+        columns["command"].append(np.nan)
+        columns["complete"].append(np.nan)
+        return len(columns["ue"]) - 1
+
+    def retransmit(self, row):
+        self.columns["retransmissions"][row] += 1
+
+    def command(self, row, target, time):
+        self.columns["target"][row] = target
+        self.columns["command"][row] = time
+
+    def complete(self, row, time):
+        self.columns["complete"][row] = time
+
+    def events(self):
+        return HandoverEvents(**{name: np.frombuffer(column, dtype=np.int64 if code == 'q' else float).copy()
+                                 for (name, code), column in zip(FIELDS, self.columns.values())})
+
+
+class HandoverEvents:
+    def __init__(self, **columns):
+        for name, code in FIELDS:
+            self.__dict__[name] = np.asarray(columns.get(name, ()), dtype=np.int64 if code == 'q' else float)
+
+    def __len__(self):
+        return len(self.ue)
+
+    @property
+    def success(self):
+        return ~np.isnan(self.command)
+
+    def select(self, mask):
+        return HandoverEvents(**{name: getattr(self, name)[mask] for name, _ in FIELDS})
+
+    @staticmethod
+    def concat(events):
+        events = list(events)
+        return HandoverEvents(**{name: np.concatenate([getattr(e, name) for e in events]) if events else () for name, _ in FIELDS})
+
+    def save(self, path):
+        np.savez_compressed(path, **{name: getattr(self, name) for name, _ in FIELDS})
+
+    @staticmethod
+    def load(path):
+        with np.load(path) as f:
+            return HandoverEvents(**{name: f[name] for name, _ in FIELDS})
+
+    # DataCollection.UE_time_stamp (UE.timestamps 형식: {'timestamp': [MR, 재전송..., HO COMMAND, 완료], 'from', 'isSuccess'})에서 변환
+    # target 위성 정보가 없는 기존 결과용 (target = -1), 시각에 단계 구분이 없으므로 UE 상태 전이로 완료 여부 판단:
+    #   MR은 ACTIVE 상태에서만, ACTIVE 복귀는 완료(UL GRANT) 시각 기록과 함께 → 다음 시도가 있는 성공 기록은 마지막 시각이 완료
+    #   UE의 마지막 성공 기록은 completed_ues(종료 시 ACTIVE/INACTIVE인 UE ID)에 있을 때만 완료, 없으면 마지막 시각을 HO COMMAND로 간주
+    #   (기존 pickle에는 UE 상태가 없음: 마지막 시도가 완료됐어도 완료 시각이 재전송 1회 + HO COMMAND로 집계됨)
+    @staticmethod
+    def from_timestamps(UE_time_stamp, completed_ues=()):
+        records = [(ue_id, record) for ue_id, records in UE_time_stamp.items() for record in records]
+        n = len(records)
+        ue = np.fromiter((ue_id for ue_id, _ in records), dtype=np.int64, count=n)
+        source = np.fromiter((record.get('from', -1) for _, record in records), dtype=np.int64, count=n)
+        success = np.fromiter((record.get('isSuccess', False) for _, record in records), dtype=bool, count=n)
+        length = np.fromiter((len(record['timestamp']) for _, record in records), dtype=np.int64, count=n)
+        flat = np.fromiter((t for _, record in records for t in record['timestamp']), dtype=float, count=int(length.sum()))
+        first = np.cumsum(length) - length
+        last = first + length - 1
+        followed = np.zeros(n, dtype=bool)
+        followed[:-1] = ue[1:] == ue[:-1] # 같은 UE의 다음 시도가 있음
+        completed = success & (length >= 3) & (followed | np.isin(ue, list(completed_ues)))
+        command = np.full(n, np.nan)
+        complete = np.full(n, np.nan)
+        command[success] = flat[np.where(completed, last - 1, last)[success]]
+        complete[completed] = flat[last[completed]]
+        retransmissions = length - 1 - success - completed
+        return HandoverEvents(ue=ue, source=source, target=np.full(n, -1), start=flat[first],
+                              retransmissions=retransmissions, command=command, complete=complete)
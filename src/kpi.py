@@ -0,0 +1,148 @@
+import os
+import pickle
+import sys
+
+import numpy as np
+
+from config import *
+from handover import HandoverEvents
+from export import RunData
+
+"""
+[Handover KPI]: HandoverEvents(typed arrays)로부터 핸드오버 KPI를 배열 연산으로 계산 (per-UE/per-record Python loop 없음)
+    - latency:         MR 전송 → HO COMMAND 수신 (성공 시도)
+    - interruption:    HO COMMAND 수신 → UL GRANT 수신 (mobility interruption time, 완료된 시도)
+    - success / failure rate, 재전송 횟수 분포
+    - 분포: mean + KPI_PERCENTILES 백분위 + CDF, 위성(source)별 분해, KPI_BIN(ms) 단위 시간 구간별 시도/성공 수
+    - compare_runs: 여러 run(sweep 결과)을 run index로 합쳐 한 번에 계산 (그룹 백분위도 정렬 한 번)
+    - 실행: python3 src/kpi.py <결과 파일>... (handovers.npz, graph_data/run_data 디렉토리 또는 기존 DataCollection pickle)
+"""
+
+# 그룹별 백분위 (numpy 'linear' 보간과 동일): groups는 0..n_groups-1 정수, 결과 [n_groups, len(q)] (빈 그룹 = NaN)
+def group_percentiles(groups, values, n_groups, q=KPI_PERCENTILES):
+    order = np.lexsort((values, groups))
+    values = values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    position = (np.asarray(q, dtype=float)[None, :] / 100) * np.maximum(counts - 1, 0)[:, None]
+    lower = np.floor(position).astype(np.int64)
+    upper = np.ceil(position).astype(np.int64)
+    result = np.full((n_groups, len(q)), np.nan)
+    has = counts > 0
+    if values.size:
+        lo = values[(starts[:, None] + lower)[has]]
+        hi = values[(starts[:, None] + upper)[has]]
+        result[has] = lo + (hi - lo) * (position[has] - lower[has])
+    return result
+
+
+def distribution(values, q=KPI_PERCENTILES):
+    values = np.asarray(values, dtype=float)
+    summary = {'n': int(values.size), 'mean': float(values.mean()) if values.size else float('nan')}
+    percentiles = np.percentile(values, q) if values.size else [float('nan')] * len(q)
+    summary.update({f"p{p}": float(v) for p, v in zip(q, percentiles)})
+    summary['max'] = float(values.max()) if values.size else float('nan')
+    return summary
+
+
+# 경험적 CDF (x: 정렬된 값, y: 누적 비율)
+def cdf(values):
+    x = np.sort(np.asarray(values, dtype=float))
+    return x, np.arange(1, x.size + 1) / max(x.size, 1)
+
+
+def handover_kpis(events, bin_ms=KPI_BIN, q=KPI_PERCENTILES):
+    success = events.success
+    completed = success & ~np.isnan(events.complete)
+    latency = (events.command - events.start)[success]
+    interruption = (events.complete - events.command)[completed]
+    n = len(events)
+
+    # 위성(source)별: 시도/성공 수, latency 평균/백분위
+    sat_ids, sat = np.unique(events.source, return_inverse=True)
+    attempts = np.bincount(sat, minlength=sat_ids.size)
+    successes = np.bincount(sat, weights=success, minlength=sat_ids.size)
+    latency_sum = np.bincount(sat[success], weights=latency, minlength=sat_ids.size)
+    per_satellite = {
+        'id': sat_ids,
+        'attempts': attempts,
+        'success_rate': successes / np.maximum(attempts, 1),
+        'mean_latency': latency_sum / np.maximum(successes, 1),
+        'latency_percentiles': group_percentiles(sat[success], latency, sat_ids.size, q),
+    }
+
+    # 시간 구간별 (MR 전송 시각 기준)
+    bins = (events.start // bin_ms).astype(np.int64)
+    n_bins = int(bins.max()) + 1 if n else 0
+    time_binned = {
+        'start': np.arange(n_bins) * bin_ms,
+        'attempts': np.bincount(bins, minlength=n_bins),
+        'successes': np.bincount(bins[success], minlength=n_bins),
+        'retransmissions': np.bincount(bins, weights=events.retransmissions, minlength=n_bins).astype(np.int64),
+    }
+
+    return {
+        'attempts': n,
+        'successes': int(success.sum()),
+        'completed': int(completed.sum()),
+        'success_rate': float(success.mean()) if n else float('nan'),
+        'failure_rate': float(1 - success.mean()) if n else float('nan'),
+        'latency': distribution(latency, q),
+        'interruption': distribution(interruption, q),
+        'retransmissions': distribution(events.retransmissions, q),
+        'latency_cdf': cdf(latency),
+        'interruption_cdf': cdf(interruption),
+        'retransmission_histogram': np.bincount(events.retransmissions) if n else np.zeros(0, dtype=np.int64),
+        'per_satellite': per_satellite,
+        'time_binned': time_binned,
+    }
+
+
+# 여러 run의 KPI를 한 번에 계산: {label: HandoverEvents} → run별 시도/성공률/latency 평균·백분위
+def compare_runs(runs, q=KPI_PERCENTILES):
+    labels = list(runs)
+    events = HandoverEvents.concat(runs[label] for label in labels)
+    run = np.repeat(np.arange(len(labels)), [len(runs[label]) for label in labels])
+    success = events.success
+    latency = (events.command - events.start)[success]
+    attempts = np.bincount(run, minlength=len(labels))
+    successes = np.bincount(run[success], minlength=len(labels))
+    return {
+        'label': labels,
+        'attempts': attempts,
+        'success_rate': successes / np.maximum(attempts, 1),
+        'mean_latency': np.bincount(run[success], weights=latency, minlength=len(labels)) / np.maximum(successes, 1),
+        'latency_percentiles': group_percentiles(run[success], latency, len(labels), q),
+        'mean_retransmissions': np.bincount(run, weights=events.retransmissions, minlength=len(labels)) / np.maximum(attempts, 1),
+    }
+
+
+def format_kpis(kpis):
+    def line(name, d):
+        percentiles = ", ".join(f"{key} {value:.3f}" for key, value in d.items() if key.startswith('p'))
+        return f"  {name}: n={d['n']}, mean {d['mean']:.3f}, {percentiles}, max {d['max']:.3f}"
+    return "\n".join([
+        f"Handover KPI: {kpis['attempts']} attempts, {kpis['successes']} successes ({kpis['success_rate'] * 100:.1f}%), {kpis['completed']} completed",
+        line("latency (MR → HO COMMAND, ms)", kpis['latency']),
+        line("interruption (HO COMMAND → UL GRANT, ms)", kpis['interruption']),
+        line("retransmissions", kpis['retransmissions']),
+    ])
+
+
+def load_events(path):
+    if path.endswith(".npz"):
+        return HandoverEvents.load(path)
+    if os.path.isdir(path):
+        return RunData(path).handovers()
+    with open(path, 'rb') as f:
+        data = pickle.load(f)
+    return data.handovers if getattr(data, 'handovers', None) is not None else HandoverEvents.from_timestamps(data.UE_time_stamp)
+
+
+if __name__ == "__main__":
+    runs = {path: load_events(path) for path in sys.argv[1:]}
+    result = compare_runs(runs)
+    for i, label in enumerate(result['label']):
+        percentiles = ", ".join(f"p{p} {v:.3f}" for p, v in zip(KPI_PERCENTILES, result['latency_percentiles'][i]))
+        print(f"{label}: {result['attempts'][i]} attempts, success {result['success_rate'][i] * 100:.1f}%, "
+              f"latency mean {result['mean_latency'][i]:.3f} ({percentiles}), retransmissions {result['mean_retransmissions'][i]:.2f}")
@@ -0,0 +1,62 @@
+"""
+[Link]: 객체 간 메시지 전달 채널 (service link: UE-위성, ISL: 위성-위성, core link: 위성-AMF)
+    - 메시지마다 SimPy 프로세스를 만들지 않고, 도착 시각의 timeout 이벤트 callback으로 수신 객체의 messageQ에 직접 넣음
+    - link별 통계: 전송 중(in-flight) 메시지 수, 최대 in-flight, 누적 메시지 수, 누적 바이트(JSON 문자열 길이)
+"""
+
+SERVICE_LINK = "service"
+ISL_LINK = "ISL"
+CORE_LINK = "core"
+
+
+class Link:
+    def __init__(self, env, name):
+        self.env = env
+        self.name = name
+        self.in_flight = 0 # 전송 중인 메시지 수
+        self.peak_in_flight = 0
+        self.messages = 0 # 누적 전송 메시지 수
+        self.bytes = 0 # 누적 전송 바이트
+
+    # 송신 통계만 기록 (PDES: 다른 partition으로 가는 메시지는 수신 partition의 link가 전달)
+    def count(self, msg):
+        self.messages += 1
+        self.bytes += len(msg)
+
+    # delay(ms) 후 수신 객체의 messageQ에 msg 전달
+    def transmit(self, delay, msg, to):
+        self.count(msg)
+        self.schedule(delay, msg, to)
+
+    # 송신 통계 없이 전달만 예약 (PDES: barrier에서 받은 메시지, sent = 원래 송신 시각)
+    def schedule(self, delay, msg, to, sent=None):
+        self.in_flight += 1
+        if self.in_flight > self.peak_in_flight:
+            self.peak_in_flight = self.in_flight
+        to.inbound += 1 # 수신측 handle_messages에서 꺼낼 때 감소
+        delivery = self.env.timeout(delay, (to, msg, self.env.now if sent is None else sent))
+        delivery.callbacks.append(self.deliver)
+
+    def deliver(self, event):
+        to, msg, sent = event.value
+        self.in_flight -= 1
+        if to.arrivals is not None: # message lifecycle 추적: 송신/도착 시각
+            to.arrivals.append((sent, self.env.now))
+        to.messageQ.put(msg)
+
+    def summary(self):
+        return f"{self.name}: {self.messages} msgs, {self.bytes / 1000:.1f} kB, peak in-flight {self.peak_in_flight}"
+
+
+# 송/수신 객체 종류로 link 결정
+def link_name(sender_type, receiver_type):
+    if sender_type == "AMF" or receiver_type == "AMF":
+        return CORE_LINK
+    if sender_type == "satellite" and receiver_type == "satellite":
+        return ISL_LINK
+    return SERVICE_LINK
+
+
+# Environment 하나에서 모든 객체가 공유하는 link 집합 {link 이름: Link}
+def make_links(env):
+    return {name: Link(env, name) for name in (SERVICE_LINK, ISL_LINK, CORE_LINK)}
@@ -2,10 +2,20 @@ import sys
 import  os
 import shutil
 import utils
+import scenario
 from AMF import *
 from Satellite import *
 from UE import *
-import math
+from scheduler import make_environment
+from vectorized import VectorizedEngine
+from pdes import PartitionedSimulation
+from queuestats import format_summary
+from handover import HandoverEvents
+import kpi
+from census import UE_STATES, UECensus
+from progress import ProgressReporter, event_count
+from memory import MemoryMonitor, format_summary as format_memory
+import results
 import random
 
 # Config Random Seed
@@ -61,44 +71,39 @@ file.write(f"  #Example: approximate {number_handover} need to be handed over wi
 file.close()
 
 # ===================== UE POSITION CONFIG =============================
-# NOTE: Simulation UE initial Position Config
+# NOTE: Simulation UE initial Position Config (scenario.py)
+POSITIONS = scenario.generate_ue_positions(NUMBER_UE)
 
-# (1) 위성에 커버리지가 겹치는 지역에만 UE를 배치
-if len(POS_SATELLITES) < 4:
-    ylim_intersect = math.sqrt(SATELLITE_R ** 2 - (HORIZONTAL_DISTANCE / 2) ** 2) - 500
-    ylim = (ylim_intersect // GROUP_AREA_L - 1) * GROUP_AREA_L
-else:
-    ylim_half = VERTICAL_DISTANCE / 2 - 200
-    ylim = (ylim_half // GROUP_AREA_L - 1) * GROUP_AREA_L
-POSITIONS = utils.generate_points_with_ylim(NUMBER_UE, SATELLITE_R - 100, 0, 0, ylim)
 
-# (2) 위성 영역 내 랜덤 배치
-#POSITIONS = utils.generate_points(NUMBER_UE, SATELLITE_R - 1 * 1000, 0, 0)
+# ===================== Running Experiment =============================
+# Progress: PROGRESS_INTERVAL(wall time)마다 진행 상황 출력 + status 파일 갱신 (progress.py)
+progress = ProgressReporter(DURATION, file_path + "/" + PROGRESS_STATUS, name=dir)
 
+# 진행 상황 지표: CPU 대기 메시지 수(합/최대), 핸드오버 시도 수, RRC configuration 대기 UE 수
+def progress_details(UEs, satellites):
+    queues = [len(satellite.cpus.queue) for satellite in satellites.values()]
+    ue = next(iter(UEs.values())) if UEs else None
+    return {
+        'queue': f"{sum(queues)} (max {max(queues, default=0)})",
+        'handovers': len(ue.handovers.columns["ue"]) if ue else 0,
+        'waiting UEs': ue.census.count(WAITING_RRC_CONFIGURATION) if ue else 0,
+    }
 
-# ===================== Running Experiment =============================
-# This is simply for tracing TIME STAMP in Terminal
-def monitor_timestamp(env):
+def monitor_progress(env, UEs, satellites, fast_forward=None):
     while True:
-        print(f"Simulation Time {env.now}", file=sys.stderr)
-        yield env.timeout(1)
+        if progress.due():
+            progress.report(env.now, event_count(env), "events", progress_details(UEs, satellites))
+        yield env.timeout(fast_forward.steps(env.now) if fast_forward else 1)
 
 
 # SCREENSHOT: The function draws screenshot of global Status. As drawing takes time, the timestep has to be big.
 def global_stats_collector_draw_middle(env, UEs, satellites, timestep):
+    census = next(iter(UEs.values())).census if UEs else UECensus() # HYBRID_FOREGROUND = 0: UE 객체 없음
     while True:
-        active_UE_positions = []
-        requesting_UE_positions = []
-        inactive_positions = []
-        for ue_id in UEs:
-            ue = UEs[ue_id]
-            pos = (ue.position_x, ue.position_y)
-            if ue.state == ACTIVE:  # success
-                active_UE_positions.append(pos)
-            elif ue.state == INACTIVE:
-                inactive_positions.append(pos)
-            else:
-                requesting_UE_positions.append(pos)
+        # UE 상태별 위치: census 구성원에서 (UE 전체 순회 없음)
+        active_UE_positions = census.positions(ACTIVE) # success
+        inactive_positions = census.positions(INACTIVE)
+        requesting_UE_positions = census.positions(*[state for state in UE_STATES if state not in (ACTIVE, INACTIVE)])
         satellite_positions = {}
         for s_id, s in satellites.items():
             satellite_positions[s_id] = (s.position_x, s.position_y)
@@ -116,113 +121,143 @@ def global_stats_collector_draw_middle(env, UEs, satellites, timestep):
         # yield env.timeout(timestep)
 
 
-# Logging Text: This function collects information but draws(LOG) in the end of the simulation.
-def global_stats_collector_draw_final(env, data, UEs, satellites, timestep):
-    while True:
-        data.x.append(env.now)
-        for id in satellites:
-            satellite = satellites[id]
-            counter = satellite.counter
-            if id not in data.numberUnProcessedMessages:
-                data.numberUnProcessedMessages[id] = []
-                data.cumulative_total_messages[id] = []
-                data.cumulative_message_from_UE_measurement[id] = []
-                data.cumulative_message_from_UE_retransmit[id] = []
-                data.cumulative_message_from_UE_RA[id] = []
-                data.cumulative_message_from_satellite[id] = []
-                data.cumulative_message_from_dropped[id] = []
-                data.cumulative_message_from_AMF[id] = []
-            data.numberUnProcessedMessages[id].append(len(satellite.cpus.queue))
-            data.cumulative_total_messages[id].append(counter.total_messages)
-            data.cumulative_message_from_UE_measurement[id].append(counter.message_from_UE_measurement)
-            data.cumulative_message_from_UE_retransmit[id].append(counter.message_from_UE_retransmit)
-            data.cumulative_message_from_UE_RA[id].append(counter.message_from_UE_RA)
-            data.cumulative_message_from_satellite[id].append(counter.message_from_satellite)
-            data.cumulative_message_from_dropped[id].append(counter.message_dropped)
-            data.cumulative_message_from_AMF[id].append(counter.message_from_AMF)
-        numberUEWaitingRRC = 0
-        for id in UEs:
-            UE = UEs[id]
-            if UE.state == WAITING_RRC_CONFIGURATION:
-                numberUEWaitingRRC += 1
-        data.numberUEWaitingResponse.append(numberUEWaitingRRC)
-        yield env.timeout(timestep)
+# SCREENSHOT (vectorized engine): global_stats_collector_draw_middle과 같은 그림을 engine 배열에서 생성
+def global_stats_screenshot_vectorized(t, engine):
+    inactive_positions, active_UE_positions, requesting_UE_positions = engine.positions_by_state()
+    satellite_positions = dict(zip(engine.sat_ids.tolist(), zip(engine.sat_x(t).tolist(), engine.sat_y.tolist())))
+    utils.draw_from_positions(inactive_positions, active_UE_positions, requesting_UE_positions, t,
+                              file_path + "/graph", satellite_positions, SATELLITE_R)
+
+
+# SCREENSHOT (pdes engine): partition별 기록을 합친 snapshot으로 같은 그림 생성
+def global_stats_screenshot_pdes(t, snapshot):
+    inactive_positions, active_UE_positions, requesting_UE_positions, satellite_positions = snapshot
+    utils.draw_from_positions(inactive_positions, active_UE_positions, requesting_UE_positions, t,
+                              file_path + "/graph", satellite_positions, SATELLITE_R)
 
 
 # ===================== ENTITIES SETUP, CONNECTION, SIMULATION CONFIG and START =============================
-env = simpy.Environment() # Simpy Setting
-
-# Generate AMF Entity
-amf = AMF(core_delay=CORE_DELAY, env=env)
-
-# Generate Dictionary (UE, Satellites)
-UEs = {}
-satellites = {}
-
-# Deploying UEs following POS_SATELLITES(ID/POS) in config.py
-for sat_id in POS_SATELLITES:
-    pos = POS_SATELLITES[sat_id]
-    satellites[sat_id] = Satellite(
-        identity=sat_id,
-        position_x=pos[0],
-        position_y=pos[1],
-        velocity=SATELLITE_V,
-        satellite_ground_delay=SATELLITE_GROUND_DELAY,
-        ISL_delay=SATELLITE_SATELLITE_DELAY,
-        core_delay=CORE_DELAY,
-        AMF=amf,
-        env=env)
-
-# Deploying UEs following randomly generated positions
-# main 상단부, UE 좌표 설정 기반
-for index, position in enumerate(POSITIONS, start=1):
-    # Find the closest satellite for the initial connection
-    closest_sat_id = -1
-    min_dist = float('inf')
-    for sat_id, sat in satellites.items():
-        dist = math.dist(position, (sat.position_x, sat.position_y))
-        if dist < min_dist:
-            min_dist = dist
-            closest_sat_id = sat_id
-            
-    UEs[index] = UE(
-        identity=index,
-        position_x=position[0],
-        position_y=position[1],
-        #serving_satellite=satellites[1],
-        serving_satellite=satellites[closest_sat_id],
-        satellite_ground_delay=SATELLITE_GROUND_DELAY,
-        env=env)
-
-# Connecting objects (각 객체간 연동, 객체정보 공유)
-for identity in satellites:
-    satellites[identity].UEs = UEs
-    satellites[identity].satellites = satellites
-for identity in UEs:
-    UEs[identity].satellites = satellites
-amf.satellites = satellites
-
-# Process Regist to Simpy Enviornment
-env.process(monitor_timestamp(env)) # Monitoring Process
-env.process(global_stats_collector_draw_middle(env, UEs, satellites, 200)) # Screenshot Process (200 ms)
 data = utils.DataCollection(file_path + "/graph_data") # data collection, data 객체 생성
-env.process(global_stats_collector_draw_final(env, data, UEs, satellites, 1)) # stats collector Process (1 ms)
+
+if ENGINE == "vectorized":
+    # Vectorized time-stepped engine: entity/SimPy 프로세스 없이 배열 연산으로 진행 (vectorized.py)
+    engine = VectorizedEngine(POSITIONS, SATELLITE_GROUND_DELAY, phases=scenario.geometry_phases(len(POSITIONS)), satellite_cpu=SATELLITE_CPU)
+elif ENGINE == "pdes":
+    # Parallel DES: 위성 cluster 단위 partition을 PDES_WORKERS개 process에서 실행 (pdes.py)
+    simulation = PartitionedSimulation(POSITIONS, SATELLITE_GROUND_DELAY, SATELLITE_CPU)
+else:
+    env = make_environment() # Simpy Setting (SCHEDULER: "simpy" / "tick")
+
+    # Generate Entities (AMF, Satellites following POS_SATELLITES, UEs following POSITIONS) and connect them
+    # Hybrid 모드: foreground UE만 UE 객체로 생성, 나머지는 background 부하 (위성 대기열 aggregate arrival)
+    foreground = scenario.foreground_ids(len(POSITIONS), HYBRID_FOREGROUND) if HYBRID_FOREGROUND is not None else None
+    amf, satellites, UEs = scenario.build_entities(env, POSITIONS, SATELLITE_GROUND_DELAY, SATELLITE_CPU, ue_ids=foreground)
+    background = None
+    if foreground is not None:
+        background = scenario.attach_background(env, POSITIONS, foreground, satellites, amf.links, SATELLITE_GROUND_DELAY)
+
+    # Channel trace: sweep 첫 run에서 채널 값을 기록하고 이후 run은 재생 (res/CHANNEL_TRACE_DIR)
+    channel = None
+    if CHANNEL_TRACE:
+        channel = scenario.attach_channel_trace(os.path.join(os.path.dirname(file_path), CHANNEL_TRACE_DIR), CHANNEL_TRACE, UEs, satellites)
+
+    # Adaptive measurement: A3 경계에서 먼 UE는 geometry 갱신을 건너뜀 (fast-forward 정지 구간도 길어짐)
+    adaptive = scenario.attach_adaptive_measurement(UEs) if ADAPTIVE_MEASUREMENT else None
+
+    # Fast-forward: 정지 구간(quiescent period)에서 1ms polling 프로세스를 다음 관심 시점 직전까지 건너뜀
+    fast_forward = None
+    if FAST_FORWARD:
+        fast_forward = scenario.attach_fast_forward(env, amf, satellites, UEs, periods=[200]) # Screenshot 시점에는 위성 위치가 최신이어야 함
+
+    # Process Regist to Simpy Enviornment
+    env.process(monitor_progress(env, UEs, satellites, fast_forward)) # Monitoring Process
+    env.process(global_stats_collector_draw_middle(env, UEs, satellites, 200)) # Screenshot Process (200 ms)
+    env.process(scenario.global_stats_collector_draw_final(env, data, UEs, satellites, 1, fast_forward)) # stats collector Process (1 ms)
+
+    # Memory profile: 구성 요소별 메모리 샘플링 (MEMORY_INTERVAL ms)
+    memory = MemoryMonitor(env, UEs, satellites, data) if MEMORY_PROFILE else None
+    if memory is not None:
+        env.process(memory.run())
 
 # --- Simulation Start ---
 print('==========================================')
 print('============= Experiment Log =============')
 print('==========================================')
-env.run(until=DURATION)
+if ENGINE == "vectorized":
+    engine.run(DURATION, data, screenshot=(200, global_stats_screenshot_vectorized), progress=progress) # Screenshot (200 ms)
+    progress.finish(DURATION, engine.steps, "steps", engine.progress_details())
+elif ENGINE == "pdes":
+    simulation.run(DURATION, data, screenshot=(200, global_stats_screenshot_pdes), progress=progress) # Screenshot (200 ms), UE timestamps 포함
+    progress.finish(DURATION, simulation.windows, "windows", {'cross-partition messages': simulation.sent})
+else:
+    env.run(until=DURATION)
+    progress.finish(DURATION, event_count(env), "events", progress_details(UEs, satellites))
 print('==========================================')
 print('============= Experiment Ends =============')
 print('==========================================')
 
-# HO Timestamps를 data 객체에 전달
-data.read_UEs(UEs)
+if ENGINE == "pdes":
+    print(f"PDES: {PDES_WORKERS} partitions, {simulation.windows} windows, {simulation.sent} cross-partition messages, "
+          f"fast-forward skipped {simulation.skipped} ms", file=sys.stderr)
+    for link in simulation.links.values():
+        print(f"Link {link.summary()}", file=sys.stderr)
+    print(simulation.topology.summary(), file=sys.stderr)
+    if simulation.tracer is not None:
+        print(simulation.tracer.summary(), file=sys.stderr)
+    for sat_id, summary in sorted(simulation.queue_stats.items()):
+        print(format_summary(sat_id, summary), file=sys.stderr)
+elif ENGINE != "vectorized":
+    if background is not None:
+        print(background.summary(), file=sys.stderr)
+    if channel is not None:
+        channel.close()
+        print(channel.summary(), file=sys.stderr)
+    if adaptive is not None:
+        print(adaptive.summary(), file=sys.stderr)
+    if UEs and next(iter(UEs.values())).population is not None:
+        print(next(iter(UEs.values())).population.summary(), file=sys.stderr)
+    if fast_forward is not None:
+        print(f"Fast-forward skipped {fast_forward.skipped} ms of {DURATION} ms polling", file=sys.stderr)
+    for link in amf.links.values():
+        print(f"Link {link.summary()}", file=sys.stderr)
+    if satellites:
+        satellite = next(iter(satellites.values()))
+        print(satellite.topology.summary(), file=sys.stderr)
+        if satellite.tracer is not None:
+            print(satellite.tracer.summary(), file=sys.stderr)
+    for sat_id, satellite in satellites.items():
+        print(format_summary(sat_id, satellite.cpus.stats.summary(satellite.cpus.capacity)), file=sys.stderr)
+    if memory is not None:
+        memory_summary = memory.summary()
+        print(format_memory(memory_summary), file=sys.stderr)
+        memory.save(file_path + "/memory.json", memory_summary)
+
+    # 위성 통계 시계열 생성 (카운터 배열, CPU 대기 길이 change log → data.x 시점)
+    scenario.finalize_stats(data, satellites)
+
+    # HO Timestamps를 data 객체에 전달
+    data.read_UEs(UEs)
+    data.handovers = next(iter(UEs.values())).handovers.events() if UEs else HandoverEvents()
+
+    # Message event trace 저장 (python3 src/replay.py <run 디렉토리>로 재시뮬레이션 없이 결과 재계산)
+    if amf.events is not None:
+        amf.events.save(file_path + "/" + EVENT_TRACE_FILE, satellites, UEs)
+        print(f"Event trace: {len(amf.events)} events → {EVENT_TRACE_FILE}", file=sys.stderr)
+
+# Handover KPI (handover.py 기록 → kpi.py 분석), sweep 비교용 npz 저장 (python3 src/kpi.py <npz>...)
+print(kpi.format_kpis(kpi.handover_kpis(data.handovers)), file=sys.stderr)
+data.handovers.save(file_path + "/handovers.npz")
 
 # draw from data
 data.draw()
 data.save_to_csv(file_path + "/simulation_log.csv")
 
+# sweep 결과 저장소에 기록 (시나리오 파라미터 + seed 단위, python3 src/results.py <db> <metric> <by> [param=value ...])
+if RESULT_STORE:
+    results.store_run(os.path.join(os.path.dirname(file_path), RESULT_STORE), dir, data, {
+        "number_ue": NUMBER_UE, "satellite_cpu": SATELLITE_CPU, "ground_delay": SATELLITE_GROUND_DELAY,
+        "isl_delay": SATELLITE_SATELLITE_DELAY, "core_delay": CORE_DELAY, "duration": DURATION, "seed": SEED, "engine": ENGINE,
+    })
+
 # Generate Animation
 # os.system(f"python src/animation.py {file_path}/graph")
\ No newline at end of file
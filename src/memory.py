@@ -0,0 +1,124 @@
+import json
+import os
+import resource
+import sys
+import tracemalloc
+from collections import deque
+
+from config import *
+
+"""
+[MemoryMonitor]: 메모리 계측 모드 (MEMORY_PROFILE), MEMORY_INTERVAL(시뮬레이션 ms)마다 메모리 사용을 샘플링하고 구성 요소별로 분해
+    - process 전체: RSS (/proc/self/statm, 최대값은 getrusage), tracemalloc 현재/최대 (Python 할당 추적, 계측 모드에서만 켬)
+    - 구성 요소별 (deep_size: dict/list/tuple/set/deque/array/ndarray를 따라가며 sys.getsizeof 합, 그 외 객체는 얕은 크기만):
+        UE geometry cache / UE timestamps / message queues (위성/UE messageQ, CPU 대기열) / event heap (대기 중인 SimPy 이벤트)
+        stats series (data.x, 변경 시점 series, QueueStats change log) / handover recorder / message tracer
+    - summary: 구성 요소별 최대/최종 크기, 증가율 (시뮬레이션 1초당), tracemalloc 파일별 상위 할당 → stderr + memory.json
+"""
+
+MB = 1024 * 1024
+CONTAINERS = (dict, list, tuple, set, frozenset, deque)
+
+
+# obj에서 container를 따라가며 도달하는 객체 크기 합 (같은 객체는 한 번, container가 아닌 객체의 속성은 따라가지 않음)
+def deep_size(obj, seen=None):
+    seen = set() if seen is None else seen
+    stack = [obj]
+    size = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item) # ndarray/array: 소유한 data buffer 포함
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, CONTAINERS):
+            stack.extend(item)
+    return size
+
+
+def rss():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+# 대기 중인 이벤트 저장소: simpy.Environment(heap) / scheduler.TickEnvironment(tick bucket + heap)
+def event_heap(env):
+    return [getattr(env, name) for name in ("_queue", "_buckets", "_ticks") if hasattr(env, name)]
+
+
+class MemoryMonitor:
+    def __init__(self, env, UEs, satellites, data):
+        self.env = env
+        self.samples = [] # {'time', 'rss', 'traced', 'components': {이름: bytes}}
+        ue = next(iter(UEs.values()), None)
+        satellite = next(iter(satellites.values()), None)
+        self.components = {
+            'UE geometry cache': lambda: [ue.geometry_data_cache for ue in UEs.values()],
+            'UE timestamps': lambda: [ue.timestamps for ue in UEs.values()],
+            'message queues': lambda: [(entity.messageQ.items, entity.cpus.queue, entity.cpus.users)
+                                       for entity in list(satellites.values()) + list(UEs.values())],
+            'event heap': lambda: event_heap(env),
+            'stats series': lambda: [data.x, data.counter_series.values, data.waiting.values, data.ue_states.values,
+                                     [satellite.cpus.stats.log for satellite in satellites.values()]],
+            'handover recorder': lambda: list(ue.handovers.columns.values()) if ue is not None else [],
+            'message tracer': lambda: [[vars(histogram) for histogram in histograms.values()]
+                                       for histograms in satellite.tracer.histograms.values()]
+                                      if satellite is not None and satellite.tracer is not None else [],
+        }
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def sample(self):
+        traced, _ = tracemalloc.get_traced_memory()
+        self.samples.append({
+            'time': self.env.now,
+            'rss': rss(),
+            'traced': traced,
+            'components': {name: deep_size(collect()) for name, collect in self.components.items()},
+        })
+
+    # SimPy process: interval(ms)마다 샘플
+    def run(self, interval=MEMORY_INTERVAL):
+        while True:
+            self.sample()
+            yield self.env.timeout(interval)
+
+    def summary(self, top=MEMORY_TOP):
+        self.sample()
+        first, last = self.samples[0], self.samples[-1]
+        span = (last['time'] - first['time']) / 1000 # 시뮬레이션 초
+        components = {}
+        for name in self.components:
+            values = [sample['components'][name] for sample in self.samples]
+            components[name] = {'peak': max(values), 'final': values[-1],
+                                'growth': (values[-1] - values[0]) / span if span > 0 else 0.0}
+        snapshot = tracemalloc.take_snapshot()
+        sites = [{'file': stat.traceback[0].filename, 'size': stat.size, 'count': stat.count}
+                 for stat in snapshot.statistics('filename')[:top]]
+        return {
+            'rss_peak': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024, # Linux: KB
+            'rss_final': last['rss'],
+            'rss_growth': (last['rss'] - first['rss']) / span if span > 0 else 0.0,
+            'traced_peak': tracemalloc.get_traced_memory()[1],
+            'components': components,
+            'allocation_sites': sites,
+            'samples': self.samples,
+        }
+
+    def save(self, path, summary):
+        with open(path, 'w') as f:
+            json.dump(summary, f)
+
+
+def format_summary(summary):
+    lines = [f"Memory: RSS peak {summary['rss_peak'] / MB:.1f} MB, final {summary['rss_final'] / MB:.1f} MB "
+             f"(growth {summary['rss_growth'] / MB:.2f} MB/sim-s), tracemalloc peak {summary['traced_peak'] / MB:.1f} MB"]
+    for name, component in sorted(summary['components'].items(), key=lambda item: -item[1]['peak']):
+        lines.append(f"  {name}: peak {component['peak'] / MB:.2f} MB, final {component['final'] / MB:.2f} MB, "
+                     f"growth {component['growth'] / MB:.3f} MB/sim-s")
+    lines.append("  top allocation sites: " + ", ".join(f"{os.path.basename(site['file'])} {site['size'] / MB:.1f} MB"
+                                                        for site in summary['allocation_sites']))
+    return "\n".join(lines)
@@ -0,0 +1,387 @@
+import contextlib
+import io
+import math
+import multiprocessing
+import random
+import sys
+
+import numpy as np
+
+import scenario
+import utils
+from config import *
+from link import make_links
+from scheduler import make_environment
+from topology import ISLTopology
+from tracing import MessageTracer
+from handover import HandoverEvents
+from timeseries import ChangePointSeries
+from census import UECensus, UE_STATES
+
+"""
+[PDES]: 위성 cluster 단위로 partition을 나누어 여러 worker process에서 실행하는 보수적(conservative) 병렬 DES (ENGINE = "pdes")
+    - partition: 위성을 초기 접속 UE 수 기준으로 PDES_WORKERS개 cluster에 균형 배분 (LPT), UE는 초기 서빙 위성의 partition이 소유
+    - 모든 worker가 같은 시나리오를 생성: 위성 위치는 결정적이므로 다른 partition의 위성/AMF는 복제본(remote)으로 위치만 갱신,
+      다른 partition의 UE는 GhostUE(ID, 위치, 서빙 위성)로 대체
+    - partition 간 상호작용은 메시지뿐 (UE-위성: SATELLITE_GROUND_DELAY, ISL: SATELLITE_SATELLITE_DELAY, AMF: CORE_DELAY)
+      → lookahead L = 최소 지연, window 동기화: E = min(각 worker의 다음 송신 가능 시각, 전달 대기 메시지의 도착 시각) + L
+        모든 worker가 E 직전까지 실행한 뒤 barrier에서 partition 간 메시지와 서빙 위성 변경을 교환
+    - fast-forward 사용 시 정지 구간의 worker는 polling 재개 시점을 보고하므로 window가 정지 구간 전체로 늘어남
+    - 난수는 객체별 random.Random(SEED/종류/ID)을 사용하여 결과가 worker 수, 실행 순서와 무관하게 재현됨
+    - 근사: 다른 partition 소유 UE에 대한 위성의 connected() 판정은 barrier에서 갱신된 GhostUE의 서빙 위성을 사용 (최대 1 window 지연)
+    - 사용법(검증): python3 src/pdes.py [NUMBER_UE DURATION WORKERS]  (1 worker 실행과 핸드오버 trace 비교)
+"""
+
+# 다른 partition이 소유한 UE의 복제본: 위성의 UE 조회(connected, 메시지 수신 대상)에 필요한 정보만 유지
+class GhostUE:
+    def __init__(self, identity, position, serving_satellite):
+        self.type = "UE"
+        self.identity = identity
+        self.position_x = position[0]
+        self.position_y = position[1]
+        self.serving_satellite = serving_satellite # barrier에서 소유 partition의 값으로 갱신
+        self.remote = True
+
+
+# 위성을 초기 접속 UE 수 기준으로 workers개 cluster에 배분 (UE가 많은 위성부터 부하가 가장 작은 worker에 할당)
+# 반환: ({위성 ID: rank}, {UE ID: rank})
+def partition_entities(positions, workers):
+    closest = [scenario.closest_satellite(position, POS_SATELLITES) for position in positions]
+    attached = {sat_id: 0 for sat_id in POS_SATELLITES}
+    for sat_id in closest:
+        attached[sat_id] += 1
+
+    load = [0] * workers # worker별 UE 수
+    size = [0] * workers # worker별 위성 수 (UE가 없는 위성도 고르게 분산)
+    sat_owner = {}
+    for sat_id in sorted(attached, key=lambda sat_id: (-attached[sat_id], sat_id)):
+        rank = min(range(workers), key=lambda rank: (load[rank], size[rank]))
+        sat_owner[sat_id] = rank
+        load[rank] += attached[sat_id]
+        size[rank] += 1
+    ue_owner = {index: sat_owner[sat_id] for index, sat_id in enumerate(closest, start=1)}
+    return sat_owner, ue_owner
+
+
+# 하나의 worker가 실행하는 partition: 자신의 SimPy Environment, 소유 객체, 복제본을 관리하고 remote 메시지를 모음
+class Partition:
+    def __init__(self, rank, positions, sat_owner, ue_owner, satellite_ground_delay, satellite_cpu, until, screenshot_period=None):
+        self.rank = rank
+        self.until = until
+        self.window_end = 0
+        self.outbox = [] # (도착 시각, link 이름, 수신 객체 종류, 수신 객체 ID, msg, 송신 시각)
+        self.sent = 0 # partition 간 메시지 수 (통계용)
+        self.screenshots = []
+
+        # Generate Entities: 위성/AMF 전체 + 소유 UE
+        self.env = make_environment()
+        owned = {ue_id for ue_id, owner in ue_owner.items() if owner == rank}
+        self.amf, self.satellites, directory = scenario.build_entities(self.env, positions, satellite_ground_delay, satellite_cpu, ue_ids=owned)
+        self.UEs = dict(directory) # 소유 UE
+        self.links = self.amf.links # build_entities에서 생성된 link 집합 (모든 객체 공유)
+        self.topology = next(iter(self.satellites.values())).topology if self.satellites else None
+        self.tracer = next(iter(self.satellites.values())).tracer if self.satellites else None
+        self.owned_satellites = {sat_id: sat for sat_id, sat in self.satellites.items() if sat_owner[sat_id] == rank}
+
+        # 객체별 난수 생성기, remote 표시, router 연결
+        for entity in [self.amf] + list(self.satellites.values()) + list(self.UEs.values()):
+            entity.rng = random.Random(f"{SEED}/{entity.type}/{entity.identity}")
+            entity.router = self
+        self.amf.remote = rank != 0 # AMF는 rank 0 소유
+        for sat_id, satellite in self.satellites.items():
+            satellite.remote = sat_owner[sat_id] != rank
+
+        # 다른 partition의 UE는 GhostUE로 등록 (위성의 UEs와 같은 dict)
+        satellite_positions = {sat_id: (sat.position_x, sat.position_y) for sat_id, sat in self.satellites.items()}
+        for index, position in enumerate(positions, start=1):
+            if index not in owned:
+                serving = self.satellites[scenario.closest_satellite(position, satellite_positions)]
+                directory[index] = GhostUE(index, position, serving)
+        self.directory = directory
+        self._owned_list = list(self.UEs.values())
+        self._serving = [ue.serving_satellite for ue in self._owned_list]
+
+        # Adaptive measurement (소유 UE), Fast-forward, 통계 수집 (소유 위성/UE만)
+        if ADAPTIVE_MEASUREMENT:
+            scenario.attach_adaptive_measurement(self.UEs)
+        self.fast_forward = None
+        if FAST_FORWARD:
+            periods = [screenshot_period] if screenshot_period else []
+            self.fast_forward = scenario.attach_fast_forward(self.env, self.amf, self.satellites, self.UEs, periods=periods, until=until)
+        self.data = utils.DataCollection(None)
+        if screenshot_period:
+            self.env.process(self.screenshot(screenshot_period))
+        self.env.process(scenario.global_stats_collector_draw_final(self.env, self.data, self.UEs, self.owned_satellites, 1, self.fast_forward))
+
+    # Base.send_message에서 호출: remote 객체로 가는 메시지를 barrier까지 보관
+    def post(self, arrival, link, to, msg):
+        if arrival < self.window_end:
+            raise RuntimeError(f"PDES lookahead violation: {to.type} {to.identity} message arrives at {arrival} before window end {self.window_end}")
+        self.outbox.append((arrival, link, to.type, to.identity, msg, self.env.now))
+        self.sent += 1
+
+    def lookup(self, kind, identity):
+        if kind == "AMF":
+            return self.amf
+        if kind == "satellite":
+            return self.satellites[identity]
+        return self.directory[identity]
+
+    # 한 window 실행: 수신 메시지/서빙 위성 변경 반영 → until 직전까지 실행 → (송신 메시지, 서빙 위성 변경, 다음 송신 가능 시각) 반환
+    def advance(self, until, inbox, serving):
+        # 다른 partition에서 온 메시지: 도착 시각에 수신 객체의 messageQ에 넣도록 link에 예약
+        for arrival, link, kind, identity, msg, sent in inbox:
+            self.links[link].schedule(arrival - self.env.now, msg, self.lookup(kind, identity), sent)
+        for ue_id, sat_id in serving:
+            self.directory[ue_id].serving_satellite = None if sat_id is None else self.satellites[sat_id]
+
+        self.window_end = until
+        if self.fast_forward is not None:
+            self.fast_forward.until = until # window 경계를 넘어 건너뛰지 않음 (다음 window에 메시지가 도착할 수 있음)
+        self.env.run(until=until)
+
+        outbox, self.outbox = self.outbox, []
+        return outbox, self.serving_changes(), self.idle_until()
+
+    # 이번 window에서 서빙 위성이 바뀐 소유 UE: [(UE ID, 위성 ID 또는 None)]
+    def serving_changes(self):
+        current = [ue.serving_satellite for ue in self._owned_list]
+        if current == self._serving:
+            return []
+        changes = [(ue.identity, None if sat is None else sat.identity)
+                   for ue, sat, previous in zip(self._owned_list, current, self._serving) if sat is not previous]
+        self._serving = current
+        return changes
+
+    # 이 partition이 다음에 메시지를 보낼 수 있는 가장 이른 시각 (정지 구간이면 polling 재개 시점)
+    def idle_until(self):
+        if self.fast_forward is None:
+            return self.env.now
+        self.fast_forward.until = self.until
+        return self.fast_forward.idle_until(self.env.now)
+
+    # SCREENSHOT: 소유 UE의 상태별 위치와 위성 위치를 기록 (그림은 coordinator에서 partition을 합쳐 생성)
+    def screenshot(self, timestep):
+        while True:
+            census = self._owned_list[0].census if self._owned_list else UECensus()
+            active, inactive = census.positions(ACTIVE), census.positions(INACTIVE)
+            requesting = census.positions(*[state for state in UE_STATES if state not in (ACTIVE, INACTIVE)])
+            satellite_positions = {s_id: (s.position_x, s.position_y) for s_id, s in self.satellites.items()}
+            self.screenshots.append((self.env.now, inactive, active, requesting, satellite_positions))
+            yield self.env.timeout(timestep)
+
+    def results(self):
+        scenario.finalize_stats(self.data, self.owned_satellites)
+        return {
+            'data': self.data,
+            'timestamps': {ue_id: ue.timestamps for ue_id, ue in self.UEs.items()},
+            'states': {ue_id: ue.state for ue_id, ue in self.UEs.items()},
+            'handovers': next(iter(self.UEs.values())).handovers.events() if self.UEs else HandoverEvents(),
+            'counters': {sat_id: sat.counter.as_dict() for sat_id, sat in self.owned_satellites.items()},
+            'screenshots': self.screenshots,
+            'skipped': self.fast_forward.skipped if self.fast_forward else 0,
+            'sent': self.sent,
+            'links': {name: (link.messages, link.bytes, link.peak_in_flight) for name, link in self.links.items()},
+            'isl_load': self.topology.load if self.topology else {},
+            'tracer': self.tracer,
+            'queue_stats': {sat_id: sat.cpus.stats.summary(sat.cpus.capacity) for sat_id, sat in self.owned_satellites.items()},
+        }
+
+
+# ===================== Workers =============================
+# 같은 process에서 실행하는 partition (fork 미지원 환경, 검증용)
+class LocalWorker:
+    def __init__(self, *args):
+        self.partition = Partition(*args)
+
+    def request(self, method, *params):
+        self.reply = getattr(self.partition, method)(*params)
+
+    def result(self):
+        return self.reply
+
+
+# 별도 process에서 실행하는 partition: Pipe로 (method, params)를 받아 실행 결과를 돌려줌
+def serve(conn, args):
+    partition = Partition(*args)
+    while True:
+        method, params = conn.recv()
+        conn.send(getattr(partition, method)(*params))
+        if method == "results":
+            break
+
+
+class ProcessWorker:
+    def __init__(self, context, *args):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=serve, args=(child, args), daemon=True)
+        self.process.start()
+        child.close()
+
+    def request(self, method, *params):
+        self.conn.send((method, params))
+
+    def result(self):
+        return self.conn.recv()
+
+
+# ===================== Coordinator =============================
+class PartitionedSimulation:
+    def __init__(self, positions, satellite_ground_delay=SATELLITE_GROUND_DELAY, satellite_cpu=SATELLITE_CPU, workers=PDES_WORKERS, processes=True):
+        self.positions = positions
+        self.satellite_ground_delay = satellite_ground_delay
+        self.satellite_cpu = satellite_cpu
+        self.workers = workers
+        self.processes = processes
+        self.sat_owner, self.ue_owner = partition_entities(positions, workers)
+        self.lookahead = min(SATELLITE_SATELLITE_DELAY, CORE_DELAY, satellite_ground_delay) # partition 간 메시지의 최소 지연
+        self.windows = 0 # barrier 수 (통계용)
+        self.sent = 0 # partition 간 메시지 수
+        self.skipped = 0 # fast-forward로 건너뛴 polling ms (worker 합)
+        self.links = make_links(None) # link별 통계 (worker 합, 최대 in-flight는 partition별 최댓값)
+        self.topology = ISLTopology(POS_SATELLITES, ISL_TOPOLOGY, SATELLITE_SATELLITE_DELAY) # ISL별 부하 (worker 합)
+        self.tracer = MessageTracer() if MESSAGE_TRACE else None # message lifecycle 히스토그램 (worker 합)
+        self.queue_stats = {} # 위성별 CPU 대기열 시간 가중 통계 (소유 partition에서 수집)
+
+    def owner(self, kind, identity):
+        if kind == "AMF":
+            return 0
+        if kind == "satellite":
+            return self.sat_owner[identity]
+        return self.ue_owner[identity]
+
+    def start(self, until, screenshot_period):
+        args = (self.positions, self.sat_owner, self.ue_owner, self.satellite_ground_delay, self.satellite_cpu, until, screenshot_period)
+        if self.processes and "fork" in multiprocessing.get_all_start_methods():
+            sys.stdout.flush() # fork 전에 비워야 자식 process가 출력 buffer를 중복 출력하지 않음
+            context = multiprocessing.get_context("fork")
+            return [ProcessWorker(context, rank, *args) for rank in range(self.workers)]
+        if self.processes:
+            print("PDES: fork start method unavailable, running partitions in one process", file=sys.stderr)
+        return [LocalWorker(rank, *args) for rank in range(self.workers)]
+
+    def run(self, until, data, screenshot=None, progress=None):
+        """
+        Args:
+            until: 시뮬레이션 종료 시각 (ms)
+            data: 결과를 채울 utils.DataCollection
+            screenshot: (주기 ms, callback(t, snapshot)) 또는 None, snapshot = (inactive, active, requesting, satellite_positions)
+            progress: progress.ProgressReporter 또는 None (coordinator에서 window 단위로 보고)
+        """
+        workers = self.start(until, screenshot[0] if screenshot else None)
+        inboxes = [[] for _ in workers]
+        serving = [] # (rank, UE ID, 위성 ID): 소유 partition 외 모든 partition에 전달
+        idle = [0] * len(workers)
+        now = 0
+        messages = 0 # 지금까지 교환한 partition 간 메시지 수
+        while now < until:
+            # window 끝: 어떤 worker도 이 시각 전에 도착하는 메시지를 보낼 수 없음
+            bound = min(idle)
+            for inbox in inboxes:
+                for message in inbox:
+                    bound = min(bound, message[0])
+            end = math.floor(bound + self.lookahead) # 정수 ms 경계 유지 (polling 프로세스가 정수 시간을 가정)
+            if end <= now:
+                end = bound + self.lookahead
+            end = min(end, until)
+
+            for rank, worker in enumerate(workers):
+                worker.request("advance", end, inboxes[rank], [(ue_id, sat_id) for owner, ue_id, sat_id in serving if owner != rank])
+            inboxes = [[] for _ in workers]
+            serving = []
+            for rank, worker in enumerate(workers):
+                outbox, changes, idle[rank] = worker.result()
+                messages += len(outbox)
+                for message in outbox:
+                    inboxes[self.owner(message[2], message[3])].append(message)
+                serving.extend((rank, ue_id, sat_id) for ue_id, sat_id in changes)
+            now = end
+            self.windows += 1
+            if progress is not None and progress.due():
+                progress.report(now, self.windows, "windows", {'cross-partition messages': messages})
+
+        for worker in workers:
+            worker.request("results")
+        results = [worker.result() for worker in workers]
+        self.fill(data, results)
+        if screenshot is not None:
+            for snapshot in self.merge_screenshots(results):
+                screenshot[1](snapshot[0], snapshot[1:])
+        return results
+
+    # partition별 결과를 하나의 DataCollection으로 합침 (위성별 series는 소유 partition, UE 대기 수는 합)
+    def fill(self, data, results):
+        data.x = results[0]['data'].x
+        data.waiting = ChangePointSeries.combine([r['data'].waiting for r in results], lambda values: np.sum(values, axis=0))
+        data.ue_states = ChangePointSeries.combine([r['data'].ue_states for r in results], lambda values: np.sum(values, axis=0))
+        # 위성별 series (대기 길이, 카운터 배열): partition별 소유 위성을 위성 ID 순서로 합침 (모든 partition의 카운터 등록 순서는 같음)
+        parts = [r['data'] for r in results if r['data'].queue is not None]
+        if parts:
+            sat_ids = [sat_id for part in parts for sat_id in part.queue_sat_ids]
+            order = sorted(range(len(sat_ids)), key=sat_ids.__getitem__)
+            queue = ChangePointSeries.combine([part.queue for part in parts], lambda values: np.concatenate(values, axis=1))
+            data.set_queue([sat_ids[i] for i in order], queue.select(order))
+        parts = [r['data'] for r in results if r['data'].counters is not None]
+        if parts:
+            sat_ids = [sat_id for part in parts for sat_id in part.counter_sat_ids]
+            order = sorted(range(len(sat_ids)), key=sat_ids.__getitem__)
+            counters = ChangePointSeries.combine([part.counters for part in parts], lambda values: np.concatenate(values, axis=1))
+            data.set_counters([sat_ids[i] for i in order], parts[0].counter_names, counters.select(order))
+        data.handovers = HandoverEvents.concat(r['handovers'] for r in results)
+        for ue_id in range(1, len(self.positions) + 1):
+            data.UE_time_stamp[ue_id] = results[self.ue_owner[ue_id]]['timestamps'][ue_id]
+            data.UE_positions[ue_id] = self.positions[ue_id - 1]
+        self.sent = sum(r['sent'] for r in results)
+        self.skipped = sum(r['skipped'] for r in results)
+        for r in results:
+            for name, (messages, size, peak) in r['links'].items():
+                link = self.links[name]
+                link.messages += messages
+                link.bytes += size
+                link.peak_in_flight = max(link.peak_in_flight, peak)
+            for isl, count in r['isl_load'].items():
+                self.topology.load[isl] += count
+            if self.tracer is not None and r['tracer'] is not None:
+                self.tracer.merge(r['tracer'])
+            self.queue_stats.update(r['queue_stats'])
+
+    def merge_screenshots(self, results):
+        for shots in zip(*(r['screenshots'] for r in results)):
+            inactive, active, requesting = [], [], []
+            for t, ue_inactive, ue_active, ue_requesting, satellite_positions in shots:
+                inactive.extend(ue_inactive)
+                active.extend(ue_active)
+                requesting.extend(ue_requesting)
+            yield shots[0][0], inactive, active, requesting, shots[0][4]
+
+
+# 1 worker 실행과 N worker 실행의 핸드오버 trace 비교 (verify_scheduler.compare_traces 형식)
+def run_trace(number_ue, duration, workers, processes):
+    random.seed(SEED)
+    with contextlib.redirect_stdout(io.StringIO()):
+        positions = scenario.generate_ue_positions(number_ue)
+        simulation = PartitionedSimulation(positions, workers=workers, processes=processes)
+        results = simulation.run(duration, utils.DataCollection(None))
+    handovers, states, counters = {}, {}, {}
+    for r in results:
+        handovers.update(r['timestamps'])
+        states.update(r['states'])
+        counters.update(r['counters'])
+    return (handovers, states, counters), simulation
+
+
+if __name__ == "__main__":
+    from verify_scheduler import compare_traces
+
+    number_ue, duration, workers = 200, 2000, PDES_WORKERS
+    if len(sys.argv) > 1:
+        number_ue, duration, workers = (int(v) for v in sys.argv[1:4])
+    reference, _ = run_trace(number_ue, duration, 1, processes=False)
+    candidate, simulation = run_trace(number_ue, duration, workers, processes=True)
+    mismatches = compare_traces(reference, candidate, tolerance=1e-9)
+    handovers = sum(len(events) for events in reference[0].values())
+    print(f"UE={number_ue} DURATION={duration} WORKERS={workers}: {handovers} handover records, "
+          f"{simulation.windows} windows, {simulation.sent} cross-partition messages, {len(mismatches)} mismatches")
+    for line in mismatches[:20]:
+        print(f"  {line}")
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,67 @@
+import heapq
+
+from config import *
+
+"""
+[Population]: UE 전체를 SimPy 프로세스 하나로 실행하는 population scheduler (POPULATION_SCHEDULER, 대규모 UE)
+    - 기본 모드는 UE마다 프로세스 4개 (init, MESSAGE_CONTROL, ACTION_MONITOR, GEOMETRY_MONITOR) + 메시지마다 cpu_processing 프로세스
+      → 50k UE에서 200k 이상의 generator, UE wake-up마다 timeout 이벤트 1개
+    - UE별 wake-up (시각, 등록 순서, 종류, UE)을 heap 하나로 관리, 같은 시각에 깨어날 UE는 timeout 이벤트 1개로 한 번에(batch) 처리
+        ACTION:   UE.action_step() 후 UE.idle_steps() (1ms, fast-forward 정지 구간이면 다음 관심 시점 직전) 뒤 다시 등록
+        GEOMETRY: UE.geometry_step() 후 반환된 대기 시간 (GEOMETRY_UPDATE_INTERVAL) 뒤 다시 등록
+    - 메시지 수신: UE.messageQ 대신 Inbox, link 도착 callback에서 바로 UE.receive → handler (UE handler는 시간 소모 없음)
+    - 같은 시각 UE wake-up 사이의 순서는 SimPy와 같음 (등록 순서 = SimPy 이벤트 id 순서)
+      위성/AMF 이벤트와의 순서, 메시지 handler 실행 시점(같은 ms 안)만 달라짐 → 난수 소비 순서가 바뀌므로 결과는 기본 모드와 통계적으로 같음 (동일하지 않음)
+"""
+
+ACTION, GEOMETRY = 0, 1
+
+
+# UE.messageQ 대체: put 즉시 UE.receive (대기 메시지 없음, fast-forward/memory 판정용 items는 항상 비어 있음)
+class Inbox:
+    def __init__(self, ue):
+        self.ue = ue
+        self.items = ()
+
+    def put(self, msg):
+        self.ue.receive(msg)
+
+
+class Population:
+    def __init__(self, env, UEs):
+        self.env = env
+        self.UEs = list(UEs.values()) # 생성 시점의 UE (PDES: 이후 directory에 추가되는 GhostUE 제외)
+        self.heap = [] # (wake-up 시각, 등록 순서, ACTION/GEOMETRY, UE)
+        self.sequence = 0
+        self.wakeups = 0 # UE step 실행 수
+        self.batches = 0 # timeout 이벤트 수 (서로 다른 wake-up 시각)
+        # 0 ms: UE 순서대로 ACTION → GEOMETRY (기본 모드의 프로세스 등록 순서와 같음, GEOMETRY는 UE.geometry_phase부터)
+        for ue in self.UEs:
+            self.schedule(env.now, ACTION, ue)
+            self.schedule(env.now + ue.geometry_phase, GEOMETRY, ue)
+
+    def schedule(self, time, kind, ue):
+        heapq.heappush(self.heap, (time, self.sequence, kind, ue))
+        self.sequence += 1
+
+    # SimPy process: 가장 이른 wake-up 시각까지 대기 후 그 시각의 UE를 모두 처리
+    def run(self):
+        for ue in self.UEs:
+            ue.deploy()
+        heap = self.heap
+        while heap:
+            if heap[0][0] > self.env.now:
+                yield self.env.timeout(heap[0][0] - self.env.now)
+            now = self.env.now
+            self.batches += 1
+            while heap and heap[0][0] <= now:
+                _, _, kind, ue = heapq.heappop(heap)
+                if kind == ACTION:
+                    ue.action_step()
+                    self.schedule(now + ue.idle_steps(), ACTION, ue)
+                else:
+                    self.schedule(now + ue.geometry_step(), GEOMETRY, ue)
+                self.wakeups += 1
+
+    def summary(self):
+        return f"Population scheduler: {len(self.UEs)} UEs, {self.wakeups} UE wake-ups in {self.batches} batches"
@@ -0,0 +1,80 @@
+import glob
+import json
+import os
+import sys
+import time
+
+from config import *
+
+"""
+[ProgressReporter]: 긴 run/sweep용 진행 상황 보고 (매 ms "Simulation Time" 출력 대체)
+    - PROGRESS_INTERVAL(초, wall time)마다 한 번만 출력: 시뮬레이션 시각/진행률, wall time, 처리량(events/s 등), ETA, 추가 지표(대기열, 핸드오버 수 등)
+    - 같은 시점에 <run 디렉토리>/PROGRESS_STATUS (JSON) 갱신 (임시 파일 작성 후 os.replace → 읽는 쪽은 항상 완전한 파일)
+    - 엔진은 due()로 출력 시점만 확인 (time.monotonic 한 번), 지표 수집은 출력할 때만
+    - 실행: python3 src/progress.py <res 디렉토리> → 모든 run의 status 파일 요약 (sweep dashboard)
+"""
+
+class ProgressReporter:
+    def __init__(self, duration, status_path=None, name="", interval=PROGRESS_INTERVAL, stream=sys.stderr):
+        self.duration = duration
+        self.status_path = status_path
+        self.name = name
+        self.interval = interval
+        self.stream = stream
+        self.start = time.monotonic()
+        self.last = (self.start, 0, 0) # 직전 보고 (wall, 시뮬레이션 시각, work)
+
+    def due(self):
+        return time.monotonic() - self.last[0] >= self.interval
+
+    # now: 시뮬레이션 시각 (ms), work: 누적 처리량 (unit 단위), details: 추가 지표 {이름: 값}
+    def report(self, now, work=0, unit="events", details=None, state="running"):
+        wall = time.monotonic()
+        last_wall, last_now, last_work = self.last
+        span = max(wall - last_wall, 1e-9)
+        elapsed = wall - self.start
+        speed = (now - last_now) / span # 시뮬레이션 ms / wall s (직전 보고 이후)
+        rate = (work - last_work) / span
+        eta = (self.duration - now) / speed if speed > 0 else None
+        self.last = (wall, now, work)
+        status = {
+            'name': self.name, 'pid': os.getpid(), 'state': state, 'updated': time.time(),
+            'sim_time': now, 'duration': self.duration, 'progress': now / self.duration if self.duration else 1.0,
+            'wall': elapsed, 'speed': speed, 'eta': eta, 'work': work, 'rate': rate, 'unit': unit,
+            'details': details or {},
+        }
+        print(format_status(status), file=self.stream)
+        self.write(status)
+
+    # 종료 보고: 처리량/속도는 run 전체 평균
+    def finish(self, now, work=0, unit="events", details=None):
+        self.last = (self.start, 0, 0)
+        self.report(now, work, unit, details, state="done")
+
+    def write(self, status):
+        if self.status_path is None:
+            return
+        temporary = f"{self.status_path}.{os.getpid()}.tmp"
+        with open(temporary, 'w') as f:
+            json.dump(status, f)
+        os.replace(temporary, self.status_path)
+
+
+def format_status(status):
+    eta = "-" if status['eta'] is None else f"{status['eta']:.0f} s"
+    details = "".join(f" | {key} {value}" for key, value in status['details'].items())
+    return (f"[{status['name']}] {status['state']} {status['sim_time']:.0f}/{status['duration']} ms ({status['progress'] * 100:.1f}%)"
+            f" | wall {status['wall']:.1f} s | {status['rate']:.0f} {status['unit']}/s | ETA {eta}{details}")
+
+
+# SimPy Environment가 지금까지 schedule한 이벤트 수 (TickEnvironment.scheduled 또는 simpy eid counter, 보고 시점에만 읽음)
+def event_count(env):
+    scheduled = getattr(env, 'scheduled', None)
+    return scheduled if scheduled is not None else next(env._eid)
+
+
+if __name__ == "__main__":
+    for path in sorted(glob.glob(os.path.join(sys.argv[1] if len(sys.argv) > 1 else ".", "*", PROGRESS_STATUS))):
+        with open(path) as f:
+            status = json.load(f)
+        print(f"{format_status(status)} | updated {time.time() - status['updated']:.0f} s ago")
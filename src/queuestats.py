@@ -0,0 +1,85 @@
+import simpy
+
+from config import *
+from timeseries import ChangePointSeries
+
+"""
+[QueueStats]: 위성 CPU 대기열의 시간 가중(time-weighted) 통계, 1ms polling 없이 대기열/사용 CPU 수가 바뀔 때만 갱신
+    - MonitoredPriorityResource: simpy.PriorityResource의 request/release 처리(_trigger_put/_trigger_get) 직후 QueueStats.update 호출
+    - 통계: 평균/최대 대기 길이, QUEUE_THRESHOLDS 이상이었던 누적 시간, 사용 중 CPU 수의 시간 적분(busy integral)
+    - 변경 기록(change log): (시각, 대기 길이, 사용 CPU 수) → 임의 시점의 정확한 대기 길이 곡선 복원 (series)
+"""
+
+class QueueStats:
+    def __init__(self, env, thresholds=QUEUE_THRESHOLDS):
+        self.env = env
+        self.thresholds = thresholds
+        self.start = env.now
+        self.last_time = env.now # 마지막 변경 시각
+        self.queue = 0 # 현재 대기 길이
+        self.busy = 0 # 현재 사용 중 CPU 수
+        self.queue_area = 0.0 # ∫ 대기 길이 dt
+        self.busy_area = 0.0 # ∫ 사용 중 CPU 수 dt
+        self.max_queue = 0
+        self.time_above = [0.0] * len(thresholds) # 대기 길이 >= threshold 누적 시간
+        self.log = [(env.now, 0, 0)] # change log (시각, 대기 길이, 사용 CPU 수)
+
+    # 대기열/사용 CPU 수가 바뀌었을 때만 직전 구간을 적분하고 기록
+    def update(self, queue, busy):
+        if queue == self.queue and busy == self.busy:
+            return
+        self._integrate(self.env.now)
+        self.queue = queue
+        self.busy = busy
+        if queue > self.max_queue:
+            self.max_queue = queue
+        self.log.append((self.env.now, queue, busy))
+
+    def _integrate(self, now):
+        elapsed = now - self.last_time
+        if elapsed > 0:
+            self.queue_area += self.queue * elapsed
+            self.busy_area += self.busy * elapsed
+            for index, threshold in enumerate(self.thresholds):
+                if self.queue >= threshold:
+                    self.time_above[index] += elapsed
+        self.last_time = now
+
+    # 현재 시각까지의 통계 {mean_queue, max_queue, busy_integral, utilization, time_above}
+    def summary(self, capacity):
+        self._integrate(self.env.now)
+        duration = self.env.now - self.start
+        return {
+            'mean_queue': self.queue_area / duration if duration else 0.0,
+            'max_queue': self.max_queue,
+            'busy_integral': self.busy_area,
+            'utilization': self.busy_area / (capacity * duration) if duration else 0.0,
+            'time_above': dict(zip(self.thresholds, self.time_above)),
+        }
+
+    # change log의 대기 길이 변경 시점 series (at(times)로 임의 시점 값 복원, 같은 시각의 변경은 모두 반영된 값)
+    def series(self):
+        series = ChangePointSeries()
+        for time, queue, _ in self.log:
+            series.record(time, queue)
+        return series
+
+
+class MonitoredPriorityResource(simpy.PriorityResource):
+    def __init__(self, env, capacity=1):
+        super().__init__(env, capacity)
+        self.stats = QueueStats(env)
+
+    def _trigger_put(self, get_event):
+        super()._trigger_put(get_event)
+        self.stats.update(len(self.queue), len(self.users))
+
+    def _trigger_get(self, put_event):
+        super()._trigger_get(put_event)
+        self.stats.update(len(self.queue), len(self.users))
+
+
+def format_summary(sat_id, summary):
+    above = ", ".join(f">={threshold}: {time:.1f} ms" for threshold, time in summary['time_above'].items())
+    return (f"Satellite {sat_id} CPU queue: mean {summary['mean_queue']:.3f}, max {summary['max_queue']}, "
+            f"utilization {summary['utilization'] * 100:.1f}% | {above}")
@@ -0,0 +1,104 @@
+import os
+import sys
+
+import numpy as np
+
+from config import *
+import kpi
+import utils
+from counters import MessageCounters
+from handover import HandoverRecorder
+from timeseries import ChangePointSeries
+from eventtrace import ADMIT, DROP, CPU_START, STATE, RETRANSMIT, SAMPLE, STATE_INDEX, load
+
+"""
+[Replay]: 메시지 이벤트 trace(eventtrace.py)에서 DataCollection 전체를 재계산 (재시뮬레이션 없이 그래프/CSV/KPI/export 변경·추가)
+    - 카운터: ADMIT/DROP마다 meta의 task별 수신/수락/drop 카운터 열 증가, SAMPLE(수집) 시점에 기록 → 실행 중 collector와 같은 값
+    - CPU 대기 길이: ADMIT(요청) +1, CPU_START(할당) -1 (위성별 change log, 같은 시각 변경은 마지막 값)
+    - waiting / ue_states: STATE 이벤트로 상태별 UE 수 갱신 (초기 상태 전부 ACTIVE)
+    - UE_time_stamp / handovers: STATE(WAITING_RRC_CONFIGURATION = MR 전송, RRC_CONFIGURED = HO COMMAND, ACTIVE = 완료) + RETRANSMIT
+    - 실행: python3 src/replay.py <run 디렉토리 또는 trace 파일> [출력 디렉토리 (기본 <run>/replay)] → graph_data, simulation_log.csv, handovers.npz, KPI 출력
+"""
+
+MR = STATE_INDEX[WAITING_RRC_CONFIGURATION]
+COMMAND = STATE_INDEX[RRC_CONFIGURED]
+COMPLETE = STATE_INDEX[ACTIVE]
+
+
+def replay(columns, meta, graph_path):
+    data = utils.DataCollection(graph_path)
+    sat_ids = meta['sat_ids']
+    counters = MessageCounters(sat_ids, meta['counter_names'])
+    receive_counters = [tuple(c) for c in meta['receive_counters']]
+    outcome_counters = {ADMIT: [tuple(c) for c in meta['admit_counters']], DROP: [tuple(c) for c in meta['drop_counters']]}
+    views = {sat_id: counters.view(sat_id) for sat_id in sat_ids}
+
+    queues = {sat_id: ChangePointSeries([0], [0]) for sat_id in sat_ids} # QueueStats change log와 같이 0 ms 빈 대기열부터
+    lengths = dict.fromkeys(sat_ids, 0)
+
+    states = dict.fromkeys(meta['ue_ids'], COMPLETE) # UE ID → UE_STATES index
+    counts = [0] * len(meta['ue_states'])
+    counts[COMPLETE] = len(states)
+
+    stamps = {ue_id: [] for ue_id in meta['ue_ids']}
+    handovers = HandoverRecorder()
+    rows = {} # UE ID → 진행 중인 핸드오버 행
+
+    events = zip(*(columns[name].tolist() for name in ("time", "kind", "node", "peer", "task", "aux")))
+    for time, kind, node, peer, task, aux in events:
+        if kind == ADMIT or kind == DROP:
+            view = views[node]
+            view.add(receive_counters[task])
+            view.add(outcome_counters[kind][task])
+            if kind == ADMIT:
+                lengths[node] += 1
+                queues[node].record(time, lengths[node])
+        elif kind == CPU_START:
+            lengths[node] -= 1
+            queues[node].record(time, lengths[node])
+        elif kind == STATE:
+            counts[states[node]] -= 1
+            counts[task] += 1
+            states[node] = task
+            if task == MR:
+                stamps[node].append({'timestamp': [time], 'from': peer})
+                rows[node] = handovers.start(node, peer, time)
+            elif task == COMMAND:
+                stamps[node][-1]['timestamp'].append(time)
+                stamps[node][-1]['isSuccess'] = True
+                handovers.command(rows[node], aux, time)
+            elif task == COMPLETE:
+                stamps[node][-1]['timestamp'].append(time)
+                handovers.complete(rows[node], time)
+        elif kind == RETRANSMIT:
+            stamps[node][-1]['timestamp'].append(time)
+            handovers.retransmit(rows[node])
+        elif kind == SAMPLE:
+            data.x.append(int(time) if time.is_integer() else time)
+            if aux:
+                data.counter_series.record(time, counters.current())
+                data.waiting.record(time, counts[MR])
+                data.ue_states.record(time, counts)
+
+    data.set_counters(sat_ids, counters.names, data.counter_series)
+    data.set_queue(sat_ids, ChangePointSeries.combine([queues[sat_id] for sat_id in sat_ids], lambda values: np.stack(values, axis=1)))
+    data.UE_time_stamp = stamps
+    data.UE_positions = {ue_id: tuple(position) for ue_id, position in zip(meta['ue_ids'], meta['ue_positions'])}
+    data.handovers = handovers.events()
+    return data
+
+
+if __name__ == "__main__":
+    path = sys.argv[1]
+    trace = path if os.path.isfile(path) else os.path.join(path, EVENT_TRACE_FILE)
+    out = sys.argv[2] if len(sys.argv) > 2 else os.path.join(os.path.dirname(trace), "replay")
+    columns, meta = load(trace)
+    for sat_id in meta['sat_ids']:
+        os.makedirs(out + "/graph_data/sat_" + str(sat_id), exist_ok=True)
+
+    data = replay(columns, meta, out + "/graph_data")
+    print(f"Replayed {len(columns['time'])} events ({meta['duration']} ms, {len(meta['sat_ids'])} satellites, {len(meta['ue_ids'])} UEs)")
+    print(kpi.format_kpis(kpi.handover_kpis(data.handovers)))
+    data.handovers.save(out + "/handovers.npz")
+    data.draw()
+    data.save_to_csv(out + "/simulation_log.csv")
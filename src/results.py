@@ -0,0 +1,204 @@
+import hashlib
+import io
+import json
+import sqlite3
+import sys
+import time
+
+import numpy as np
+
+import config
+import kpi
+from handover import FIELDS as HANDOVER_FIELDS
+
+"""
+[ResultStore]: sweep 결과를 하나의 SQLite 파일에 모으는 저장소 (run.sh의 실행별 디렉토리를 다시 파싱하지 않고 run 간 비교)
+    - runs:    run 메타데이터, 시나리오 파라미터 + seed (query용 column), key는 전체 config snapshot의 hash
+               (파라미터 값 override 적용, config가 모두 같은 run만 교체: QUEUED_SIZE, HYBRID_FOREGROUND 등이 다르면 별도 run)
+    - metrics: run별 스칼라 KPI (drop rate, 핸드오버 성공률/latency 백분위, 평균 대기열 등) → run 간 query
+    - series:  run별 시계열 (x, 카운터 배열/CPU 대기열/대기 UE 수 변경 시점, 핸드오버 배열, latency/interruption CDF)을 압축 npz blob으로 저장
+    - 동시 쓰기: WAL 모드 + busy timeout, run 하나를 BEGIN IMMEDIATE 트랜잭션 하나로 기록 (병렬 sweep worker 지원)
+    - 실행: python3 src/results.py <db> <metric> <by> [param=value ...]
+        예) python3 src/results.py res/results.db drop_rate satellite_cpu ground_delay=15
+"""
+
+PARAMETERS = ("number_ue", "satellite_cpu", "ground_delay", "isl_delay", "core_delay", "duration", "seed", "engine")
+CONFIG_NAMES = { # 파라미터 → config 이름 (main.py 인자로 바뀌는 값을 snapshot에 반영)
+    "number_ue": "NUMBER_UE", "satellite_cpu": "SATELLITE_CPU", "ground_delay": "SATELLITE_GROUND_DELAY",
+    "isl_delay": "SATELLITE_SATELLITE_DELAY", "core_delay": "CORE_DELAY", "duration": "DURATION", "seed": "SEED", "engine": "ENGINE",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    name TEXT,
+    number_ue INTEGER, satellite_cpu INTEGER, ground_delay REAL, isl_delay REAL, core_delay REAL,
+    duration INTEGER, seed INTEGER, engine TEXT,
+    created REAL,
+    config TEXT,
+    config_hash TEXT UNIQUE
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER REFERENCES runs(run_id) ON DELETE CASCADE,
+    name TEXT,
+    value REAL,
+    PRIMARY KEY (run_id, name)
+);
+CREATE TABLE IF NOT EXISTS series (
+    run_id INTEGER REFERENCES runs(run_id) ON DELETE CASCADE,
+    name TEXT,
+    data BLOB,
+    PRIMARY KEY (run_id, name)
+);
+CREATE INDEX IF NOT EXISTS metrics_by_name ON metrics (name, run_id);
+"""
+
+
+def _pack(array):
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, data=np.asarray(array))
+    return buffer.getvalue()
+
+
+def _unpack(blob):
+    with np.load(io.BytesIO(blob)) as f:
+        return f['data']
+
+
+# DataCollection → 스칼라 KPI
+def run_metrics(data):
+    metrics = {}
+    if data.counters is not None and len(data.counters):
+        final = data.counters.last().sum(axis=0) # 마지막 시점, 위성 합
+        totals = dict(zip(data.counter_names, final.tolist()))
+        offered = totals.get("message_from_UE_measurement", 0) + totals.get("message_from_UE_retransmit", 0)
+        metrics.update({f"total_{name}": value for name, value in totals.items()})
+        metrics["drop_rate"] = totals.get("message_dropped", 0) / offered if offered else 0.0
+    if data.queue is not None and data.x:
+        queue = data.queue.at(data.x).astype(float)
+        metrics["mean_queue"] = float(queue.mean())
+        metrics["max_queue"] = float(queue.max())
+    if len(data.waiting) and data.x:
+        metrics["mean_waiting_ue"] = float(data.waiting.at(data.x).mean())
+    if data.handovers is not None:
+        kpis = kpi.handover_kpis(data.handovers)
+        metrics.update({key: kpis[key] for key in ("attempts", "successes", "completed", "success_rate", "failure_rate")})
+        for group in ("latency", "interruption", "retransmissions"):
+            metrics.update({f"{group}_{key}": value for key, value in kpis[group].items() if key != 'n'})
+    return {name: float(value) for name, value in metrics.items()}
+
+
+# DataCollection → 시계열 배열 (위성 통계는 변경 시점 series: <name>_t 변경 시각, <name> 값)
+def run_series(data):
+    series = {"x": np.asarray(data.x)}
+    for name, values in (("counters", data.counters), ("queue", data.queue), ("waiting_ue", data.waiting)):
+        if values is not None and len(values):
+            series[name + "_t"], series[name] = values.arrays()
+    if data.counters is not None:
+        series["counter_sat_ids"] = np.asarray(data.counter_sat_ids)
+    if data.queue is not None:
+        series["queue_sat_ids"] = np.asarray(data.queue_sat_ids)
+    if data.handovers is not None:
+        series.update({f"handover_{name}": getattr(data.handovers, name) for name, _ in HANDOVER_FIELDS})
+        kpis = kpi.handover_kpis(data.handovers)
+        for group in ("latency", "interruption"):
+            series[f"{group}_cdf_x"], series[f"{group}_cdf_y"] = kpis[f"{group}_cdf"]
+    return series
+
+
+def config_snapshot():
+    return {name: value for name, value in vars(config).items()
+            if name.isupper() and isinstance(value, (int, float, str, bool, tuple, list))}
+
+
+# run key: 파라미터 override를 적용한 config snapshot의 hash
+def apply_params(snapshot, params):
+    return {**snapshot, **{CONFIG_NAMES[p]: params[p] for p in PARAMETERS}}
+
+
+def config_hash(snapshot):
+    return hashlib.sha1(json.dumps(snapshot, sort_keys=True).encode()).hexdigest()
+
+
+class ResultStore:
+    def __init__(self, path, timeout=60):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=timeout, isolation_level=None) # 트랜잭션은 직접 관리
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # run 하나 기록: config가 모두 같은 (파라미터 override 포함) 기존 run만 교체
+    def add_run(self, name, params, metrics, series, config=None):
+        key = tuple(params[p] for p in PARAMETERS)
+        snapshot = apply_params(config or {}, params)
+        digest = config_hash(snapshot)
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute("DELETE FROM runs WHERE config_hash = ?", (digest,))
+            run_id = self.conn.execute(
+                f"INSERT INTO runs (name, {', '.join(PARAMETERS)}, created, config, config_hash) VALUES ({', '.join('?' * (len(PARAMETERS) + 4))})",
+                (name, *key, time.time(), json.dumps(snapshot), digest)).lastrowid
+            self.conn.executemany("INSERT INTO metrics VALUES (?, ?, ?)", [(run_id, k, v) for k, v in metrics.items()])
+            self.conn.executemany("INSERT INTO series VALUES (?, ?, ?)", [(run_id, k, _pack(v)) for k, v in series.items()])
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return run_id
+
+    def runs(self, **filters):
+        where, values = self._where(filters)
+        cursor = self.conn.execute(f"SELECT run_id, name, {', '.join(PARAMETERS)} FROM runs {where} ORDER BY run_id", values)
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    # metric을 by 파라미터별로 조회: [(by 값..., metric 값)], 예) metric("drop_rate", ("satellite_cpu",), ground_delay=15)
+    def metric(self, name, by=(), **filters):
+        where, values = self._where(filters, prefix="r.")
+        columns = "".join(f"r.{p}, " for p in by)
+        order = f"ORDER BY {', '.join(f'r.{p}' for p in by)}" if by else ""
+        return self.conn.execute(
+            f"SELECT {columns}m.value FROM runs r JOIN metrics m ON m.run_id = r.run_id AND m.name = ? {where} {order}",
+            (name, *values)).fetchall()
+
+    def series(self, run_id, name):
+        row = self.conn.execute("SELECT data FROM series WHERE run_id = ? AND name = ?", (run_id, name)).fetchone()
+        return None if row is None else _unpack(row[0])
+
+    def _where(self, filters, prefix=""):
+        unknown = set(filters) - set(PARAMETERS)
+        if unknown:
+            raise ValueError(f"Unknown run parameters: {sorted(unknown)}")
+        if not filters:
+            return "", ()
+        return "WHERE " + " AND ".join(f"{prefix}{p} = ?" for p in filters), tuple(filters.values())
+
+
+# main.py: 실행 결과를 저장소에 기록
+def store_run(path, name, data, params):
+    store = ResultStore(path)
+    try:
+        return store.add_run(name, params, run_metrics(data), run_series(data), config_snapshot())
+    finally:
+        store.close()
+
+
+def _parse(value):
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+if __name__ == "__main__":
+    path, name, by = sys.argv[1], sys.argv[2], tuple(sys.argv[3].split(",")) if len(sys.argv) > 3 else ()
+    filters = dict(arg.split("=", 1) for arg in sys.argv[4:])
+    store = ResultStore(path)
+    for row in store.metric(name, by, **{key: _parse(value) for key, value in filters.items()}):
+        print("\t".join(str(value) for value in row))
@@ -0,0 +1,247 @@
+import math
+import random
+from collections import deque
+
+import numpy as np
+
+import utils
+from AMF import *
+from Satellite import *
+from UE import *
+from fastforward import FastForward
+from link import make_links
+from topology import ISLTopology
+from tracing import MessageTracer
+from counters import MessageCounters
+from handover import HandoverRecorder
+from timeseries import ChangePointSeries
+from census import UECensus
+from eventtrace import EventTrace
+from channel import ChannelTrace
+from background import BackgroundLoad
+from population import Population
+from adaptive import AdaptiveMeasurement
+
+"""
+[Scenario]: main.py의 entity 생성/연결 절차를 재사용 가능하도록 분리
+    - main.py 외에 scheduler 검증(verify_scheduler.py) 등 같은 시나리오를 여러 Environment에서 실행해야 하는 곳에서 사용
+"""
+
+# NOTE: Simulation UE initial Position Config
+def generate_ue_positions(number_ue):
+    # (1) 위성에 커버리지가 겹치는 지역에만 UE를 배치
+    if len(POS_SATELLITES) < 4:
+        ylim_intersect = math.sqrt(SATELLITE_R ** 2 - (HORIZONTAL_DISTANCE / 2) ** 2) - 500
+        ylim = (ylim_intersect // GROUP_AREA_L - 1) * GROUP_AREA_L
+    else:
+        ylim_half = VERTICAL_DISTANCE / 2 - 200
+        ylim = (ylim_half // GROUP_AREA_L - 1) * GROUP_AREA_L
+    # (2) 위성 영역 내 랜덤 배치
+    # return utils.generate_points(number_ue, SATELLITE_R - 1 * 1000, 0, 0)
+    return utils.generate_points_with_ylim(number_ue, SATELLITE_R - 100, 0, 0, ylim)
+
+
+# 초기 접속 위성: position에서 가장 가까운 위성 ID (satellite_positions: {위성 ID: (x, y)})
+def closest_satellite(position, satellite_positions):
+    closest_sat_id = -1
+    min_dist = float('inf')
+    for sat_id, sat_position in satellite_positions.items():
+        dist = math.dist(position, sat_position)
+        if dist < min_dist:
+            min_dist = dist
+            closest_sat_id = sat_id
+    return closest_sat_id
+
+
+# GEOMETRY_PHASE: UE 1..number_ue의 geometry 갱신 위상 (ms, slot 시작 시점), None이면 모든 UE가 0 ms에 동시 갱신
+# (전체 UE 기준으로 계산: PDES partition/hybrid foreground/background가 같은 UE에 같은 위상)
+def geometry_phases(number_ue, mode=GEOMETRY_PHASE, slots=GEOMETRY_PHASE_SLOTS):
+    if mode is None:
+        return None
+    if not 1 <= slots <= GEOMETRY_UPDATE_INTERVAL:
+        raise ValueError(f"GEOMETRY_PHASE_SLOTS must be between 1 and GEOMETRY_UPDATE_INTERVAL ({GEOMETRY_UPDATE_INTERVAL}), got {slots}")
+    width = GEOMETRY_UPDATE_INTERVAL // slots
+    if mode == "round_robin":
+        return [(index % slots) * width for index in range(number_ue)]
+    if mode == "random":
+        rng = random.Random(f"{SEED}/geometry_phase") # 메시지 jitter/shadowing 난수열과 분리
+        return [rng.randrange(slots) * width for _ in range(number_ue)]
+    raise ValueError(f"Unknown GEOMETRY_PHASE: {mode}")
+
+
+# AMF, 위성(POS_SATELLITES), UE(positions) 생성 후 객체간 연결
+# ue_ids: 생성할 UE ID 집합 (None이면 전체, PDES partition은 자신이 소유한 UE만 생성)
+def build_entities(env, positions, satellite_ground_delay=SATELLITE_GROUND_DELAY, satellite_cpu=SATELLITE_CPU, ue_ids=None):
+    # Generate AMF Entity
+    amf = AMF(core_delay=CORE_DELAY, env=env)
+
+    # Generate Dictionary (UE, Satellites)
+    UEs = {}
+    satellites = {}
+
+    # Message counters: 모든 위성의 카운터를 (위성 × 카운터) 배열 하나로 관리
+    counters = MessageCounters(POS_SATELLITES)
+
+    # Deploying Satellites following POS_SATELLITES(ID/POS) in config.py
+    for sat_id in POS_SATELLITES:
+        pos = POS_SATELLITES[sat_id]
+        satellites[sat_id] = Satellite(
+            identity=sat_id,
+            position_x=pos[0],
+            position_y=pos[1],
+            velocity=SATELLITE_V,
+            satellite_ground_delay=satellite_ground_delay,
+            ISL_delay=SATELLITE_SATELLITE_DELAY,
+            core_delay=CORE_DELAY,
+            AMF=amf,
+            env=env,
+            counters=counters,
+            satellite_cpu=satellite_cpu)
+
+    # Deploying UEs following randomly generated positions
+    satellite_positions = {sat_id: (sat.position_x, sat.position_y) for sat_id, sat in satellites.items()}
+    phases = geometry_phases(len(positions))
+    for index, position in enumerate(positions, start=1):
+        if ue_ids is not None and index not in ue_ids:
+            continue
+        # Find the closest satellite for the initial connection
+        closest_sat_id = closest_satellite(position, satellite_positions)
+
+        UEs[index] = UE(
+            identity=index,
+            position_x=position[0],
+            position_y=position[1],
+            #serving_satellite=satellites[1],
+            serving_satellite=satellites[closest_sat_id],
+            satellite_ground_delay=satellite_ground_delay,
+            env=env)
+        if phases is not None: # 첫 geometry 갱신 시점 (fast-forward도 이 시점 직전까지 건너뛸 수 있음)
+            UEs[index].geometry_phase = UEs[index].next_geometry_update = phases[index - 1]
+
+    # Connecting objects (각 객체간 연동, 객체정보 공유)
+    for identity in satellites:
+        satellites[identity].UEs = UEs
+        satellites[identity].satellites = satellites
+    handovers = HandoverRecorder() # 핸드오버 시도 기록 (모든 UE 공유)
+    for identity in UEs:
+        UEs[identity].satellites = satellites
+        UEs[identity].handovers = handovers
+    UECensus(UEs.values()) # 상태별 UE 수/구성원 (모든 UE 공유, ue.census)
+
+    # Population scheduler: UE별 프로세스 대신 UE 전체의 wake-up heap을 프로세스 하나로 실행 (모든 UE 공유, ue.population)
+    if POPULATION_SCHEDULER:
+        population = Population(env, UEs)
+        for identity in UEs:
+            UEs[identity].population = population
+        env.process(population.run())
+    amf.satellites = satellites
+
+    # ISL topology: 위성 간 다중 hop 라우팅 테이블 (한 번 계산 후 모든 위성이 공유)
+    topology = ISLTopology(POS_SATELLITES, ISL_TOPOLOGY, SATELLITE_SATELLITE_DELAY)
+    for identity in satellites:
+        satellites[identity].topology = topology
+
+    # Message lifecycle tracer: 위성 수신 메시지의 전파/대기/처리 지연 히스토그램 (위성 전체 공유)
+    if MESSAGE_TRACE:
+        tracer = MessageTracer()
+        for identity in satellites:
+            satellites[identity].tracer = tracer
+            satellites[identity].arrivals = deque()
+
+    # Message event trace: 송신/수락/drop/CPU 처리/UE 상태 전이 (모든 객체 공유, replay.py 입력)
+    if EVENT_TRACE:
+        events = EventTrace()
+        for entity in [amf] + list(satellites.values()) + list(UEs.values()):
+            entity.events = events
+
+    # Message links (service/ISL/core): 같은 Environment의 모든 객체가 공유
+    links = make_links(env)
+    for entity in [amf] + list(satellites.values()) + list(UEs.values()):
+        entity.links = links
+
+    return amf, satellites, UEs
+
+
+# Fast-forward: 정지 구간(quiescent period)에서 1ms polling 프로세스를 다음 관심 시점 직전까지 건너뜀
+# periods: 정지 구간에도 깨어나야 하는 주기 샘플러 (예: screenshot 200ms)
+def attach_fast_forward(env, amf, satellites, UEs, periods=(), until=DURATION):
+    fast_forward = FastForward(env, UEs, satellites, amf, until=until)
+    for period in periods:
+        fast_forward.add_period(period)
+    for entity in list(satellites.values()) + list(UEs.values()):
+        entity.fast_forward = fast_forward
+    return fast_forward
+
+
+# Hybrid 모드 foreground UE ID: 전체 UE(1..number_ue)에서 고르게 선택 (위치 분포 유지)
+def foreground_ids(number_ue, foreground):
+    return set(np.unique(np.linspace(1, number_ue, min(foreground, number_ue)).round().astype(int)).tolist()) if foreground else set()
+
+
+# Hybrid 모드 background 부하: foreground가 아닌 UE 위치를 aggregate arrival로 위성 대기열에 전달
+def attach_background(env, positions, foreground, satellites, links, satellite_ground_delay=SATELLITE_GROUND_DELAY):
+    phases = geometry_phases(len(positions))
+    background_ids = [index for index in range(1, len(positions) + 1) if index not in foreground]
+    background = BackgroundLoad(env, [positions[index - 1] for index in background_ids], satellites, links, satellite_ground_delay,
+                                phases=None if phases is None else [phases[index - 1] for index in background_ids])
+    for satellite in satellites.values():
+        satellite.background = background
+    env.process(background.run())
+    return background
+
+
+# Adaptive measurement: A3 경계까지 여유가 큰 UE의 geometry 갱신 주기를 늘림 (모든 UE 공유)
+def attach_adaptive_measurement(UEs):
+    adaptive = AdaptiveMeasurement()
+    for ue in UEs.values():
+        ue.adaptive = adaptive
+    return adaptive
+
+
+# Channel trace: UE GEOMETRY_MONITOR의 채널 값 기록/재생 (mode: "record" / "playback" / "auto")
+def attach_channel_trace(path, mode, UEs, satellites, duration=DURATION):
+    channel = ChannelTrace(path, mode, UEs, satellites, duration)
+    for ue in UEs.values():
+        ue.channel = channel
+    return channel
+
+
+# Logging Text: This function collects information but draws(LOG) in the end of the simulation.
+# 위성 카운터 배열/UE 상태별 수는 1ms마다 비교해 바뀐 경우만 기록, CPU 대기 길이는 polling하지 않음 (종료 후 finalize_stats로 시계열 생성)
+# UE 상태별 수는 UECensus에서 읽음 (UE 순회 없음)
+def global_stats_collector_draw_final(env, data, UEs, satellites, timestep, fast_forward=None):
+    counters = next(iter(satellites.values())).counter.counters if satellites else None
+    census = next(iter(UEs.values())).census if UEs else UECensus()
+    events = next(iter(satellites.values())).events if satellites else None
+    while True:
+        data.x.append(env.now)
+        if counters is not None:
+            data.counter_series.record(env.now, counters.current())
+        data.waiting.record(env.now, census.count(WAITING_RRC_CONFIGURATION))
+        data.ue_states.record(env.now, census.counts())
+        if events is not None:
+            events.sample(env.now)
+
+        # 정지 구간: 건너뛴 ms는 값이 변하지 않으므로 샘플 시점만 일괄 추가
+        steps = fast_forward.steps(env.now) if fast_forward else 1
+        if steps > timestep:
+            data.backfill(range(env.now + timestep, env.now + steps, timestep))
+            if events is not None:
+                for time in range(env.now + timestep, env.now + steps, timestep):
+                    events.sample(time, collected=False)
+            yield env.timeout(steps)
+        else:
+            yield env.timeout(timestep)
+
+
+# 종료 후 위성 통계 시계열 정리: 카운터 변경 기록 → satellites 순서 (위성 × 카운터) series, CPU 대기 길이는 QueueStats change log에서
+def finalize_stats(data, satellites):
+    if satellites and len(data.counter_series):
+        counters = next(iter(satellites.values())).counter.counters
+        rows = [counters.row[id] for id in satellites]
+        width = len(counters.names)
+        values = [np.pad(value, ((0, 0), (0, width - value.shape[1])))[rows] for value in data.counter_series.values] # 실행 중 등록된 카운터는 0부터
+        data.set_counters(list(satellites), counters.names, ChangePointSeries(data.counter_series.times, values))
+    if satellites:
+        data.set_queue(list(satellites), ChangePointSeries.combine([satellites[id].cpus.stats.series() for id in satellites],
+                                                                   lambda values: np.stack(values, axis=1)))
@@ -0,0 +1,88 @@
+from collections import deque
+from heapq import heappop, heappush
+
+import simpy
+from simpy.core import EmptySchedule, Infinity, StopSimulation
+from simpy.events import NORMAL, EventPriority
+
+from config import *
+
+"""
+[TickEnvironment]: 정수 tick 시간축 + calendar queue 기반의 SimPy 호환 Environment (SCHEDULER = "tick")
+    - simpy.Environment의 schedule/step/peek만 교체하므로 Satellite, UE, AMF, simpy.Store/Resource를 그대로 사용
+    - 시간은 내부적으로 정수 tick (TICKS_PER_MS, 기본 1 tick = 1 ns), env.now는 기존과 같이 ms 단위로 노출
+    - 같은 tick의 이벤트는 하나의 bucket(우선순위별 FIFO)에 모이고, heap에는 tick당 한 번만 들어감
+      (1ms/100ms/200ms 주기 timeout처럼 같은 시점에 몰리는 이벤트는 heap 비교 없이 O(1) append/popleft)
+    - bucket 내 FIFO 순서 == 등록 순서 == SimPy의 eid 순서이므로, 같은 시점 이벤트의 처리 순서는 SimPy와 동일
+      (차이는 jitter가 tick 단위로 양자화되는 것뿐)
+"""
+
+class TickEnvironment(simpy.Environment):
+    def __init__(self, initial_time=0, ticks_per_ms=TICKS_PER_MS):
+        simpy.Environment.__init__(self, initial_time)
+        self.ticks_per_ms = ticks_per_ms
+        self._tick = self._to_ticks(initial_time)
+        self._buckets = {} # tick -> [StopSimulation 재등록, URGENT, NORMAL] 우선순위별 FIFO
+        self._ticks = [] # bucket이 존재하는 tick의 heap (tick당 1개)
+        self.scheduled = 0 # schedule된 이벤트 수 (progress 보고용)
+
+    def _to_ticks(self, delay):
+        if type(delay) is int:
+            return delay * self.ticks_per_ms
+        return int(delay * self.ticks_per_ms + 0.5)
+
+    def schedule(self, event, priority=NORMAL, delay=0):
+        self.scheduled += 1
+        tick = self._tick + self._to_ticks(delay) if delay else self._tick
+        bucket = self._buckets.get(tick)
+        if bucket is None:
+            bucket = self._buckets[tick] = (deque(), deque(), deque())
+            heappush(self._ticks, tick)
+        bucket[priority + 1].append(event)
+
+    def peek(self):
+        if not self._ticks:
+            return Infinity
+        return self._ticks[0] / self.ticks_per_ms
+
+    def step(self):
+        if not self._ticks:
+            raise EmptySchedule
+        tick = self._ticks[0]
+        bucket = self._buckets[tick]
+        for events in bucket:
+            if events:
+                event = events.popleft()
+                break
+        if not (bucket[0] or bucket[1] or bucket[2]):
+            heappop(self._ticks)
+            del self._buckets[tick]
+
+        if tick != self._tick:
+            self._tick = tick
+            # 정수 ms 시점은 int로 유지 (polling 프로세스, range 기반 back-fill 등이 정수 시간을 가정)
+            self._now = tick // self.ticks_per_ms if tick % self.ticks_per_ms == 0 else tick / self.ticks_per_ms
+
+        # 이하 simpy.Environment.step과 동일: callback 실행 및 실패 이벤트 처리
+        callbacks, event.callbacks = event.callbacks, None
+        try:
+            for callback in callbacks:
+                callback(event)
+        except StopSimulation:
+            event.callbacks = callbacks[callbacks.index(callback) + 1:]
+            self.schedule(event, EventPriority(-1))
+            raise
+
+        if not event._ok and not hasattr(event, '_defused'):
+            exc = type(event._value)(*event._value.args)
+            exc.__cause__ = event._value
+            raise exc
+
+
+# config의 SCHEDULER 설정에 따라 시뮬레이션 Environment 생성
+def make_environment(scheduler=SCHEDULER):
+    if scheduler == "tick":
+        return TickEnvironment()
+    if scheduler == "simpy":
+        return simpy.Environment()
+    raise ValueError(f"Unknown scheduler: {scheduler}")
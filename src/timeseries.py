@@ -0,0 +1,65 @@
+import numpy as np
+
+"""
+[ChangePointSeries]: 값이 바뀐 시점의 (시각, 값)만 저장하는 시계열 (1ms 샘플 대부분이 직전 값과 같음: 핸드오버 wave 사이 카운터, 빈 대기열)
+    - record(t, value): 직전 값과 다를 때만 기록 (값은 scalar 또는 배열, 예: 위성 × 카운터)
+    - at(times): 임의 시점의 값으로 손실 없이 복원 (각 시점 이전 마지막 변경 값, 같은 시각 변경은 반영, 첫 기록 이전 = 첫 값)
+    - from_dense / combine / select: dense 배열 변환, partition·위성별 series 합치기, 위성 순서 재배열
+"""
+
+class ChangePointSeries:
+    def __init__(self, times=(), values=()):
+        self.times = list(times)
+        self.values = list(values)
+        self.cache = None # (times, values) numpy 배열, record 시 무효화
+
+    def __len__(self):
+        return len(self.times)
+
+    def record(self, t, value):
+        if self.values and np.array_equal(self.values[-1], value):
+            return
+        value = np.array(value)
+        if self.times and self.times[-1] == t:
+            self.values[-1] = value # 같은 시각의 변경은 마지막 값만 유지
+        else:
+            self.times.append(t)
+            self.values.append(value)
+        self.cache = None
+
+    def last(self):
+        return self.values[-1]
+
+    def arrays(self):
+        if self.cache is None:
+            self.cache = (np.asarray(self.times, dtype=float), np.stack(self.values) if self.values else np.zeros(0))
+        return self.cache
+
+    # times 시점의 값 (len(times) × 값 shape)
+    def at(self, times):
+        return ChangePointSeries.lookup(*self.arrays(), times)
+
+    # 변경 시점 배열 (change_times, values)에서 times 시점의 값 (values는 memory-map 배열도 가능, 필요한 행만 읽음)
+    @staticmethod
+    def lookup(change_times, values, times):
+        index = np.searchsorted(change_times, np.asarray(times, dtype=float), side='right') - 1
+        return values[np.maximum(index, 0)]
+
+    # 저장된 값마다 value[index] (위성 축 선택/재배열)
+    def select(self, index):
+        return ChangePointSeries.from_dense(self.times, np.stack(self.values)[:, index])
+
+    # dense 샘플 (times, values[len(times), ...]) → 변경 시점만
+    @staticmethod
+    def from_dense(times, values):
+        values = np.asarray(values)
+        changed = np.ones(len(values), dtype=bool)
+        changed[1:] = (values[1:] != values[:-1]).any(axis=tuple(range(1, values.ndim)))
+        return ChangePointSeries(np.asarray(times)[changed].tolist(), list(values[changed]))
+
+    # 여러 series를 변경 시점 합집합에서 join(각 series 값 배열 list)으로 합침
+    # 예) 위성 축 concat: join=lambda v: np.concatenate(v, axis=1), 합: join=lambda v: np.sum(v, axis=0)
+    @staticmethod
+    def combine(series, join):
+        times = np.unique(np.concatenate([np.asarray(s.times, dtype=float) for s in series]))
+        return ChangePointSeries.from_dense(times, join([s.at(times) for s in series]))
@@ -0,0 +1,122 @@
+import heapq
+import math
+
+from config import *
+
+"""
+[ISL Topology]: 위성 간 ISL 그래프와 all-pairs 라우팅 테이블 (next-hop, 경로 지연)
+    - ISL_TOPOLOGY: "full" (모든 위성 쌍 직접 연결, 기존 동작) / "hex" (육각 배치의 인접 위성) / "grid" (+Grid: 같은 행 좌우 + 인접 행의 최근접 위성)
+    - 라우팅 테이블은 생성 시 한 번 계산하고, add_link/remove_link로 topology가 바뀔 때만 다시 계산
+    - 다중 hop 전달: 경로 전체 지연을 테이블에서 조회하여 한 번에 전달 (중계 위성의 CPU 처리는 모델링하지 않음)
+                     next-hop 테이블을 따라가며 경로상 ISL(방향별) 부하 카운터 증가
+    - 위성은 모두 같은 속도로 이동하므로 상대 위치(= topology)는 시뮬레이션 동안 변하지 않음
+"""
+
+# 위성 간 ISL 목록 [(위성 ID, 위성 ID)] 생성
+def build_links(positions, kind=ISL_TOPOLOGY):
+    ids = list(positions)
+    if kind == "full":
+        return [(a, b) for i, a in enumerate(ids) for b in ids[i + 1:]]
+    if len(ids) < 2:
+        return []
+    spacing = min(math.dist(positions[a], positions[b]) for i, a in enumerate(ids) for b in ids[i + 1:])
+    if kind == "hex":
+        # 육각 배치: 인접 위성 간 거리 = 최소 위성 간 거리 (sqrt(3) * SATELLITE_R)
+        return [(a, b) for i, a in enumerate(ids) for b in ids[i + 1:] if math.dist(positions[a], positions[b]) <= spacing * 1.01]
+    if kind == "grid":
+        # +Grid: 같은 행(y) 안의 좌우 인접 위성 + 위/아래 인접 행에서 x가 가장 가까운 위성
+        rows = {}
+        for sat_id in ids:
+            rows.setdefault(round(positions[sat_id][1], 3), []).append(sat_id)
+        row_keys = sorted(rows)
+        links = set()
+        for r, y in enumerate(row_keys):
+            row = sorted(rows[y], key=lambda sat_id: positions[sat_id][0])
+            links.update(zip(row, row[1:]))
+            if r + 1 < len(row_keys):
+                upper = rows[row_keys[r + 1]]
+                for sat_id in row:
+                    nearest = min(upper, key=lambda other: abs(positions[other][0] - positions[sat_id][0]))
+                    links.add((sat_id, nearest))
+        return sorted(links)
+    raise ValueError(f"Unknown ISL topology: {kind}")
+
+
+class ISLTopology:
+    def __init__(self, positions=POS_SATELLITES, kind=ISL_TOPOLOGY, hop_delay=SATELLITE_SATELLITE_DELAY):
+        self.kind = kind
+        self.hop_delay = hop_delay
+        self.ids = list(positions)
+        self.index = {sat_id: i for i, sat_id in enumerate(self.ids)} # 위성 ID → 테이블 index
+        self.neighbors = [{} for _ in self.ids] # index → {인접 index: ISL 지연}
+        self.load = {} # (송신 위성 ID, 수신 위성 ID) → ISL을 지난 메시지 수
+        for a, b in build_links(positions, kind):
+            self.add_link(a, b, recompute=False)
+        self.compute()
+
+    # ==================== Topology 변경 ======================
+    def add_link(self, a, b, delay=None, recompute=True):
+        i, j = self.index[a], self.index[b]
+        delay = self.hop_delay if delay is None else delay
+        self.neighbors[i][j] = delay
+        self.neighbors[j][i] = delay
+        self.load.setdefault((a, b), 0)
+        self.load.setdefault((b, a), 0)
+        if recompute:
+            self.compute()
+
+    def remove_link(self, a, b, recompute=True):
+        i, j = self.index[a], self.index[b]
+        self.neighbors[i].pop(j, None)
+        self.neighbors[j].pop(i, None)
+        if recompute:
+            self.compute()
+
+    # all-pairs 라우팅 테이블: 위성마다 Dijkstra (delay[i][j]: 경로 지연, next_hop[i][j]: i에서 j로 가는 첫 hop, 도달 불가 = inf / -1)
+    def compute(self):
+        n = len(self.ids)
+        self.delay = []
+        self.next_hop = []
+        self.hops = []
+        for source in range(n):
+            delay = [math.inf] * n
+            first = [-1] * n
+            hops = [0] * n
+            delay[source] = 0
+            first[source] = source
+            heap = [(0, 0, source)]
+            while heap:
+                d, h, i = heapq.heappop(heap)
+                if d > delay[i]:
+                    continue
+                for j, w in self.neighbors[i].items():
+                    if d + w < delay[j]:
+                        delay[j] = d + w
+                        hops[j] = h + 1
+                        first[j] = j if i == source else first[i]
+                        heapq.heappush(heap, (d + w, h + 1, j))
+            self.delay.append(delay)
+            self.next_hop.append(first)
+            self.hops.append(hops)
+
+    # ==================== Routing ======================
+    # src → dst 경로 지연 (도달 불가면 None), 경로상 ISL 부하 카운터 증가
+    def route(self, src, dst):
+        i, j = self.index[src], self.index[dst]
+        delay = self.delay[i][j]
+        if delay == math.inf:
+            return None
+        while i != j:
+            k = self.next_hop[i][j]
+            self.load[(self.ids[i], self.ids[k])] += 1
+            i = k
+        return delay
+
+    def max_hops(self):
+        return max((h for row in self.hops for h in row), default=0)
+
+    def summary(self):
+        n_links = sum(len(neighbors) for neighbors in self.neighbors) // 2
+        busiest = max(self.load.items(), key=lambda item: item[1], default=((None, None), 0))
+        return (f"ISL topology {self.kind}: {len(self.ids)} satellites, {n_links} links, max {self.max_hops()} hops, "
+                f"busiest ISL {busiest[0][0]}->{busiest[0][1]} ({busiest[1]} msgs)")
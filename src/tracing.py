@@ -0,0 +1,103 @@
+from config import *
+
+"""
+[MessageTracer]: 위성이 받은 메시지의 lifecycle 추적 (MESSAGE_TRACE = True)
+    - 메시지별 시각: 송신(send) → messageQ 도착(arrival) → 수락/drop(admission) → CPU 할당(grant) → 처리 완료(complete)
+    - 구간별 지연을 (위성, task)마다 고정 폭 히스토그램에 바로 누적 (메시지별 기록을 보관하지 않으므로 sweep에서도 켜둘 수 있음)
+        propagation: arrival - send (link 지연 + jitter)
+        queueing:    grant - arrival (messageQ 대기 + CPU 대기, SATELLITE_CPU 병목 시 증가)
+        service:     complete - grant (handler 처리 시간)
+    - 히스토그램: TRACE_BIN_WIDTH(ms) 폭 TRACE_BINS개 bin, 마지막 bin은 overflow (합/최댓값은 정확히 유지)
+"""
+
+PHASES = ("propagation", "queueing", "service")
+
+
+class LatencyHistogram:
+    def __init__(self, bin_width=TRACE_BIN_WIDTH, bins=TRACE_BINS):
+        self.bin_width = bin_width
+        self.counts = [0] * bins
+        self.n = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        index = int(value / self.bin_width)
+        self.counts[min(index, len(self.counts) - 1)] += 1
+        self.n += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.n += other.n
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def mean(self):
+        return self.total / self.n if self.n else 0.0
+
+    # q 분위수 (bin 상한 기준, overflow bin이면 최댓값)
+    def quantile(self, q):
+        if not self.n:
+            return 0.0
+        rank = q * self.n
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.max if index == len(self.counts) - 1 else min((index + 1) * self.bin_width, self.max)
+        return self.max
+
+
+class MessageTracer:
+    def __init__(self, bin_width=TRACE_BIN_WIDTH, bins=TRACE_BINS):
+        self.bin_width = bin_width
+        self.bins = bins
+        self.histograms = {} # (위성 ID, task) → {phase: LatencyHistogram}
+        self.drops = {} # (위성 ID, task) → drop 수
+
+    def _histograms(self, node, task):
+        key = (node, task)
+        histograms = self.histograms.get(key)
+        if histograms is None:
+            histograms = self.histograms[key] = {phase: LatencyHistogram(self.bin_width, self.bins) for phase in PHASES}
+        return histograms
+
+    # CPU 처리 완료 시 호출: 메시지 하나의 구간별 지연 누적
+    def record(self, node, task, sent, arrived, granted, completed):
+        histograms = self._histograms(node, task)
+        histograms["propagation"].add(arrived - sent)
+        histograms["queueing"].add(granted - arrived)
+        histograms["service"].add(completed - granted)
+
+    def drop(self, node, task):
+        self.drops[(node, task)] = self.drops.get((node, task), 0) + 1
+
+    # PDES: partition별 tracer 합산
+    def merge(self, other):
+        for (node, task), histograms in other.histograms.items():
+            for phase, histogram in histograms.items():
+                self._histograms(node, task)[phase].merge(histogram)
+        for key, count in other.drops.items():
+            self.drops[key] = self.drops.get(key, 0) + count
+
+    # 위성 전체를 합친 task별 히스토그램 {task: {phase: LatencyHistogram}}
+    def by_task(self):
+        tasks = {}
+        for (node, task), histograms in self.histograms.items():
+            merged = tasks.setdefault(task, {phase: LatencyHistogram(self.bin_width, self.bins) for phase in PHASES})
+            for phase, histogram in histograms.items():
+                merged[phase].merge(histogram)
+        return dict(sorted(tasks.items()))
+
+    def summary(self):
+        lines = []
+        drops = {}
+        for (node, task), count in self.drops.items():
+            drops[task] = drops.get(task, 0) + count
+        for task, histograms in self.by_task().items():
+            phases = ", ".join(f"{phase} mean {h.mean():.3f} p95 {h.quantile(0.95):.3f} max {h.max:.3f}" for phase, h in histograms.items())
+            lines.append(f"{Task(task).name}: {histograms['service'].n} processed, {drops.get(task, 0)} dropped | {phases} (ms)")
+        return "\n".join(lines)
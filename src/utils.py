@@ -5,7 +5,20 @@ import math
 import matplotlib.pyplot as plt
 from matplotlib.patches import Circle
 
-import pickle
+import export
+from timeseries import ChangePointSeries
+
+# 기본 카운터 이름 → DataCollection 시계열 속성
+COUNTER_SERIES = {
+    "total_messages": "cumulative_total_messages",
+    "message_from_UE_measurement": "cumulative_message_from_UE_measurement",
+    "message_from_UE_retransmit": "cumulative_message_from_UE_retransmit",
+    "message_from_UE_RA": "cumulative_message_from_UE_RA",
+    "message_from_satellite": "cumulative_message_from_satellite",
+    "message_dropped": "cumulative_message_from_dropped",
+    "message_from_AMF": "cumulative_message_from_AMF",
+}
+
 
 class DataCollection:
     def __init__(self, graph_path):
@@ -23,8 +36,56 @@ class DataCollection:
 
         self.cumulative_message_from_dropped = {}
 
+        # 위성/UE 통계는 변경 시점(ChangePointSeries)으로 기록, 위 dense 시계열(data.x 시점)은 expand()에서 생성 (그래프/CSV)
+        self.counter_series = ChangePointSeries() # 실행 중 MessageCounters 배열 (등록 순서 행/열), finalize_stats에서 counters로 정리
+        self.counters = None # (위성 × 카운터) 변경 시점 series, counter_sat_ids / counter_names 순서
+        self.counter_sat_ids = []
+        self.counter_names = []
+        self.queue = None # 위성별 CPU 대기 길이 (위성 벡터) 변경 시점 series, queue_sat_ids 순서
+        self.queue_sat_ids = []
+        self.waiting = ChangePointSeries() # RRC configuration 대기 UE 수
+        self.ue_states = ChangePointSeries() # 상태별 UE 수 (census.UE_STATES 순서)
+        self.expanded = False
+
         self.UE_time_stamp = {}
         self.UE_positions = {}
+        self.handovers = None # HandoverEvents (핸드오버 시도별 typed arrays, kpi.py 입력)
+
+    # Fast-forward 정지 구간: 건너뛴 시점(times)은 값이 변하지 않으므로 샘플 시점만 추가 (변경 시점 series는 그대로)
+    def backfill(self, times):
+        self.x.extend(times)
+
+    # 카운터 series (위성 × 카운터 배열) 저장
+    def set_counters(self, sat_ids, names, counters):
+        self.counter_sat_ids = list(sat_ids)
+        self.counter_names = list(names)
+        self.counters = counters
+        self.counter_series = ChangePointSeries()
+        self.expanded = False
+
+    # CPU 대기 길이 series (위성 벡터) 저장
+    def set_queue(self, sat_ids, queue):
+        self.queue_sat_ids = list(sat_ids)
+        self.queue = queue
+        self.expanded = False
+
+    # 변경 시점 series → data.x 시점 dense 시계열 (기존 numberUnProcessedMessages / numberUEWaitingResponse / cumulative_* 형식)
+    def expand(self):
+        if self.expanded:
+            return
+        self.expanded = True
+        if self.queue is not None:
+            queue = self.queue.at(self.x)
+            self.numberUnProcessedMessages = {sat_id: queue[:, i].tolist() for i, sat_id in enumerate(self.queue_sat_ids)}
+        if len(self.waiting):
+            self.numberUEWaitingResponse = self.waiting.at(self.x).tolist()
+        if self.counters is not None:
+            counters = self.counters.at(self.x)
+            for name, attribute in COUNTER_SERIES.items():
+                if name not in self.counter_names:
+                    continue
+                column = self.counter_names.index(name)
+                setattr(self, attribute, {sat_id: counters[:, i, column].tolist() for i, sat_id in enumerate(self.counter_sat_ids)})
 
     def read_UEs(self, UEs):
         for id in UEs:
@@ -36,6 +97,7 @@ class DataCollection:
         # 데이터가 없는 경우 실행하지 않음
         if not self.x:
             return
+        self.expand()
 
         # 헤더 생성
         header = ['Time (ms)']
@@ -74,6 +136,7 @@ class DataCollection:
                 writer.writerow(row)
 
     def draw(self):
+        self.expand()
         # plot
         for id in self.numberUnProcessedMessages:
             plt.close('all')
@@ -174,8 +237,13 @@ class DataCollection:
         plt.title('number of UEs waiting for response')
         plt.savefig(self.draw_path + '/numberUEwaitingforRRC.png')
 
-        with open(self.draw_path + 'data_object.pkl', 'wb') as outp:
-            pickle.dump(self, outp, pickle.HIGHEST_PROTOCOL)
+        # 결과 export (graph_data/run_data: 배열 + meta.json, export.RunData / DataCollection.load로 로드)
+        export.export_run(self, self.draw_path + '/run_data')
+
+    # export_run 결과 디렉토리에서 DataCollection 복원
+    @staticmethod
+    def load(path):
+        return export.RunData(path).load_collection(DataCollection)
 
 
 # The number of devices requiring handover
@@ -0,0 +1,537 @@
+import math
+
+import numpy as np
+from scipy.special import jv
+
+from config import *
+from topology import ISLTopology
+from counters import MESSAGE_COUNTERS, MessageCounters
+from handover import HandoverEvents, HandoverRecorder
+from timeseries import ChangePointSeries
+from census import UE_STATES
+
+"""
+[VectorizedEngine]: 대규모 UE 용량 분석을 위한 time-stepped 엔진 (ENGINE = "vectorized")
+    - 모든 UE/위성을 VECTOR_STEP(ms) 단위로 동시에 진행, UE/위성 상태는 numpy 배열로 관리
+    - UE 측: GEOMETRY_MONITOR(채널/SINR), ACTION_MONITOR(A3 → MR, 재전송, RACH, 연결 종료)를 배열 연산으로 처리
+        GEOMETRY_PHASE: step마다 갱신 시점(위상)이 된 UE만 채널/SINR 계산 (phases, scenario.geometry_phases)
+    - 메시지: MR → HO REQUEST → ACK → HO COMMAND → RACH → UL GRANT → RRC RECONF COMPLETE → PATH SHIFT → AMF RESPONSE
+              전송 시각 + 지연 + jitter로 delay line(도착 step별 ring buffer)에 저장
+    - 위성/AMF CPU: 우선순위(1: 위성/RA/AMF, 2: MR/재전송) 대기열을 노드별 누적 작업량으로 근사한 C-server list scheduling
+                    (메시지 단위 generator 없이 노드별 cumsum으로 처리), QUEUED_SIZE 초과 MR/재전송은 drop
+    - 결과는 main.py와 동일한 utils.DataCollection 형식으로 채움 (x, 위성별 카운터/대기열, 대기 UE 수, UE timestamps)
+
+[SimPy 엔진 대비 근사]
+    - 위성 CPU 처리 시작/종료 시각은 C-server 근사 (메시지가 적을 때는 정확, 포화 시 평균적으로 일치)
+    - connected(UE) 확인은 도착 시 처리시간 결정, 처리 종료 시 후속 메시지 전송 여부 결정에 사용
+    - 난수(shadowing, jitter, 재전송 target 선택)는 numpy Generator를 사용하므로 SimPy 실행과 같은 난수열은 아님
+"""
+
+# UE 상태 코드 (config.py의 상태 문자열과 대응)
+S_ACTIVE, S_WAITING_CONFIG, S_CONFIGURED, S_WAITING_ULGRANT, S_INACTIVE = range(len(UE_STATES))
+
+# 메시지 task 코드 (config.Task 값, SimPy 엔진 메시지와 같은 코드)
+(T_MR, T_RETRANS, T_HO_REQUEST, T_HO_ACK, T_HO_COMMAND,
+ T_RACH, T_ULGRANT, T_RECONF_COMPLETE, T_PATH_SHIFT, T_AMF_RESPONSE) = (int(task) for task in (
+    MEASUREMENT_REPORT, RETRANSMISSION, HANDOVER_REQUEST, HANDOVER_REQUEST_ACKNOWLEDGE, HO_COMMAND,
+    RRC_RANDOM_ACCESS, RRC_ULGRANT, RRC_RECONFIGURATION_COMPLETE, PATH_SHIFT_REQUEST, AMF_RESPONSE))
+TASK_PROCESSING_TIME = np.array([PROCESSING_TIME.get(task, 0) for task in Task]) # task code → CPU 처리시간 (ms)
+
+# 메시지 목적지 종류
+TO_SATELLITE, TO_UE, TO_AMF = range(3)
+
+# UE timestamps 기록 종류 (UE.timestamps와 동일 의미)
+EV_MEASUREMENT, EV_RETRANSMIT, EV_CONFIGURED, EV_COMPLETED = range(4)
+
+# 위성 handle_messages의 카운터 분류 (MessageCounters 기본 카운터 열 index)
+C_MEASUREMENT, C_RETRANSMIT, C_RA, C_SATELLITE, C_AMF, C_DROPPED, C_TOTAL = (MESSAGE_COUNTERS.index(name) for name in (
+    "message_from_UE_measurement", "message_from_UE_retransmit", "message_from_UE_RA",
+    "message_from_satellite", "message_from_AMF", "message_dropped", "total_messages"))
+TASK_COUNTER = {T_MR: C_MEASUREMENT, T_RETRANS: C_RETRANSMIT, T_HO_REQUEST: C_SATELLITE, T_HO_ACK: C_SATELLITE,
+                T_RACH: C_RA, T_RECONF_COMPLETE: C_RA, T_AMF_RESPONSE: C_AMF}
+
+FIELDS = ("time", "dest", "node", "task", "ue", "src", "aux")
+
+
+# 메시지 묶음 (열 단위 numpy 배열)
+class Messages:
+    def __init__(self, **columns):
+        n = len(columns["time"])
+        self.time = np.asarray(columns["time"], dtype=float)
+        for name in FIELDS[1:]:
+            value = columns.get(name, -1)
+            if np.ndim(value) == 0:
+                self.__dict__[name] = np.full(n, value, dtype=np.int64)
+            else:
+                self.__dict__[name] = np.asarray(value, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.time)
+
+    # 열 배열을 그대로 사용하는 생성 (select/concat 경로, 변환/복사 없음)
+    @staticmethod
+    def _wrap(columns):
+        msgs = Messages.__new__(Messages)
+        msgs.__dict__.update(columns)
+        return msgs
+
+    def select(self, index):
+        return Messages._wrap({name: self.__dict__[name][index] for name in FIELDS})
+
+    @staticmethod
+    def concat(batches):
+        batches = [b for b in batches if len(b)]
+        if not batches:
+            return EMPTY
+        if len(batches) == 1:
+            return batches[0]
+        return Messages._wrap({name: np.concatenate([b.__dict__[name] for b in batches]) for name in FIELDS})
+
+
+EMPTY = Messages(time=[])
+
+
+# 위성/AMF CPU 대기열 (우선순위 + C-server 근사)
+class CpuPool:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.msgs = EMPTY
+        self.prio = np.zeros(0, dtype=np.int64)
+        self.work = np.zeros(0) # 남은 처리시간 (ms)
+        self.started = np.zeros(0, dtype=bool)
+
+    def __len__(self):
+        return len(self.msgs)
+
+    def add(self, msgs, prio, work):
+        if not len(msgs):
+            return
+        self.msgs = Messages.concat([self.msgs, msgs])
+        self.prio = np.concatenate([self.prio, prio])
+        self.work = np.concatenate([self.work, work])
+        self.started = np.concatenate([self.started, np.zeros(len(msgs), dtype=bool)])
+
+    # 노드별 시스템 내 메시지 수 (처리 중 + 대기)
+    def occupancy(self, n_nodes):
+        return np.bincount(self.msgs.node, minlength=n_nodes)
+
+    # 노드별 대기(CPU 미할당) 메시지 수: len(cpus.queue)에 대응
+    def waiting(self, n_nodes):
+        return np.bincount(self.msgs.node[~self.started], minlength=n_nodes)
+
+    # [t, t_end) 동안 처리: 완료된 메시지와 완료 시각 반환
+    def serve(self, t, t_end):
+        if not len(self.msgs):
+            return EMPTY, np.zeros(0)
+        node = self.msgs.node
+        order = np.lexsort((self.msgs.time, self.prio, ~self.started, node)) # 노드별: 처리 중 → 우선순위 → 도착순
+        node_s = node[order]
+        work_s = self.work[order]
+        first = np.r_[True, node_s[1:] != node_s[:-1]]
+        group_start = np.maximum.accumulate(np.where(first, np.arange(len(order)), 0))
+        rank = np.arange(len(order)) - group_start
+        before = np.cumsum(work_s) - work_s
+        before -= before[group_start] # 같은 노드에서 앞선 메시지들의 누적 작업량
+
+        arrival = np.maximum(self.msgs.time[order], t)
+        start = np.where(rank < self.capacity, arrival, np.maximum(arrival, t + before / self.capacity))
+        finish = start + work_s
+        done = finish <= t_end
+        running = ~done & (start < t_end)
+
+        work_left = work_s.copy()
+        work_left[running] -= t_end - start[running]
+        keep = order[~done]
+        self.work = work_left[~done]
+        self.started = (self.started[order] | running)[~done]
+        self.prio = self.prio[keep]
+        completed = self.msgs.select(order[done])
+        self.msgs = self.msgs.select(keep)
+        return completed, finish[done]
+
+
+class VectorizedEngine:
+    def __init__(self, positions, satellite_ground_delay=SATELLITE_GROUND_DELAY, step=VECTOR_STEP, seed=SEED, phases=None, satellite_cpu=SATELLITE_CPU):
+        self.rng = np.random.default_rng(seed)
+        self.step = step
+        self.ground_delay = satellite_ground_delay
+
+        # 위성 (index i ↔ POS_SATELLITES id)
+        self.sat_ids = np.array(list(POS_SATELLITES), dtype=np.int64)
+        self.sat_x0 = np.array([POS_SATELLITES[i][0] for i in self.sat_ids], dtype=float)
+        self.sat_y = np.array([POS_SATELLITES[i][1] for i in self.sat_ids], dtype=float)
+        n_sat = len(self.sat_ids)
+        # ISL 경로 지연 행렬 [송신 위성 index, 수신 위성 index] (ISL_TOPOLOGY 라우팅 테이블, 도달 불가 = inf)
+        self.isl_delay = np.array(ISLTopology(POS_SATELLITES, ISL_TOPOLOGY, SATELLITE_SATELLITE_DELAY).delay, dtype=float).reshape(n_sat, n_sat)
+
+        # UE
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        self.ue_x = positions[:, 0]
+        self.ue_y = positions[:, 1]
+        n_ue = len(positions)
+        self.phases = None if phases is None else np.asarray(phases, dtype=np.int64) # UE별 geometry 갱신 위상 (ms), None이면 모두 0
+        d2 = (self.ue_x[:, None] - self.sat_x0[None, :]) ** 2 + (self.ue_y[:, None] - self.sat_y[None, :]) ** 2
+        self.serving = np.argmin(d2, axis=1) if n_sat else np.full(n_ue, -1) # 초기 serving: 가장 가까운 위성
+        self.state = np.full(n_ue, S_ACTIVE, dtype=np.int8)
+        self.timer = np.zeros(n_ue)
+        self.retransmit_counter = np.zeros(n_ue, dtype=np.int64)
+        self.target = np.full(n_ue, -1, dtype=np.int64)
+        self.previous = np.full(n_ue, -1, dtype=np.int64)
+
+        # geometry_data_cache에 대응: 한번이라도 측정된 위성의 SINR (미측정 = NaN, 커버리지 이탈 후에도 마지막 값 유지)
+        self.sinr = np.full((n_ue, n_sat), np.nan)
+        self.a3 = np.zeros(n_ue, dtype=bool) # A3 조건 (cache 또는 serving 변경 시에만 갱신)
+        self.lost = np.zeros(n_ue, dtype=bool) # 연결 종료 조건
+        self.best = np.full(n_ue, -1, dtype=np.int64) # MR에 실릴 최고 SINR 이웃 위성
+
+        # 메시지 delay line: 도착 step별 ring buffer
+        reachable = self.isl_delay[np.isfinite(self.isl_delay)]
+        max_delay = max(satellite_ground_delay, reachable.max(initial=SATELLITE_SATELLITE_DELAY), CORE_DELAY) + 2
+        self.delay_line = [[] for _ in range(int(math.ceil(max_delay / step)) + 2)]
+        self.satellite_cpus = CpuPool(satellite_cpu)
+        self.amf_cpus = CpuPool(100) # AMF: simpy.Resource(env, 100)
+        self.counters = MessageCounters(self.sat_ids.tolist()) # 기본 카운터만 사용 (SimPy 위성의 우선순위별 수락/task별 drop 카운터는 없음)
+
+        # UE timestamps 기록 (ue, time, kind, from) - 종료 후 UE.timestamps 형식으로 조립
+        self.events = []
+        self.now = 0
+        self.steps = 0 # 실행한 step 수 (progress 보고용)
+
+    # ==================== Geometry / Channel ======================
+    def sat_x(self, increments):
+        return self.sat_x0 + increments * (SATELLITE_V / 1000)
+
+    def covered(self, sat_x, ue=slice(None), sat=None):
+        if sat is None:
+            dx = self.ue_x[ue, None] - sat_x[None, :]
+            dy = self.ue_y[ue, None] - self.sat_y[None, :]
+        else:
+            dx = self.ue_x[ue] - sat_x[sat]
+            dy = self.ue_y[ue] - self.sat_y[sat]
+        return np.sqrt(dx ** 2 + dy ** 2) <= 1.5 * SATELLITE_R
+
+    # UE.GEOMETRY_MONITOR + calculate_rsrp + _calculate_sinr (ue: 갱신 대상 UE, 기본 모든 UE x 커버 위성)
+    def update_geometry(self, sat_x, ue=slice(None)):
+        dx = self.ue_x[ue, None] - sat_x[None, :]
+        dy = self.ue_y[ue, None] - self.sat_y[None, :]
+        horizontal = np.sqrt(dx ** 2 + dy ** 2)
+        covered = horizontal <= 1.5 * SATELLITE_R
+        dz = SC9_HANDHELD_ALTITUDE - SC9_SATELLITE_ALTITUDE
+        slant = np.sqrt(horizontal ** 2 + dz ** 2)
+
+        arg = (SC9_SATELLITE_ALTITUDE ** 2 + 2 * SC9_SATELLITE_ALTITUDE * EARTH_RADIUS - slant ** 2) / (2 * slant * EARTH_RADIUS)
+        elevation = np.degrees(np.arcsin(np.clip(arg, -1.0, 1.0)))
+        antenna = np.degrees(np.arctan2(horizontal, abs(dz)))
+
+        # Path loss: FSPL + LoS 확률 가중 shadowing/clutter (UE._calculate_basic_path_loss)
+        fspl = 20 * np.log10(SC9_CARRIER_FREQUENCY_HZ) + 20 * np.log10(slant) + 20 * math.log10(4 * math.pi / LIGHT_SPEED)
+        idx = np.clip(np.round(elevation / 10).astype(np.int64) - 1, 0, 8)
+        los_prob = np.asarray(RURAL_LOS_PROB)[idx]
+        los_loss = np.asarray(RURAL_LOS_SHADOW_STD)[idx] * self.rng.standard_normal(idx.shape)
+        nlos_loss = np.asarray(RURAL_NLOS_SHADOW_STD)[idx] * self.rng.standard_normal(idx.shape) + np.asarray(RURAL_NLOS_CLUTTER_LOSS)[idx]
+        path_loss = los_prob / 100 * (fspl + los_loss) + (100 - los_prob) / 100 * (fspl + nlos_loss)
+
+        # Antenna gain (UE._calculate_antenna_gain)
+        ka = 2 * math.pi * SC9_CARRIER_FREQUENCY_HZ / LIGHT_SPEED * SC9_SATELLITE_ANTENNA_APERTURE / 2
+        z = ka * np.sin(np.radians(antenna))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gain = np.where(antenna == 0, SC9_SATELLITE_TXGAIN,
+                            10 * np.log10(4 * np.abs(jv(1, z) / z) ** 2) + SC9_SATELLITE_TXGAIN)
+
+        tx_power_per_rb = SC9_SATELLITE_TXPW_dBm - 10 * math.log10(NUM_RESOURCE_BLOCKS)
+        rsrp = tx_power_per_rb + gain + SC9_HANDHELD_RXGAIN - path_loss - 10 * math.log10(REFERENCE_SIGNAL_FACTOR)
+
+        # SINR: 간섭 = 같은 시점에 커버된 다른 위성들의 RSRP 합
+        rsrp_mw = np.where(covered, 10 ** (rsrp / 10), 0.0)
+        noise_dbm = THERMAL_NOISE_DENSITY + 10 * math.log10(SC9_RB_BANDWIDTH_HZ) + SC9_HANDHELD_NOISE_FIGURE
+        interference = rsrp_mw.sum(axis=1, keepdims=True) - rsrp_mw
+        with np.errstate(divide='ignore'):
+            sinr = 10 * np.log10(rsrp_mw / (interference + 10 ** (noise_dbm / 10)))
+        self.sinr[ue] = np.where(covered, sinr, self.sinr[ue])
+        self.refresh_triggers(ue)
+
+    # cache 또는 serving이 바뀐 UE들의 A3/연결 종료 조건 재계산 (UE.send_request_condition_A3, ACTION_MONITOR)
+    def refresh_triggers(self, ue=slice(None)):
+        sinr = self.sinr[ue]
+        serving = self.serving[ue]
+        rows = np.arange(len(serving))
+        has_serving = serving >= 0
+        serving_sinr = np.where(has_serving, sinr[rows, np.maximum(serving, 0)], np.nan)
+        neighbors = sinr.copy()
+        neighbors[rows[has_serving], serving[has_serving]] = np.nan
+        measured = ~np.isnan(neighbors)
+        filled = np.where(measured, neighbors, -np.inf)
+        best_sinr = filled.max(axis=1) if filled.shape[1] else np.full(len(rows), -np.inf)
+        cached = has_serving & ~np.isnan(serving_sinr)
+
+        self.best[ue] = np.where(measured.any(axis=1), filled.argmax(axis=1) if filled.shape[1] else -1, -1)
+        self.a3[ue] = cached & (best_sinr > serving_sinr + A3_OFFSET)
+        self.lost[ue] = cached & (serving_sinr <= THRESHOLD_Q_OUT) & np.all(~measured | (neighbors < THRESHOLD_Q_IN), axis=1)
+
+    # ==================== Messages ======================
+    def send(self, time, delay, **columns):
+        time = np.asarray(time, dtype=float)
+        if not time.size:
+            return
+        arrival = time + delay + self.rng.random(time.size) / 1000 # Base.send_message와 동일 jitter
+        arrival = np.maximum(arrival, self.now + self.step) # step보다 짧은 지연은 다음 step으로
+        msgs = Messages(time=arrival, **columns)
+        slot = (arrival // self.step).astype(np.int64) % len(self.delay_line)
+        for s in np.unique(slot):
+            self.delay_line[s].append(msgs.select(slot == s))
+
+    def record(self, ue, time, kind, source=-1):
+        ue = np.asarray(ue, dtype=np.int64)
+        if ue.size:
+            self.events.append((ue, np.broadcast_to(time, ue.shape).astype(float), np.full(ue.size, kind),
+                                np.broadcast_to(source, ue.shape).astype(np.int64)))
+
+    # UE.ACTION_MONITOR (시각 t, 위성 위치 sat_x)
+    def action_monitor(self, t, sat_x):
+        # --- ACTION: Send Measurement Report ---
+        mr = np.flatnonzero((self.state == S_ACTIVE) & self.a3 & (self.best >= 0))
+        if mr.size:
+            self.send(np.full(mr.size, t), self.ground_delay, dest=TO_SATELLITE, node=self.serving[mr],
+                      task=T_MR, ue=mr, src=-1, aux=self.best[mr])
+            self.record(mr, t, EV_MEASUREMENT, self.sat_ids[self.serving[mr]])
+            self.timer[mr] = t
+            self.state[mr] = S_WAITING_CONFIG
+
+        # --- ACTION: Trigger retransmission ---
+        if RETRANSMIT:
+            rt = np.flatnonzero((self.state == S_WAITING_CONFIG) & (t - self.timer > RETRANSMIT_THRESHOLD)
+                                & (self.retransmit_counter < MAX_RETRANSMIT))
+            if rt.size:
+                self.timer[rt] = t
+                self.record(rt, t, EV_RETRANSMIT)
+                candidates = self.covered(sat_x, rt)
+                candidates[np.arange(rt.size), self.serving[rt]] = False
+                has = candidates.any(axis=1)
+                # 후보 중 하나를 무작위 선택 (Satellite: random.choice(candidates))
+                choice = np.argmax(np.where(candidates, self.rng.random(candidates.shape), -1), axis=1)
+                rt, choice = rt[has], choice[has]
+                self.send(np.full(rt.size, t), self.ground_delay, dest=TO_SATELLITE, node=self.serving[rt],
+                          task=T_RETRANS, ue=rt, src=-1, aux=choice)
+                self.retransmit_counter[rt] += 1
+
+        # --- ACTION: RANDOM ACCESS Procedure ---
+        ra = np.flatnonzero(self.state == S_CONFIGURED)
+        if ra.size:
+            ra = ra[(self.target[ra] >= 0) & self.covered(sat_x, ra, self.target[ra])]
+            self.send(np.full(ra.size, t), self.ground_delay, dest=TO_SATELLITE, node=self.target[ra],
+                      task=T_RACH, ue=ra, src=-1)
+            self.state[ra] = S_WAITING_ULGRANT
+
+        # --- 연결 종료 ---
+        lost = np.flatnonzero((self.state == S_ACTIVE) & self.lost)
+        if lost.size:
+            self.serving[lost] = -1
+            self.state[lost] = S_INACTIVE
+            self.a3[lost] = False
+            self.lost[lost] = False
+
+    # UE.cpu_processing (UE 수신 메시지는 처리시간 없음)
+    def deliver_to_UEs(self, msgs, sat_x):
+        if not len(msgs):
+            return
+        for task in (T_HO_COMMAND, T_ULGRANT):
+            batch = msgs.select(msgs.task == task)
+            if not len(batch):
+                continue
+            order = np.argsort(batch.time, kind='stable')
+            ue, first = np.unique(batch.ue[order], return_index=True) # 같은 step 중복 수신은 첫 메시지만 유효
+            pick = order[first]
+            ue, src, time = batch.ue[pick], batch.src[pick], batch.time[pick]
+
+            if task == T_HO_COMMAND:
+                ok = (self.state[ue] == S_WAITING_CONFIG) & (src == self.serving[ue])
+                ue, time, target = ue[ok], time[ok], batch.aux[pick][ok]
+                self.target[ue] = target
+                self.state[ue] = S_CONFIGURED
+                self.previous[ue] = self.serving[ue]
+                self.retransmit_counter[ue] = 0
+                self.record(ue, time, EV_CONFIGURED, self.sat_ids[target])
+            else:
+                ok = self.covered(sat_x, ue, src)
+                ue, src, time = ue[ok], src[ok], time[ok]
+                self.serving[ue] = src
+                self.state[ue] = S_ACTIVE
+                self.record(ue, time, EV_COMPLETED)
+                self.refresh_triggers(ue)
+                self.send(time, self.ground_delay, dest=TO_SATELLITE, node=src, task=T_RECONF_COMPLETE,
+                          ue=ue, src=-1, aux=self.previous[ue])
+
+    # Satellite.handle_messages: 카운터, QUEUED_SIZE 기반 drop, CPU 대기열 등록
+    def deliver_to_satellites(self, msgs):
+        if not len(msgs):
+            return
+        n_sat = len(self.sat_ids)
+        for task, counter in TASK_COUNTER.items():
+            node = msgs.node[msgs.task == task]
+            self.counters.values[:, counter] += np.bincount(node, minlength=n_sat)
+            self.counters.values[:, C_TOTAL] += np.bincount(node, minlength=n_sat)
+
+        # 도착 순서대로 대기열 길이 근사: max(0, 시스템 내 메시지 수 + 같은 step에서 먼저 도착한 메시지 수 - CPU 수)
+        order = np.lexsort((msgs.time, msgs.node))
+        msgs = msgs.select(order)
+        node = msgs.node
+        first = np.r_[True, node[1:] != node[:-1]] if len(node) else np.zeros(0, dtype=bool)
+        group_start = np.maximum.accumulate(np.where(first, np.arange(len(node)), 0)) if len(node) else node
+        ahead = np.arange(len(node)) - group_start
+        queued = np.maximum(0, self.satellite_cpus.occupancy(n_sat)[node] + ahead - self.satellite_cpus.capacity)
+        limited = (msgs.task == T_MR) | (msgs.task == T_RETRANS)
+        drop = limited & (queued >= QUEUED_SIZE)
+        self.counters.values[:, C_DROPPED] += np.bincount(node[drop], minlength=n_sat)
+
+        msgs = msgs.select(~drop)
+        limited = limited[~drop]
+        connected = self.serving[msgs.ue] == msgs.node
+        work = TASK_PROCESSING_TIME[msgs.task]
+        work = np.where(msgs.task == T_MR, 1.0, work) # Satellite.cpu_processing: MR 처리 1ms 가정
+        needs_connection = limited | (msgs.task == T_HO_ACK)
+        work = np.where(needs_connection & ~connected, 0.0, work)
+        self.satellite_cpus.add(msgs, np.where(limited, 2, 1), work)
+
+    # Satellite.cpu_processing 완료 처리: 후속 메시지 전송
+    def complete_satellite(self, msgs, finish):
+        connected = self.serving[msgs.ue] == msgs.node
+        # MR/재전송: 서빙 위성이 target 위성에게 HO REQUEST (ISL)
+        req = ((msgs.task == T_MR) | (msgs.task == T_RETRANS)) & connected & (msgs.aux >= 0)
+        req[req] = np.isfinite(self.isl_delay[msgs.node[req], msgs.aux[req]]) # ISL 경로가 없으면 drop
+        self.send(finish[req], self.isl_delay[msgs.node[req], msgs.aux[req]], dest=TO_SATELLITE, node=msgs.aux[req],
+                  task=T_HO_REQUEST, ue=msgs.ue[req], src=msgs.node[req])
+        # HO REQUEST: target 위성이 ACK 응답
+        ack = msgs.task == T_HO_REQUEST
+        self.send(finish[ack], self.isl_delay[msgs.node[ack], msgs.src[ack]], dest=TO_SATELLITE, node=msgs.src[ack],
+                  task=T_HO_ACK, ue=msgs.ue[ack], src=msgs.node[ack])
+        # ACK: 서빙 위성이 UE에게 HO COMMAND (targets = [ACK 발신 위성])
+        cmd = (msgs.task == T_HO_ACK) & connected
+        self.send(finish[cmd], self.ground_delay, dest=TO_UE, node=msgs.ue[cmd], task=T_HO_COMMAND,
+                  ue=msgs.ue[cmd], src=msgs.node[cmd], aux=msgs.src[cmd])
+        # RACH: UL GRANT
+        grant = msgs.task == T_RACH
+        self.send(finish[grant], self.ground_delay, dest=TO_UE, node=msgs.ue[grant], task=T_ULGRANT,
+                  ue=msgs.ue[grant], src=msgs.node[grant])
+        # RRC RECONFIGURATION COMPLETE: AMF에게 PATH SHIFT REQUEST
+        path = msgs.task == T_RECONF_COMPLETE
+        self.send(finish[path], CORE_DELAY, dest=TO_AMF, node=0, task=T_PATH_SHIFT,
+                  ue=msgs.ue[path], src=msgs.node[path], aux=msgs.aux[path])
+
+    # AMF.cpu_processing 완료: 새 위성과 이전 위성에 AMF RESPONSE
+    def complete_amf(self, msgs, finish):
+        for node in (msgs.src, msgs.aux):
+            valid = node >= 0
+            self.send(finish[valid], CORE_DELAY, dest=TO_SATELLITE, node=node[valid], task=T_AMF_RESPONSE,
+                      ue=msgs.ue[valid], src=-1)
+
+    # ==================== Main Loop ======================
+    def run(self, until, data, screenshot=None, progress=None):
+        """
+        Args:
+            until: 시뮬레이션 종료 시각 (ms)
+            data: utils.DataCollection (main.py와 동일한 출력)
+            screenshot: (주기 ms, callback(t, engine)) 또는 None
+            progress: progress.ProgressReporter 또는 None
+        """
+        n_sat = len(self.sat_ids)
+        n_samples = int(until)
+        # stats: 변경 시점만 기록 (ChangePointSeries)
+        queue = ChangePointSeries()
+        counters = ChangePointSeries()
+        waiting = ChangePointSeries()
+        ue_states = ChangePointSeries()
+
+        t = 0
+        while t < until:
+            self.now = t
+            # 위성 위치: GEOMETRY_MONITOR는 같은 시점의 위성 위치 갱신 이전 값을 봄 (SimPy 이벤트 순서와 동일)
+            if self.phases is None:
+                if t % GEOMETRY_UPDATE_INTERVAL < self.step:
+                    self.update_geometry(self.sat_x(max(t - 1, 0)))
+            else:
+                due = np.flatnonzero((self.phases - t) % GEOMETRY_UPDATE_INTERVAL < self.step) # 위상 + n * 주기가 [t, t + step) 안
+                if len(due):
+                    self.update_geometry(self.sat_x(max(t - 1, 0)), due)
+            sat_x = self.sat_x(t)
+            if screenshot is not None and t % screenshot[0] < self.step:
+                screenshot[1](t, self)
+            self.action_monitor(t, sat_x)
+
+            # stats 샘플 (t ~ t+step-1: 같은 값)
+            queue.record(t, self.satellite_cpus.waiting(n_sat))
+            counters.record(t, self.counters.current())
+            ue_states.record(t, np.bincount(self.state, minlength=len(UE_STATES)))
+            waiting.record(t, ue_states.last()[S_WAITING_CONFIG])
+
+            # [t, t+step) 동안 도착하는 메시지 처리
+            slot = (t // self.step) % len(self.delay_line)
+            if self.delay_line[slot]:
+                arrivals = Messages.concat(self.delay_line[slot])
+                self.delay_line[slot] = []
+                self.deliver_to_UEs(arrivals.select(arrivals.dest == TO_UE), sat_x)
+                self.deliver_to_satellites(arrivals.select(arrivals.dest == TO_SATELLITE))
+                amf = arrivals.select(arrivals.dest == TO_AMF)
+                self.amf_cpus.add(amf, np.ones(len(amf), dtype=np.int64), np.full(len(amf), PROCESSING_TIME[PATH_SHIFT_REQUEST]))
+
+            if len(self.satellite_cpus):
+                self.complete_satellite(*self.satellite_cpus.serve(t, t + self.step))
+            if len(self.amf_cpus):
+                self.complete_amf(*self.amf_cpus.serve(t, t + self.step))
+            t += self.step
+            self.steps += 1
+            if progress is not None and progress.due():
+                progress.report(t, self.steps, "steps", self.progress_details())
+
+        self.fill(data, n_samples, queue, counters, waiting, ue_states)
+
+    # 진행 상황 지표 (main.py progress_details와 같은 항목)
+    def progress_details(self):
+        queues = self.satellite_cpus.waiting(len(self.sat_ids))
+        return {
+            'queue': f"{int(queues.sum())} (max {int(queues.max(initial=0))})",
+            'measurement reports': int(self.counters.values[:, C_MEASUREMENT].sum()),
+            'waiting UEs': int(np.count_nonzero(self.state == S_WAITING_CONFIG)),
+        }
+
+    # DataCollection 채우기 (main.py global_stats_collector_draw_final + read_UEs와 같은 형식)
+    def fill(self, data, n_samples, queue, counters, waiting, ue_states):
+        data.x = list(range(n_samples))
+        data.set_queue(self.sat_ids.tolist(), queue)
+        data.set_counters(self.sat_ids.tolist(), self.counters.names, counters)
+        data.waiting = waiting
+        data.ue_states = ue_states
+
+        for ue in range(len(self.ue_x)):
+            data.UE_time_stamp[ue + 1] = []
+            data.UE_positions[ue + 1] = (float(self.ue_x[ue]), float(self.ue_y[ue]))
+        if not self.events:
+            data.handovers = HandoverEvents()
+            return
+        ue, time, kind, source = (np.concatenate(column) for column in zip(*self.events))
+        order = np.argsort(ue, kind='stable') # 기록 순서 = 시간 순서
+        handovers = HandoverRecorder()
+        row = None
+        for u, t, k, s in zip(ue[order].tolist(), time[order].tolist(), kind[order].tolist(), source[order].tolist()):
+            timestamps = data.UE_time_stamp[u + 1]
+            t = int(t) if t == int(t) else t
+            if k == EV_MEASUREMENT:
+                timestamps.append({'timestamp': [t], 'from': s})
+                row = handovers.start(u + 1, s, t)
+            else:
+                timestamps[-1]['timestamp'].append(t)
+                if k == EV_CONFIGURED:
+                    timestamps[-1]['isSuccess'] = True
+                    handovers.command(row, s, t)
+                elif k == EV_RETRANSMIT:
+                    handovers.retransmit(row)
+                else:
+                    handovers.complete(row, t)
+        data.handovers = handovers.events()
+
+    # Screenshot용 상태별 UE 위치 (main.py global_stats_collector_draw_middle과 동일 분류)
+    def positions_by_state(self):
+        points = np.column_stack([self.ue_x, self.ue_y])
+        active = self.state == S_ACTIVE
+        inactive = self.state == S_INACTIVE
+        requesting = ~active & ~inactive
+        return [list(map(tuple, points[mask])) for mask in (inactive, active, requesting)]
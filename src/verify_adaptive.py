@@ -0,0 +1,75 @@
+import contextlib
+import io
+import random
+import sys
+import tempfile
+
+import simpy
+
+import scenario
+from config import *
+
+"""
+[Adaptive measurement 검증]: 같은 채널 realization에서 매 주기 측정과 adaptive 측정(adaptive.py)의 A3 trigger(MR 전송) 시각 비교
+    - reference run: 모든 UE가 GEOMETRY_UPDATE_INTERVAL마다 측정, channel trace record (임시 디렉토리)
+      candidate run: 같은 trace playback + AdaptiveMeasurement → 측정한 tick의 채널 값은 reference와 같고, 건너뛴 tick만 다름
+    - UE별 MR 시각을 순서대로 대응: candidate MR이 reference보다 GEOMETRY_UPDATE_INTERVAL 넘게 늦거나 대응 MR이 없으면 위반
+      (reference보다 많은 candidate MR도 위반으로 출력)
+    - 사용법: python3 src/verify_adaptive.py [NUMBER_UE DURATION ...]  (인자가 없으면 REFERENCE_SCENARIOS)
+"""
+
+REFERENCE_SCENARIOS = [(50, 3000), (200, 2000)] # (NUMBER_UE, DURATION)
+
+
+# 시나리오 1회 실행 후 UE별 MR 전송 시각 반환 (entity 로그 출력은 버림)
+def run_trace(number_ue, duration, channel_path, adaptive):
+    random.seed(SEED)
+    env = simpy.Environment()
+    with contextlib.redirect_stdout(io.StringIO()):
+        positions = scenario.generate_ue_positions(number_ue)
+        amf, satellites, UEs = scenario.build_entities(env, positions)
+        channel = scenario.attach_channel_trace(channel_path, "playback" if adaptive else "record", UEs, satellites, duration)
+        measurement = scenario.attach_adaptive_measurement(UEs) if adaptive else None
+        if FAST_FORWARD:
+            scenario.attach_fast_forward(env, amf, satellites, UEs, until=duration)
+        env.run(until=duration)
+        channel.close()
+    triggers = {ue_id: [record['timestamp'][0] for record in ue.timestamps] for ue_id, ue in UEs.items()}
+    return triggers, measurement
+
+
+def compare_triggers(reference, candidate, tolerance=GEOMETRY_UPDATE_INTERVAL):
+    violations = []
+    delays = []
+    for ue_id, times in reference.items():
+        other = candidate[ue_id]
+        for t, u in zip(times, other):
+            delays.append(u - t)
+            if u - t > tolerance:
+                violations.append(f"UE {ue_id}: MR at {t:.3f} delayed to {u:.3f}")
+        if len(times) > len(other):
+            violations.append(f"UE {ue_id}: MR at {times[len(other)]:.3f} missing ({len(times)} vs {len(other)} MRs)")
+        elif len(other) > len(times):
+            violations.append(f"UE {ue_id}: extra MR at {other[len(times)]:.3f} ({len(times)} vs {len(other)} MRs)")
+    return violations, delays
+
+
+if __name__ == "__main__":
+    scenarios = REFERENCE_SCENARIOS
+    if len(sys.argv) > 1:
+        values = [int(v) for v in sys.argv[1:]]
+        scenarios = list(zip(values[0::2], values[1::2]))
+
+    failed = False
+    for number_ue, duration in scenarios:
+        with tempfile.TemporaryDirectory() as channel_path:
+            reference, _ = run_trace(number_ue, duration, channel_path, adaptive=False)
+            candidate, measurement = run_trace(number_ue, duration, channel_path, adaptive=True)
+        violations, delays = compare_triggers(reference, candidate)
+        triggers = sum(len(times) for times in reference.values())
+        print(f"UE={number_ue} DURATION={duration}: {triggers} A3 triggers, max delay {max(delays, default=0):.3f} ms, "
+              f"{len(violations)} violations | {measurement.summary()}")
+        for line in violations[:20]:
+            print(f"  {line}")
+        failed = failed or bool(violations)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,77 @@
+import contextlib
+import io
+import random
+import sys
+
+import simpy
+
+import scenario
+from config import *
+from scheduler import TickEnvironment
+
+"""
+[Scheduler 검증]: 같은 시나리오를 simpy.Environment와 TickEnvironment에서 실행하여 핸드오버 trace를 비교
+    - 비교 대상: UE별 timestamps(MR 전송, 재전송, HO COMMAND 수신, HO 완료 시각, from, isSuccess), 최종 UE 상태
+                 위성별 메시지 카운터(cumulativeMessageCount)
+    - 메시지 지연은 hop마다 tick 단위로 반올림되므로(hop당 최대 0.5 tick) 시각은 MAX_HOPS tick까지 허용
+    - 사용법: python3 src/verify_scheduler.py [NUMBER_UE DURATION ...]  (인자가 없으면 REFERENCE_SCENARIOS)
+"""
+
+REFERENCE_SCENARIOS = [(1, 10000), (50, 3000), (200, 2000)] # (NUMBER_UE, DURATION)
+MAX_HOPS = 16 # 하나의 핸드오버 trace에 누적되는 메시지 hop 수 상한 (재전송 포함)
+
+
+# 시나리오 1회 실행 후 핸드오버 trace 반환 (entity 로그 출력은 버림)
+def run_trace(env, number_ue, duration):
+    random.seed(SEED)
+    with contextlib.redirect_stdout(io.StringIO()):
+        positions = scenario.generate_ue_positions(number_ue)
+        amf, satellites, UEs = scenario.build_entities(env, positions)
+        if FAST_FORWARD:
+            scenario.attach_fast_forward(env, amf, satellites, UEs, until=duration)
+        env.run(until=duration)
+    handovers = {ue_id: ue.timestamps for ue_id, ue in UEs.items()}
+    states = {ue_id: ue.state for ue_id, ue in UEs.items()}
+    counters = {sat_id: sat.counter.as_dict() for sat_id, sat in satellites.items()}
+    return handovers, states, counters
+
+
+def compare_traces(reference, candidate, tolerance):
+    mismatches = []
+    ref_handovers, ref_states, ref_counters = reference
+    handovers, states, counters = candidate
+    for ue_id, events in ref_handovers.items():
+        other = handovers[ue_id]
+        if len(events) != len(other):
+            mismatches.append(f"UE {ue_id}: {len(events)} vs {len(other)} handover records")
+            continue
+        for a, b in zip(events, other):
+            if a.get('from') != b.get('from') or a.get('isSuccess') != b.get('isSuccess') \
+                    or len(a['timestamp']) != len(b['timestamp']) \
+                    or any(abs(x - y) > tolerance for x, y in zip(a['timestamp'], b['timestamp'])):
+                mismatches.append(f"UE {ue_id}: {a} vs {b}")
+        if ref_states[ue_id] != states[ue_id]:
+            mismatches.append(f"UE {ue_id}: final state {ref_states[ue_id]} vs {states[ue_id]}")
+    for sat_id, counter in ref_counters.items():
+        if counter != counters[sat_id]:
+            mismatches.append(f"Satellite {sat_id}: counters {counter} vs {counters[sat_id]}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    scenarios = REFERENCE_SCENARIOS
+    if len(sys.argv) > 1:
+        values = [int(v) for v in sys.argv[1:]]
+        scenarios = list(zip(values[0::2], values[1::2]))
+
+    failed = False
+    for number_ue, duration in scenarios:
+        reference = run_trace(simpy.Environment(), number_ue, duration)
+        candidate = run_trace(TickEnvironment(), number_ue, duration)
+        mismatches = compare_traces(reference, candidate, tolerance=MAX_HOPS / TICKS_PER_MS)
+        handovers = sum(len(events) for events in reference[0].values())
+        print(f"UE={number_ue} DURATION={duration}: {handovers} handover records, {len(mismatches)} mismatches")
+        for line in mismatches[:20]:
+            print(f"  {line}")
+        failed = failed or bool(mismatches)
+    sys.exit(1 if failed else 0)
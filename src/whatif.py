@@ -0,0 +1,198 @@
+import heapq
+import os
+import sys
+
+import numpy as np
+
+from config import *
+from eventtrace import ADMIT, DROP, CPU_START, CPU_END, load
+from timeseries import ChangePointSeries
+
+"""
+[What-if]: 위성 CPU 용량 계획용 trace 기반 대기열 재생 (메시지 이벤트 trace → 대기열 계층만 재실행, 근사)
+    - 입력: eventtrace.py trace의 위성별 도착 (ADMIT/DROP 행: 도착 시각, task, CPU 우선순위) + 메시지별 처리 시간 (CPU_START ~ CPU_END)
+        처리 기록이 없는 메시지 (drop, 종료 시 미처리)는 같은 task 처리 시간의 중앙값 (기록이 없으면 PROCESSING_TIME)
+    - 설정 (SATELLITE_CPU, QUEUED_SIZE, 처리 시간 배율) 조합마다 위성별 non-preemptive priority 대기열 재생 (simpy.PriorityResource와 같은 규칙)
+        우선순위 2 (MR, 재전송): 대기 길이 >= QUEUED_SIZE이면 drop / 그 외 항상 수락, 대기열은 (우선순위, 도착 순서)
+    - 결과: 대기 길이 (시간 평균/최대/QUEUE_THRESHOLDS 이상 누적 시간), drop 수, sojourn (도착 ~ 처리 완료) 평균/KPI_PERCENTILES
+    - 근사: 도착 stream 고정 (drop → 재전송, 처리 지연 → 후속 메시지 시각 변화 등 feedback 없음)
+      → reference run (다른 설정의 full run trace)의 실제 대기열 결과와 비교해 오차 출력
+    - 실행: python3 src/whatif.py <run 디렉토리 또는 trace> [cpu=1,2,4] [queue=10,50] [scale=0.5,1,2] [reference=<run>,<run>]
+"""
+
+
+# 위성별 도착 열 {위성 ID: {time, task, priority, service, admitted, start, end}} (trace 순서)
+def arrivals(columns, meta):
+    time, kind, node, task, aux = (columns[name] for name in ("time", "kind", "node", "task", "aux"))
+    start = np.full(len(time), np.nan)
+    end = np.full(len(time), np.nan)
+    for marker, target in ((CPU_START, start), (CPU_END, end)):
+        rows = kind == marker
+        target[aux[rows]] = time[rows]
+
+    received = np.flatnonzero((kind == ADMIT) | (kind == DROP))
+    service = end[received] - start[received]
+    for t in np.unique(task[received]):
+        rows = task[received] == t
+        measured = service[rows][~np.isnan(service[rows])]
+        default = float(np.median(measured)) if len(measured) else PROCESSING_TIME.get(int(t), 1)
+        service[rows & np.isnan(service)] = default
+
+    streams = {}
+    for sat_id in meta['sat_ids']:
+        rows = node[received] == sat_id
+        index = received[rows]
+        streams[sat_id] = {
+            'time': time[index], 'task': task[index], 'priority': aux[index], 'service': service[rows],
+            'admitted': kind[index] == ADMIT, 'start': start[index], 'end': end[index],
+        }
+    return streams
+
+
+# 대기 길이 변경 기록 → 시간 평균/최대/threshold 이상 누적 시간 (같은 시각의 변경은 마지막 값)
+def queue_summary(series, duration, thresholds=QUEUE_THRESHOLDS):
+    times, values = series.arrays()
+    spans = np.diff(np.append(np.minimum(times, duration), duration))
+    return {
+        'mean_queue': float(np.dot(values, spans) / duration) if duration else 0.0,
+        'max_queue': int(values.max()) if len(values) else 0,
+        'time_above': {threshold: float(spans[values >= threshold].sum()) for threshold in thresholds},
+    }
+
+
+def sojourn_summary(sojourn, q=KPI_PERCENTILES):
+    sojourn = np.asarray(sojourn, dtype=float)
+    sojourn = sojourn[~np.isnan(sojourn)]
+    summary = {'n': len(sojourn), 'mean': float(sojourn.mean()) if len(sojourn) else 0.0}
+    summary.update({f"p{p}": float(np.percentile(sojourn, p)) if len(sojourn) else 0.0 for p in q})
+    return summary
+
+
+# 위성 하나의 대기열 재생: (대기 길이 series, drop 수, 메시지별 sojourn (미처리/drop = NaN))
+def simulate(stream, cpus, queued_size, scale, duration):
+    time, priority = stream['time'].tolist(), stream['priority'].tolist()
+    service = (stream['service'] * scale).tolist()
+    sojourn = [np.nan] * len(time)
+    busy = [] # 처리 중 메시지의 완료 시각 (heap)
+    waiting = [] # (우선순위, 도착 순서) heap
+    queue = ChangePointSeries([0], [0])
+    drops = 0
+
+    # until 시각까지의 처리 완료: 대기 메시지를 완료 시각에 이어서 처리
+    def release(until):
+        while busy and busy[0] <= until:
+            finished = heapq.heappop(busy)
+            if waiting:
+                _, i = heapq.heappop(waiting)
+                heapq.heappush(busy, finished + service[i])
+                sojourn[i] = finished + service[i] - time[i]
+                queue.record(finished, len(waiting))
+
+    for i, t in enumerate(time):
+        release(t)
+        if len(busy) < cpus:
+            heapq.heappush(busy, t + service[i])
+            sojourn[i] = service[i]
+        elif priority[i] == 2 and len(waiting) >= queued_size:
+            drops += 1
+        else:
+            heapq.heappush(waiting, (priority[i], i))
+            queue.record(t, len(waiting))
+    release(duration)
+    sojourn = [value if time[i] + value <= duration else np.nan for i, value in enumerate(sojourn)]
+    return queue, drops, sojourn
+
+
+# 위성별 결과 합계: 대기 길이는 위성 평균/최대, sojourn은 전체 메시지 분포
+def combine(sat_results):
+    queues = [result['queue'] for result in sat_results.values()]
+    return {
+        'drops': sum(result['drops'] for result in sat_results.values()),
+        'mean_queue': float(np.mean([queue['mean_queue'] for queue in queues])) if queues else 0.0,
+        'max_queue': max((queue['max_queue'] for queue in queues), default=0),
+        'sojourn': sojourn_summary(np.concatenate([result['sojourn'] for result in sat_results.values()]) if sat_results else []),
+        'satellites': sat_results,
+    }
+
+
+def whatif(streams, duration, cpus, queued_size, scale=1.0):
+    sat_results = {}
+    for sat_id, stream in streams.items():
+        queue, drops, sojourn = simulate(stream, cpus, queued_size, scale, duration)
+        sat_results[sat_id] = {'queue': queue_summary(queue, duration), 'drops': drops, 'sojourn': np.asarray(sojourn)}
+    return combine(sat_results)
+
+
+# trace에 기록된 실제 대기열 결과 (full run): ADMIT +1 / CPU_START -1, DROP 수, 완료 메시지 sojourn
+def actual(streams, columns, duration):
+    time, kind, node = columns['time'], columns['kind'], columns['node']
+    sat_results = {}
+    for sat_id, stream in streams.items():
+        queue = ChangePointSeries([0], [0])
+        length = 0
+        rows = np.flatnonzero(((kind == ADMIT) | (kind == CPU_START)) & (node == sat_id))
+        for t, k in zip(time[rows].tolist(), kind[rows].tolist()):
+            length += 1 if k == ADMIT else -1
+            queue.record(t, length)
+        sat_results[sat_id] = {'queue': queue_summary(queue, duration), 'drops': int((~stream['admitted']).sum()),
+                               'sojourn': stream['end'] - stream['time']}
+    return combine(sat_results)
+
+
+def relative_error(predicted, reference):
+    if reference == 0:
+        return 0.0 if predicted == 0 else float('inf')
+    return (predicted - reference) / reference
+
+
+def format_result(label, result):
+    sojourn = result['sojourn']
+    percentiles = ", ".join(f"{key} {value:.3f}" for key, value in sojourn.items() if key.startswith('p'))
+    return (f"{label}: drops {result['drops']}, queue mean {result['mean_queue']:.3f} max {result['max_queue']}, "
+            f"sojourn n={sojourn['n']} mean {sojourn['mean']:.3f} ({percentiles})")
+
+
+def format_error(label, predicted, reference):
+    errors = {
+        'drops': relative_error(predicted['drops'], reference['drops']),
+        'mean queue': relative_error(predicted['mean_queue'], reference['mean_queue']),
+        'max queue': relative_error(predicted['max_queue'], reference['max_queue']),
+        'mean sojourn': relative_error(predicted['sojourn']['mean'], reference['sojourn']['mean']),
+        f"p{KPI_PERCENTILES[-1]} sojourn": relative_error(predicted['sojourn'][f"p{KPI_PERCENTILES[-1]}"], reference['sojourn'][f"p{KPI_PERCENTILES[-1]}"]),
+    }
+    return f"{label} error: " + ", ".join(f"{name} {error * 100:+.1f}%" for name, error in errors.items())
+
+
+def trace_path(path):
+    return path if os.path.isfile(path) else os.path.join(path, EVENT_TRACE_FILE)
+
+
+if __name__ == "__main__":
+    columns, meta = load(trace_path(sys.argv[1]))
+    options = dict(arg.split("=", 1) for arg in sys.argv[2:])
+    duration = meta['duration']
+    cpus = [int(value) for value in options.get('cpu', str(meta['satellite_cpu'])).split(",")]
+    queues = [int(value) for value in options.get('queue', str(meta['queued_size'])).split(",")]
+    scales = [float(value) for value in options.get('scale', "1").split(",")]
+    streams = arrivals(columns, meta)
+    print(f"{sum(len(stream['time']) for stream in streams.values())} arrivals at {len(streams)} satellites "
+          f"(recorded with cpu={meta['satellite_cpu']}, queue={meta['queued_size']})")
+
+    # 기록된 설정: 대기열 재생 자체의 오차 (실제 run 결과와 비교)
+    recorded = actual(streams, columns, duration)
+    print(format_result("recorded run", recorded))
+    print(format_error("replay of recorded config", whatif(streams, duration, meta['satellite_cpu'], meta['queued_size']), recorded))
+
+    for cpu in cpus:
+        for queued_size in queues:
+            for scale in scales:
+                print(format_result(f"cpu={cpu} queue={queued_size} scale={scale:g}", whatif(streams, duration, cpu, queued_size, scale)))
+
+    # reference run: 다른 설정의 full run 결과와 비교 (같은 시나리오)
+    for path in filter(None, options.get('reference', "").split(",")):
+        ref_columns, ref_meta = load(trace_path(path))
+        reference = actual(arrivals(ref_columns, ref_meta), ref_columns, ref_meta['duration'])
+        predicted = whatif(streams, duration, ref_meta['satellite_cpu'], ref_meta['queued_size'])
+        label = f"{path} (cpu={ref_meta['satellite_cpu']}, queue={ref_meta['queued_size']})"
+        print(format_result(label, reference))
+        print(format_error(label, predicted, reference))